@@ -0,0 +1,258 @@
+"""
+Concept Diff
+
+Token-level differences between design concepts, within and across rounds.
+
+Concepts in a round are mostly variations on each other, so instead of N
+full copies the refinement prompt carries one shared base (the value most
+concepts agree on at each path) plus, per concept, only the paths where it
+departs from that base. Across rounds, each concept is matched to the
+previous-round concept it is closest to, so the agent sees what changed.
+
+Paths join keys with "."; a "." or "\\" inside a key is escaped with a
+backslash, so a key such as "1.5" never reads as nesting.
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import json
+
+
+# Paths listed per concept in the round-to-round summary
+MAX_CHANGED_PATHS = 6
+
+
+def flatten_concept(concept: Any, prefix: str = "") -> Dict[str, Any]:
+    """
+    Flatten a concept into dotted paths
+
+    Nested dicts are walked; lists and scalars are leaves (a list of
+    qualities is one value, not a set of unrelated indices). Dots and
+    backslashes in keys are escaped.
+
+    Args:
+        concept: Concept dict as produced by the generator/refinement agents
+
+    Returns:
+        {path: value}
+    """
+    if not isinstance(concept, dict):
+        return {prefix or "value": concept}
+
+    flat: Dict[str, Any] = {}
+    for key, value in concept.items():
+        path = f"{prefix}.{_escape(key)}" if prefix else _escape(key)
+        if isinstance(value, dict) and value:
+            flat.update(flatten_concept(value, path))
+        else:
+            flat[path] = value
+    return flat
+
+
+def diff_concepts(concepts: List[Any]) -> Dict[str, Any]:
+    """
+    Split a round's concepts into a shared base and per-concept deltas
+
+    Args:
+        concepts: Concepts of one round
+
+    Returns:
+        {
+            "base": {path: value} (held by at least half of the concepts),
+            "concepts": [{
+                "id": concept id (or index),
+                "set": {path: value} (differs from or is missing in base;
+                    never "id", which is already the delta's own key),
+                "unset": [path] (base paths this concept doesn't have)
+            }]
+        }
+    """
+    flats = [flatten_concept(concept) for concept in concepts]
+    base = _shared_base(flats)
+
+    deltas = []
+    for index, (concept, flat) in enumerate(zip(concepts, flats)):
+        delta: Dict[str, Any] = {
+            "id": _concept_id(concept, index),
+            "set": {
+                path: value for path, value in flat.items()
+                if path != "id" and (path not in base or base[path] != value)
+            },
+        }
+        unset = [path for path in base if path not in flat]
+        if unset:
+            delta["unset"] = unset
+        deltas.append(delta)
+
+    return {"base": base, "concepts": deltas}
+
+
+def nest_paths(flat: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rebuild nested dicts from dotted paths (inverse of flatten_concept)
+
+    Used when serializing a base or delta, so shared prefixes such as
+    "tokens.colors." are written once. A path running through another
+    path's leaf (e.g. "a.b" next to "a": 1, from concepts that disagree on
+    whether "a" is nested) can't nest; it's kept beside that leaf under
+    its remaining dotted path ({"a": 1, "a.b": 2}) rather than dropped.
+    """
+    nested: Dict[str, Any] = {}
+    # Dicts built here, as opposed to leaf values that happen to be dicts
+    built = {id(nested)}
+
+    # Shorter paths first, so a leaf is in place before paths running through it
+    entries = sorted(((_split_path(path), value) for path, value in flat.items()), key=lambda entry: len(entry[0]))
+    for parts, value in entries:
+        node = nested
+        for depth, part in enumerate(parts[:-1]):
+            child = node.get(part)
+            if child is None:
+                child = node[part] = {}
+                built.add(id(child))
+            elif id(child) not in built:
+                node[".".join(_escape(rest) for rest in parts[depth:])] = value
+                break
+            node = child
+        else:
+            node[parts[-1]] = value
+    return nested
+
+
+def concept_payload(concepts: List[Any], previous: Optional[List[Any]] = None) -> Dict[str, Any]:
+    """
+    Compact description of a round's concepts for a refinement prompt
+
+    Args:
+        concepts: Concepts of the round being refined
+        previous: Concepts of the round before it, if any
+
+    Returns:
+        {
+            "shared": nested base,
+            "concepts": [{"id", "set": nested, "unset": [path]}],
+            "changes_from_previous_round": diff_rounds() (only with previous)
+        }
+    """
+    concept_diff = diff_concepts(concepts)
+    payload: Dict[str, Any] = {
+        "shared": nest_paths(concept_diff["base"]),
+        "concepts": [{**delta, "set": nest_paths(delta["set"])} for delta in concept_diff["concepts"]]
+    }
+    if previous:
+        payload["changes_from_previous_round"] = diff_rounds(previous, concepts)
+    return payload
+
+
+def diff_rounds(previous: List[Any], current: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Describe how each concept changed from the previous round
+
+    Each current concept is matched to the previous concept sharing the
+    most (path, value) pairs with it.
+
+    Args:
+        previous: Concepts of the earlier round
+        current: Concepts of the later round
+
+    Returns:
+        [{"id", "from" (matched previous id or None), "changed": [path],
+          "changed_count": int}]
+    """
+    previous_flats = [(_concept_id(concept, index), _pairs(flatten_concept(concept)))
+                      for index, concept in enumerate(previous)]
+
+    changes = []
+    for index, concept in enumerate(current):
+        flat = flatten_concept(concept)
+        pairs = _pairs(flat)
+
+        parent: Optional[str] = None
+        parent_pairs: set = set()
+        best = -1
+        for previous_id, candidate in previous_flats:
+            shared = len(pairs & candidate)
+            if shared > best:
+                parent, parent_pairs, best = previous_id, candidate, shared
+
+        parent_paths = {path for path, _ in parent_pairs}
+        changed = sorted(
+            {path for path, _ in pairs - parent_pairs}
+            | (parent_paths - set(flat))
+        )
+        changed = [path for path in changed if path != "id"]
+        changes.append({
+            "id": _concept_id(concept, index),
+            "from": parent,
+            "changed": changed[:MAX_CHANGED_PATHS],
+            "changed_count": len(changed),
+        })
+
+    return changes
+
+
+def _shared_base(flats: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Most common value per path, kept when at least half the concepts share it"""
+    if len(flats) < 2:
+        return {}
+
+    votes: Dict[str, Counter] = {}
+    samples: Dict[str, Dict[str, Any]] = {}
+    for flat in flats:
+        for path, value in flat.items():
+            key = _value_key(value)
+            votes.setdefault(path, Counter())[key] += 1
+            samples.setdefault(path, {})[key] = value
+
+    threshold = (len(flats) + 1) // 2
+    base = {}
+    for path, counter in votes.items():
+        key, count = counter.most_common(1)[0]
+        if count >= max(threshold, 2) and path != "id":
+            base[path] = samples[path][key]
+    return base
+
+
+def _escape(key: Any) -> str:
+    """A key as a path segment"""
+    return str(key).replace("\\", "\\\\").replace(".", "\\.")
+
+
+def _split_path(path: str) -> List[str]:
+    """Keys along a dotted path, unescaped"""
+    if "\\" not in path:
+        return path.split(".")
+
+    parts: List[str] = []
+    current: List[str] = []
+    escaped = False
+    for char in path:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == ".":
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def _pairs(flat: Dict[str, Any]) -> set:
+    """Hashable (path, value) pairs of a flattened concept"""
+    return {(path, _value_key(value)) for path, value in flat.items()}
+
+
+def _value_key(value: Any) -> str:
+    """Hashable, order-independent key for any JSON value"""
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _concept_id(concept: Any, index: int) -> Any:
+    """A concept's id, falling back to its position"""
+    if isinstance(concept, dict) and concept.get("id") is not None:
+        return concept["id"]
+    return index
@@ -4,14 +4,56 @@ Embody Foundation Helpers
 Helper modules for Amplifier Foundation integration.
 """
 
-from .profile_loader import load_embody_profile
-from .token_extractor import extract_tokens_from_repo
-from .state_persistence import save_session_state, load_session_state, get_session_dir
+from .profile_loader import (
+    load_embody_profile,
+    get_profile_cache_stats,
+    clear_profile_cache,
+    get_profile_fingerprint,
+)
+from .token_extractor import (
+    extract_tokens_from_repo,
+    extract_tokens_from_repo_sync,
+    diff_token_refs,
+    diff_token_refs_sync,
+)
+from .token_graph import build_token_graph, resolve_token_references
+from .state_store import create_state_store, FileStateStore, SQLiteStateStore
+from .executor import run_blocking, shutdown_executors
+from .state_persistence import (
+    save_session_state,
+    load_session_state,
+    session_exists,
+    get_session_dir,
+    append_session_delta,
+    make_session_delta,
+    apply_session_delta,
+    save_sub_session,
+    load_sub_session,
+)
 
 __all__ = [
     "load_embody_profile",
+    "get_profile_cache_stats",
+    "clear_profile_cache",
+    "get_profile_fingerprint",
     "extract_tokens_from_repo",
+    "extract_tokens_from_repo_sync",
+    "diff_token_refs",
+    "diff_token_refs_sync",
+    "build_token_graph",
+    "resolve_token_references",
+    "run_blocking",
+    "shutdown_executors",
     "save_session_state",
     "load_session_state",
+    "session_exists",
     "get_session_dir",
+    "append_session_delta",
+    "make_session_delta",
+    "apply_session_delta",
+    "save_sub_session",
+    "load_sub_session",
+    "create_state_store",
+    "FileStateStore",
+    "SQLiteStateStore",
 ]
@@ -0,0 +1,269 @@
+"""
+CSS Scanner
+
+Streaming scanner for CSS custom properties (--name: value).
+
+Works directly on bytes or a memory-mapped file: the regex engine skips
+ordinary rules and stops only at braces, strings, comments and custom
+property names, and a slice is materialized only for custom property
+values and the selectors that scope them. Multi-MB compiled bundles
+therefore never become one big intermediate string.
+
+Names are categorized by a precomputed segment table (one dict lookup per
+dash-separated segment, memoized per name). Declarations scoped to
+selectors other than :root / html / :host (e.g. [data-theme=dark] or a
+dark-mode media query) are kept as separate theme variants.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+
+CATEGORIES = ("colors", "typography", "spacing", "effects", "behaviors")
+
+# Selectors whose custom properties are the base (un-themed) tokens
+ROOT_SELECTORS = frozenset({":root", "html", ":host"})
+
+# At-rules that only group rules and don't scope a theme
+_TRANSPARENT_AT_RULES = ("@layer", "@theme")
+
+# Custom property names (not BEM `block--modifier` selectors), braces, strings and comments
+_STRUCTURE = re.compile(rb'(?<![\w-])--(?P<name>[A-Za-z0-9_-]+)\s*:|[{}"\']|/\*')
+# A run of flat rules with no custom property, string, comment or nesting -
+# skipped in one step instead of visiting each brace
+_NO_TOKENS = rb'''[^{}"'/-]*+(?:-(?!-)[^{}"'/-]*+)*+'''
+_FLAT_RULES = re.compile(rb'(?:' + _NO_TOKENS + rb'\{' + _NO_TOKENS + rb'\})*+')
+_STRINGS = {
+    ord('"'): re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL),
+    ord("'"): re.compile(rb"'(?:[^'\\]|\\.)*'", re.DOTALL),
+}
+# A custom property value, up to the ; or } ending it
+_VALUE = re.compile(rb'''(?:[^;{}"'/]+|"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|/\*.*?\*/|/)*''', re.DOTALL)
+_SLASH, _OPEN, _CLOSE = ord("/"), ord("{"), ord("}")
+_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_WHITESPACE = re.compile(r'\s+')
+
+# Two-segment prefixes that decide the category on their own
+_PAIR_CATEGORIES = {
+    ("font", "size"): "typography",
+    ("line", "height"): "typography",
+    ("letter", "spacing"): "typography",
+    ("border", "radius"): "effects",
+    ("border", "width"): "effects",
+    ("box", "shadow"): "effects",
+    ("drop", "shadow"): "effects",
+    ("z", "index"): "effects",
+}
+
+# Single segments; the leftmost segment that matches wins
+_SEGMENT_CATEGORIES = {
+    **dict.fromkeys((
+        "color", "colors", "bg", "background", "foreground", "fg", "fill", "stroke",
+        "border", "outline", "ring", "accent", "primary", "secondary", "tertiary",
+        "brand", "surface", "muted", "destructive", "success", "warning", "danger",
+        "error", "info", "palette", "gray", "grey", "neutral", "slate", "zinc",
+        "stone", "red", "orange", "amber", "yellow", "lime", "green", "emerald",
+        "teal", "cyan", "sky", "blue", "indigo", "violet", "purple", "fuchsia",
+        "pink", "rose", "white", "black",
+    ), "colors"),
+    **dict.fromkeys((
+        "font", "fonts", "family", "typography", "type", "weight", "leading",
+        "tracking", "fs", "fw", "lh", "heading", "headline",
+    ), "typography"),
+    **dict.fromkeys((
+        "spacing", "space", "spacer", "margin", "padding", "gap", "gutter",
+        "inset", "size", "sizes", "sizing", "container",
+    ), "spacing"),
+    **dict.fromkeys((
+        "shadow", "shadows", "radius", "radii", "rounded", "blur", "opacity",
+        "elevation", "backdrop",
+    ), "effects"),
+    **dict.fromkeys((
+        "transition", "duration", "timing", "easing", "ease", "animation",
+        "animate", "delay", "motion", "keyframes",
+    ), "behaviors"),
+}
+
+# Segments naming what a token styles rather than what kind of value it is;
+# a later kind segment takes precedence (--heading-color is a color,
+# --text-shadow an effect)
+_SUBJECT_SEGMENTS = frozenset({"font", "fonts", "heading", "headline", "text", "type"})
+_KIND_SEGMENTS = frozenset({"color", "colors", "bg", "background", "fg", "foreground", "shadow", "shadows"})
+
+# `text-*` is a font size when followed by a size step, otherwise a color
+_SIZE_STEPS = frozenset({
+    "xs", "sm", "md", "base", "lg", "xl", "xxl", "size", "small", "medium", "large",
+    *(f"{n}xl" for n in range(2, 10)),
+})
+
+_COLOR_VALUE = re.compile(r'^(?:#[0-9a-fA-F]{3,8}\b|(?:rgba?|hsla?|hwb|lab|lch|oklab|oklch|color|color-mix)\()')
+_TIME_VALUE = re.compile(r'^-?\d*\.?\d+m?s$|^(?:cubic-bezier|steps)\(')
+
+
+def scan_css(buffer: Any) -> Dict[str, Any]:
+    """
+    Extract custom properties from CSS
+
+    Args:
+        buffer: bytes or mmap.mmap content
+
+    Returns:
+        {
+            "colors": {...}, "typography": {...}, "spacing": {...},
+            "effects": {...}, "behaviors": {...},
+            "themes": {selector: {category: {name: value}}}  (only when present)
+        }
+    """
+    tokens: Dict[str, Any] = {category: {} for category in CATEGORIES}
+    themes: Dict[str, Dict[str, Dict[str, str]]] = {}
+
+    # (start, end) of each enclosing block prelude, innermost last;
+    # preludes are only decoded once a custom property needs its scope
+    scopes: List[Tuple[int, int]] = []
+    scope_key: Optional[str] = None
+    scope_known = True
+
+    # End of the last brace, comment or declaration - a segment starts after it
+    last = position = _FLAT_RULES.match(buffer, 0).end()
+
+    while True:
+        match = _STRUCTURE.search(buffer, position)
+        if match is None:
+            break
+        start = match.start()
+        char = buffer[start]
+        position = match.end()
+
+        if char == _SLASH:
+            end = buffer.find(b"*/", position)
+            position = last = len(buffer) if end < 0 else end + 2
+        elif char in _STRINGS:
+            string = _STRINGS[char].match(buffer, start)
+            position = string.end() if string else len(buffer)
+        elif char == _OPEN:
+            scopes.append((max(last, buffer.rfind(b";", last, start) + 1), start))
+            scope_known = False
+            last = position
+        elif char == _CLOSE:
+            if scopes:
+                scopes.pop()
+                scope_known = False
+            last = position = _FLAT_RULES.match(buffer, position).end()
+        elif not buffer[max(last, buffer.rfind(b";", last, start) + 1):start].strip():
+            # Declaration at the start of its segment: --name: value
+            value_end = _VALUE.match(buffer, position).end()
+            if not scope_known:
+                scope_key = _scope_key([_normalize(buffer[a:b]) for a, b in scopes])
+                scope_known = True
+            name = match.group("name").decode("ascii")
+            value = _clean_value(buffer[position:value_end])
+            _add_token(tokens, themes, scope_key, name, value)
+            position = last = value_end
+
+    if themes:
+        tokens["themes"] = themes
+
+    return tokens
+
+
+@lru_cache(maxsize=4096)
+def categorize_name(name: str) -> Optional[str]:
+    """
+    Category for a custom property name (without the leading --)
+
+    Returns:
+        One of CATEGORIES, or None if the name gives no hint
+    """
+    segments = [segment for segment in name.lower().replace("_", "-").split("-") if segment]
+
+    for index, segment in enumerate(segments):
+        following = segments[index + 1] if index + 1 < len(segments) else None
+
+        pair = _PAIR_CATEGORIES.get((segment, following))
+        if pair:
+            return pair
+        if segment in _SUBJECT_SEGMENTS:
+            kind = next((later for later in segments[index + 1:] if later in _KIND_SEGMENTS), None)
+            if kind:
+                return _SEGMENT_CATEGORIES[kind]
+        if segment == "text":
+            return "typography" if following in _SIZE_STEPS else "colors"
+
+        category = _SEGMENT_CATEGORIES.get(segment)
+        if category:
+            return category
+
+    return None
+
+
+def categorize_token(name: str, value: str) -> Optional[str]:
+    """Category for a custom property, falling back to its value"""
+    category = categorize_name(name)
+    if category:
+        return category
+    if _COLOR_VALUE.match(value):
+        return "colors"
+    if _TIME_VALUE.match(value):
+        return "behaviors"
+    return None
+
+
+def _add_token(
+    tokens: Dict[str, Any],
+    themes: Dict[str, Dict[str, Dict[str, str]]],
+    scope_key: Optional[str],
+    name: str,
+    value: str
+) -> None:
+    """File one declaration under its category, in the base or a theme"""
+    category = categorize_token(name, value)
+    if category is None:
+        return
+
+    if scope_key is None:
+        tokens[category][name] = value
+    else:
+        themes.setdefault(scope_key, {}).setdefault(category, {})[name] = value
+
+
+def _clean_value(raw: bytes) -> str:
+    """Decode a declaration value, dropping comments and !important"""
+    value = raw.decode("utf-8", "replace")
+    if "/*" in value:
+        value = _COMMENT.sub("", value)
+    value = value.strip()
+    if value.endswith("!important"):
+        value = value[:-len("!important")].rstrip()
+    return value
+
+
+def _normalize(prelude: bytes) -> str:
+    """Collapse whitespace in a selector or at-rule prelude"""
+    return _WHITESPACE.sub(" ", prelude.decode("utf-8", "replace")).strip()
+
+
+def _scope_key(scopes: List[str]) -> Optional[str]:
+    """
+    Theme key for the current nesting, or None for base tokens
+
+    `:root`, `html` and `:host` (alone or within a selector list) inside
+    only transparent at-rules are base; anything else is a variant keyed
+    by its scope chain, e.g. "@media (prefers-color-scheme: dark) :root".
+    """
+    chain = [scope for scope in scopes if not scope.startswith(_TRANSPARENT_AT_RULES)]
+
+    if not chain:
+        # Top level or directly inside @layer/@theme
+        return None
+    if len(chain) == 1 and _is_root_selector(chain[0]):
+        return None
+
+    return " ".join(chain)
+
+
+@lru_cache(maxsize=1024)
+def _is_root_selector(selector: str) -> bool:
+    """Check whether a selector list includes a root selector"""
+    return any(part.strip() in ROOT_SELECTORS for part in selector.split(","))
+
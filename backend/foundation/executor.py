@@ -0,0 +1,96 @@
+"""
+Blocking Work Executor
+
+Runs blocking file I/O and parsing off the event loop in bounded thread pools.
+
+Separate pools are kept so a long token extraction can never starve the
+small state reads/writes that every request needs:
+- "io": session state persistence (EMBODY_IO_WORKERS, default 4)
+- "extract": repository token extraction (EMBODY_EXTRACT_WORKERS, default 2)
+- "parse": per-file token parsing within one extraction (EMBODY_PARSE_WORKERS, default 4)
+
+A process pool of the same "parse" size is available for CPU-bound parsing.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import functools
+import os
+import threading
+
+
+_POOL_SIZES = {
+    "io": int(os.getenv("EMBODY_IO_WORKERS", "4")),
+    "extract": int(os.getenv("EMBODY_EXTRACT_WORKERS", "2")),
+    "parse": int(os.getenv("EMBODY_PARSE_WORKERS", "4")),
+}
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_process_executor: Optional[ProcessPoolExecutor] = None
+_executors_lock = threading.Lock()
+
+
+def get_executor(pool: str = "io") -> ThreadPoolExecutor:
+    """
+    Get (lazily creating) a named thread pool
+
+    Args:
+        pool: Pool name ("io", "extract" or "parse")
+
+    Returns:
+        Bounded ThreadPoolExecutor
+    """
+    with _executors_lock:
+        executor = _executors.get(pool)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=max(_POOL_SIZES.get(pool, 4), 1),
+                thread_name_prefix=f"embody-{pool}",
+            )
+            _executors[pool] = executor
+        return executor
+
+
+def get_process_executor() -> ProcessPoolExecutor:
+    """
+    Get (lazily creating) the shared process pool for CPU-bound parsing
+
+    Returns:
+        ProcessPoolExecutor sized like the "parse" thread pool
+    """
+    global _process_executor
+    with _executors_lock:
+        if _process_executor is None:
+            _process_executor = ProcessPoolExecutor(max_workers=max(_POOL_SIZES["parse"], 1))
+        return _process_executor
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, pool: str = "io", **kwargs: Any) -> Any:
+    """
+    Run a blocking callable in a named thread pool
+
+    Args:
+        func: Blocking function
+        *args: Positional arguments for func
+        pool: Pool name ("io", "extract" or "parse")
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns (exceptions propagate)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(pool), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executors() -> None:
+    """Shut down all pools, waiting for queued work"""
+    global _process_executor
+    with _executors_lock:
+        executors: list = list(_executors.values())
+        _executors.clear()
+        if _process_executor is not None:
+            executors.append(_process_executor)
+            _process_executor = None
+    for executor in executors:
+        executor.shutdown(wait=True)
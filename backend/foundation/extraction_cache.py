@@ -0,0 +1,164 @@
+"""
+Extraction Cache
+
+Persistent per-repository cache of extracted design tokens.
+
+For every token file the cache stores (mtime, size, sha256) and the tokens
+extracted from it. On the next extraction a file whose mtime and size are
+unchanged is reused without being read; a file whose stat changed but whose
+content hash did not is reused without being parsed.
+
+Extractions at a git ref use a separate blob cache keyed by git blob id,
+which is content-addressed, so blobs shared between refs are parsed once.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import uuid
+
+
+CACHE_DIR = Path(".embody/cache/tokens")
+
+# Blob cache entries kept per repository (most recently used first)
+BLOB_CACHE_MAX_ENTRIES = 2000
+
+# Bump whenever extraction output changes shape, so stale entries are dropped
+EXTRACTOR_VERSION = 6
+
+
+def load_extraction_cache(repo_path: Path) -> Dict[str, Any]:
+    """
+    Load the extraction cache for a repository
+
+    Args:
+        repo_path: Repository root
+
+    Returns:
+        {"files": {relative_path: entry}} - empty when missing, stale or unreadable
+    """
+    cache_file = _cache_file(repo_path)
+
+    try:
+        with cache_file.open("r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {"files": {}}
+
+    if cache.get("version") != EXTRACTOR_VERSION or not isinstance(cache.get("files"), dict):
+        return {"files": {}}
+
+    return cache
+
+
+def save_extraction_cache(repo_path: Path, files: Dict[str, Any]) -> None:
+    """
+    Persist the extraction cache for a repository (atomic replace)
+
+    Failures are logged, never raised - the cache is an optimization.
+
+    Args:
+        repo_path: Repository root
+        files: relative_path -> entry, as built by make_cache_entry()
+    """
+    _write_atomic(_cache_file(repo_path), {
+        "version": EXTRACTOR_VERSION,
+        "repo_path": str(repo_path.resolve()),
+        "files": files,
+    })
+
+
+def load_blob_cache(repo_path: Path) -> Dict[str, Any]:
+    """
+    Load the git blob cache for a repository
+
+    Returns:
+        blob sha -> {"tokens": {...}, "sample": [markers, sample bytes]}
+        (empty when missing, stale or unreadable)
+    """
+    try:
+        with _cache_file(repo_path, "blobs").open("r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if cache.get("version") != EXTRACTOR_VERSION or not isinstance(cache.get("blobs"), dict):
+        return {}
+
+    return cache["blobs"]
+
+
+def save_blob_cache(repo_path: Path, used: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    """
+    Persist the git blob cache (atomic replace)
+
+    Blobs used by this extraction are kept first, then previously cached
+    ones up to BLOB_CACHE_MAX_ENTRIES. Failures are logged, never raised.
+
+    Args:
+        repo_path: Repository root
+        used: blob sha -> {"tokens", "sample"} entries for this extraction
+        previous: Cache as returned by load_blob_cache()
+    """
+    blobs = dict(used)
+    for sha, tokens in previous.items():
+        if len(blobs) >= BLOB_CACHE_MAX_ENTRIES:
+            break
+        blobs.setdefault(sha, tokens)
+
+    _write_atomic(_cache_file(repo_path, "blobs"), {
+        "version": EXTRACTOR_VERSION,
+        "repo_path": str(repo_path.resolve()),
+        "blobs": blobs,
+    })
+
+
+def stat_matches(entry: Optional[Dict[str, Any]], stat: os.stat_result) -> bool:
+    """Check whether a cache entry was recorded for an unchanged file"""
+    return (
+        entry is not None
+        and entry.get("mtime_ns") == stat.st_mtime_ns
+        and entry.get("size") == stat.st_size
+    )
+
+
+def content_hash(data: bytes) -> str:
+    """Hash file content for cache comparison"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def make_cache_entry(stat: os.stat_result, digest: str, tokens: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a cache entry for one token file"""
+    return {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": digest,
+        "tokens": tokens,
+    }
+
+
+def _cache_file(repo_path: Path, kind: str = "files") -> Path:
+    """Cache file location for a repository"""
+    key = hashlib.sha1(str(repo_path.resolve()).encode("utf-8")).hexdigest()
+    if kind == "blobs":
+        return CACHE_DIR / f"{key}.blobs.json"
+    return CACHE_DIR / f"{key}.json"
+
+
+def _write_atomic(cache_file: Path, payload: Dict[str, Any]) -> None:
+    """Write a cache file via temp file + rename; log failures"""
+    temp_file = cache_file.with_name(f"{cache_file.name}.{uuid.uuid4().hex}.tmp")
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with temp_file.open("w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temp_file, cache_file)
+    except Exception as e:
+        print(f"Warning: Failed to save token extraction cache: {e}")
+        try:
+            temp_file.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,168 @@
+"""
+Git Objects
+
+Reads files straight from a local repository's object database, so tokens
+can be extracted at any commit, branch or tag without a checkout or
+worktree.
+
+The tree is listed once with `git ls-tree -r -l` (paths, blob ids and sizes
+in one call) and blobs are streamed through a single long-lived
+`git cat-file --batch` process. Everything is local - no fetches.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import subprocess
+
+
+# Seconds to wait for a single git command
+GIT_TIMEOUT = 30
+
+
+def resolve_commit(repo_path: Path, ref: str) -> str:
+    """
+    Resolve a ref (branch, tag, sha, HEAD~2, ...) to a commit id
+
+    Args:
+        repo_path: Local repository (working tree or bare)
+        ref: Any git revision
+
+    Returns:
+        Full commit sha
+
+    Raises:
+        ValueError: If git is unavailable, the path isn't a repository or
+            the ref doesn't name a commit
+    """
+    if ref.startswith("-"):
+        raise ValueError(f"Invalid git ref: {ref}")
+
+    output = _run_git(repo_path, ["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"])
+    if output is None:
+        raise ValueError(f"Unknown git ref '{ref}' in {repo_path}")
+    return output.decode("ascii").strip()
+
+
+def list_tree(repo_path: Path, commit: str) -> List[Dict[str, Any]]:
+    """
+    List every blob in a commit's tree
+
+    Args:
+        repo_path: Local repository
+        commit: Commit sha (see resolve_commit)
+
+    Returns:
+        [{"rel_path": str, "sha": str, "size": int}] in tree order
+
+    Raises:
+        ValueError: If the tree can't be listed
+    """
+    output = _run_git(repo_path, ["ls-tree", "-r", "-l", "-z", "--full-tree", commit])
+    if output is None:
+        raise ValueError(f"Failed to list tree of {commit} in {repo_path}")
+
+    entries = []
+    for record in output.split(b"\0"):
+        if not record:
+            continue
+        # "<mode> <type> <sha> <size>\t<path>"
+        meta, _, path = record.partition(b"\t")
+        fields = meta.split()
+        if len(fields) != 4 or fields[1] != b"blob":
+            # Submodules (commit) and symlinks-as-trees don't hold tokens
+            continue
+        entries.append({
+            "rel_path": path.decode("utf-8", "surrogateescape"),
+            "sha": fields[2].decode("ascii"),
+            "size": int(fields[3]),
+        })
+
+    return entries
+
+
+class GitBlobReader:
+    """
+    Streams blob contents through one `git cat-file --batch` process
+
+    Use as a context manager; the process is closed on exit.
+    """
+
+    def __init__(self, repo_path: Path):
+        try:
+            self._process = subprocess.Popen(
+                ["git", "-C", str(repo_path), "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            raise ValueError(f"git is not available: {e}")
+
+    def __enter__(self) -> "GitBlobReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def read(self, sha: str) -> Optional[bytes]:
+        """
+        Read one blob
+
+        Args:
+            sha: Blob id
+
+        Returns:
+            Blob content, or None if the object is missing or not a blob
+
+        Raises:
+            IOError: If the cat-file process died
+        """
+        process = self._process
+        process.stdin.write(sha.encode("ascii") + b"\n")
+        process.stdin.flush()
+
+        header = process.stdout.readline()
+        if not header:
+            raise IOError("git cat-file exited unexpectedly")
+
+        # "<sha> <type> <size>" or "<sha> missing"
+        fields = header.split()
+        if len(fields) != 3:
+            return None
+
+        size = int(fields[2])
+        data = process.stdout.read(size)
+        process.stdout.read(1)  # trailing newline
+
+        return data if fields[1] == b"blob" else None
+
+    def close(self) -> None:
+        """Stop the cat-file process"""
+        process = self._process
+        try:
+            process.stdin.close()
+            process.wait(timeout=GIT_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        finally:
+            process.stdout.close()
+
+
+def _run_git(repo_path: Path, args: List[str]) -> Optional[bytes]:
+    """Run one git command; None on a non-zero exit"""
+    try:
+        completed = subprocess.run(
+            ["git", "-C", str(repo_path), *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=GIT_TIMEOUT,
+        )
+    except OSError as e:
+        raise ValueError(f"git is not available: {e}")
+    except subprocess.TimeoutExpired:
+        raise ValueError(f"git {args[0]} timed out in {repo_path}")
+
+    if completed.returncode != 0:
+        return None
+    return completed.stdout
@@ -0,0 +1,237 @@
+"""
+JS Object Parser
+
+Lightweight, single-pass parser for JavaScript/TypeScript object literals,
+used to read Tailwind `theme` blocks without a JS runtime.
+
+Source is tokenized once by a single regex, then parsed by recursive
+descent. Literal values (strings, numbers, booleans, nested objects and
+arrays) become Python values; anything computed (identifiers, member
+access, function calls, arrow functions) is kept as its source text.
+Spreads are kept as source text too, in place: `...defaultTheme.spacing`
+becomes an array item, or a key mapping to itself in an object. Every
+token is visited once, so parsing is linear in file size.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+
+# Nesting beyond this is kept as raw source text
+MAX_DEPTH = 64
+
+_TOKEN_RE = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<template>`(?:[^`\\]|\\.)*`)
+  | (?P<number>-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<spread>\.\.\.)
+  | (?P<arrow>=>)
+  | (?P<punct>[{}\[\](),:])
+  | (?P<other>.)
+''', re.VERBOSE | re.DOTALL)
+
+_OPENERS = {"{": "}", "[": "]", "(": ")"}
+_LITERAL_IDENTS = {"true": True, "false": False, "null": None}
+
+# (kind, text, start, end)
+Token = Tuple[str, str, int, int]
+
+
+def tokenize(source: str) -> List[Token]:
+    """
+    Split JS source into significant tokens (whitespace and comments dropped)
+
+    Args:
+        source: JavaScript/TypeScript source
+
+    Returns:
+        List of (kind, text, start, end)
+    """
+    tokens = []
+    for match in _TOKEN_RE.finditer(source):
+        kind = match.lastgroup
+        if kind == "ws" or kind == "comment":
+            continue
+        tokens.append((kind, match.group(), match.start(), match.end()))
+    return tokens
+
+
+def find_object(source: str, key: str, tokens: Optional[List[Token]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Parse the first object literal assigned to `key` (e.g. `theme: {...}`)
+
+    Args:
+        source: JavaScript/TypeScript source
+        key: Property name to look for
+        tokens: Pre-computed tokenize(source) result
+
+    Returns:
+        Parsed object, or None if `key: {` does not occur
+    """
+    tokens = tokenize(source) if tokens is None else tokens
+
+    for i in range(len(tokens) - 2):
+        kind, text = tokens[i][0], tokens[i][1]
+        name = _unquote(text) if kind == "string" else text
+        if (
+            kind in ("ident", "string")
+            and name == key
+            and tokens[i + 1][1] == ":"
+            and tokens[i + 2][1] == "{"
+        ):
+            value, _ = _Parser(source, tokens).parse_value(i + 2, 0)
+            return value
+
+    return None
+
+
+class _Parser:
+    """Recursive-descent parser over a token list"""
+
+    def __init__(self, source: str, tokens: List[Token]):
+        self.source = source
+        self.tokens = tokens
+        self.closers = _match_brackets(tokens)
+
+    def parse_value(self, i: int, depth: int) -> Tuple[Any, int]:
+        """Parse one value starting at token i; return (value, next index)"""
+        tokens = self.tokens
+        if i >= len(tokens):
+            return None, i
+
+        kind, text = tokens[i][0], tokens[i][1]
+        end = self._expression_end(i)
+
+        # Only a lone literal is a literal; `a + b`, `fn()` etc. stay raw
+        if end == i + 1:
+            if kind == "string":
+                return _unquote(text), end
+            if kind == "template":
+                return text[1:-1], end
+            if kind == "number":
+                return _number(text), end
+            if kind == "ident" and text in _LITERAL_IDENTS:
+                return _LITERAL_IDENTS[text], end
+
+        if text == "{" and depth < MAX_DEPTH and self._closer(i) == end - 1:
+            return self._parse_object(i, depth), end
+        if text == "[" and depth < MAX_DEPTH and self._closer(i) == end - 1:
+            return self._parse_array(i, depth), end
+
+        return self._raw(i, end), end
+
+    def _parse_object(self, i: int, depth: int) -> Dict[str, Any]:
+        """Parse `{ ... }` starting at token i"""
+        tokens = self.tokens
+        result: Dict[str, Any] = {}
+        i += 1
+
+        while i < len(tokens) and tokens[i][1] != "}":
+            kind, text = tokens[i][0], tokens[i][1]
+
+            if kind == "spread":
+                # `...defaults` - not resolvable statically, keep it in place
+                end = self._expression_end(i + 1)
+                spread = self._raw(i, end)
+                result[spread] = spread
+                i = end
+            elif text == "[":
+                # Computed key - skip the whole property
+                i = self._expression_end(self._closer(i) + 1)
+            elif kind in ("ident", "string", "number"):
+                key = _unquote(text) if kind == "string" else text
+                if i + 1 < len(tokens) and tokens[i + 1][1] == ":":
+                    value, i = self.parse_value(i + 2, depth + 1)
+                    result[key] = value
+                else:
+                    # Shorthand property or method - skip
+                    i = self._expression_end(i)
+            else:
+                i = self._expression_end(i)
+
+            if i < len(tokens) and tokens[i][1] == ",":
+                i += 1
+            elif i < len(tokens) and tokens[i][1] != "}":
+                # Unexpected token - resync at the next separator
+                i = self._expression_end(i + 1)
+                if i < len(tokens) and tokens[i][1] == ",":
+                    i += 1
+
+        return result
+
+    def _parse_array(self, i: int, depth: int) -> List[Any]:
+        """Parse `[ ... ]` starting at token i"""
+        tokens = self.tokens
+        result: List[Any] = []
+        i += 1
+
+        while i < len(tokens) and tokens[i][1] != "]":
+            if tokens[i][0] == "spread":
+                end = self._expression_end(i + 1)
+                result.append(self._raw(i, end))
+                i = end
+            else:
+                value, i = self.parse_value(i, depth + 1)
+                result.append(value)
+            if i < len(tokens) and tokens[i][1] == ",":
+                i += 1
+            elif i < len(tokens) and tokens[i][1] != "]":
+                i = self._expression_end(i + 1)
+
+        return result
+
+    def _expression_end(self, i: int) -> int:
+        """Index of the `,` / `}` / `]` ending the expression at token i"""
+        tokens = self.tokens
+        while i < len(tokens):
+            text = tokens[i][1]
+            if text in _OPENERS:
+                i = self._closer(i) + 1
+            elif text in (",", "}", "]", ")"):
+                return i
+            else:
+                i += 1
+        return i
+
+    def _closer(self, i: int) -> int:
+        """Index of the bracket closing the opener at token i"""
+        return self.closers.get(i, len(self.tokens) - 1)
+
+    def _raw(self, start: int, end: int) -> str:
+        """Source text of tokens[start:end]"""
+        if end <= start:
+            return ""
+        return self.source[self.tokens[start][2]:self.tokens[end - 1][3]]
+
+
+def _match_brackets(tokens: List[Token]) -> Dict[int, int]:
+    """Map each opener index to its closer index in one pass"""
+    closers: Dict[int, int] = {}
+    stack: List[int] = []
+    for i, token in enumerate(tokens):
+        text = token[1]
+        if text in _OPENERS:
+            stack.append(i)
+        elif text in ("}", "]", ")") and stack and _OPENERS[tokens[stack[-1]][1]] == text:
+            # Stray or mismatched closers are ignored
+            closers[stack.pop()] = i
+    return closers
+
+
+def _unquote(text: str) -> str:
+    """Decode a single- or double-quoted JS string literal"""
+    body = text[1:-1]
+    if "\\" not in body:
+        return body
+    return re.sub(r'\\(.)', lambda m: {"n": "\n", "t": "\t"}.get(m.group(1), m.group(1)), body)
+
+
+def _number(text: str) -> Any:
+    """Convert a numeric literal to int or float"""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
@@ -2,54 +2,196 @@
 Profile Loader
 
 Loads and compiles Amplifier profile to mount plan.
+
+Compiled mount plans are cached process-wide per profile name. Each cache
+entry carries a manifest of the profile and collection files it was built
+from, so editing a profile or an agent file invalidates the entry on the
+next load.
 """
 
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+import copy
+import hashlib
+import os
+import threading
+
+
+# Directories whose contents feed into a compiled mount plan
+PROFILE_DIR = Path(".embody/profiles")
+COLLECTIONS_DIR = Path(".embody/collections")
+
+# Maximum number of compiled profiles kept in memory
+PROFILE_CACHE_SIZE = int(os.getenv("EMBODY_PROFILE_CACHE_SIZE", "8"))
 
+# profile_name -> (manifest, mount_plan), least recently used first
+_plan_cache: "OrderedDict[str, Tuple[Tuple, Dict[str, Any]]]" = OrderedDict()
+_cache_stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+_cache_lock = threading.Lock()
 
-def load_embody_profile(profile_name: str = "default") -> Dict[str, Any]:
+# (manifest, fingerprint) of the last get_profile_fingerprint() call
+_fingerprint: Optional[Tuple[Tuple, str]] = None
+
+
+def load_embody_profile(profile_name: str = "default", use_cache: bool = True) -> Dict[str, Any]:
     """
     Load embody profile and compile to mount plan
-    
+
     Args:
         profile_name: Profile name (default: "default")
-        
+        use_cache: Reuse a previously compiled plan if its source files are unchanged
+
     Returns:
         Mount plan ready for AmplifierSession initialization
-        
+
     Raises:
         FileNotFoundError: If profile file doesn't exist
         ValueError: If profile is malformed
     """
-    from amplifier.profiles import ProfileLoader, compile_profile_to_mount_plan
-    from amplifier.agents import AgentLoader
-    from amplifier.module_resolution import StandardModuleSourceResolver
-    
-    # Profile directory
-    profile_dir = Path(".embody/profiles")
-    if not profile_dir.exists():
+    if not PROFILE_DIR.exists():
         raise FileNotFoundError(
-            f"Profile directory not found: {profile_dir}\n"
+            f"Profile directory not found: {PROFILE_DIR}\n"
             "Ensure .embody/profiles/ exists with profile files."
         )
-    
+
+    if not use_cache:
+        return _compile_profile(profile_name)
+
+    manifest = _build_manifest()
+
+    with _cache_lock:
+        entry = _plan_cache.get(profile_name)
+        if entry is not None:
+            if entry[0] == manifest:
+                _plan_cache.move_to_end(profile_name)
+                _cache_stats["hits"] += 1
+                # Sessions may mutate their config, so never hand out the cached plan
+                return copy.deepcopy(entry[1])
+            del _plan_cache[profile_name]
+            _cache_stats["invalidations"] += 1
+        _cache_stats["misses"] += 1
+
+    mount_plan = _compile_profile(profile_name)
+
+    with _cache_lock:
+        _plan_cache[profile_name] = (manifest, mount_plan)
+        _plan_cache.move_to_end(profile_name)
+        while len(_plan_cache) > max(PROFILE_CACHE_SIZE, 1):
+            _plan_cache.popitem(last=False)
+            _cache_stats["evictions"] += 1
+
+    return copy.deepcopy(mount_plan)
+
+
+def get_profile_cache_stats() -> Dict[str, Any]:
+    """
+    Get compiled profile cache counters
+
+    Returns:
+        {
+            "hits": int,
+            "misses": int,
+            "invalidations": int,
+            "evictions": int,
+            "size": int,
+            "max_size": int,
+            "profiles": List[str]
+        }
+    """
+    with _cache_lock:
+        return {
+            **_cache_stats,
+            "size": len(_plan_cache),
+            "max_size": PROFILE_CACHE_SIZE,
+            "profiles": list(_plan_cache.keys()),
+        }
+
+
+def clear_profile_cache() -> None:
+    """Drop all compiled profiles (counters are kept)"""
+    with _cache_lock:
+        _plan_cache.clear()
+
+
+def get_profile_fingerprint() -> str:
+    """
+    Content hash of every profile and collection file
+
+    Identifies the agents, prompts and provider/model configuration a
+    session runs with. Unlike the mtime manifest it is stable across
+    checkouts, so recorded agent responses stay valid on other machines.
+    Files are only re-read when the manifest changes.
+
+    Returns:
+        Hex digest (empty profile directories hash to a fixed value)
+    """
+    global _fingerprint
+
+    manifest = _build_manifest()
+    cached = _fingerprint
+    if cached is not None and cached[0] == manifest:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    for file_path, _, _ in manifest:
+        digest.update(Path(file_path).as_posix().encode("utf-8") + b"\0")
+        try:
+            digest.update(Path(file_path).read_bytes())
+        except OSError:
+            continue
+        digest.update(b"\0")
+
+    fingerprint = digest.hexdigest()
+    _fingerprint = (manifest, fingerprint)
+    return fingerprint
+
+
+def _build_manifest() -> Tuple:
+    """
+    Snapshot (path, mtime, size) of every file that feeds a mount plan
+
+    Only stats files, so it is far cheaper than recompiling. Any added,
+    removed or modified profile/agent file produces a different manifest.
+    """
+    entries = []
+    for root_dir in (PROFILE_DIR, COLLECTIONS_DIR):
+        if not root_dir.exists():
+            continue
+        for dirpath, dirnames, filenames in os.walk(root_dir):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                file_path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                entries.append((file_path, stat.st_mtime_ns, stat.st_size))
+    return tuple(entries)
+
+
+def _compile_profile(profile_name: str) -> Dict[str, Any]:
+    """Load profile and compile it to a mount plan (uncached)"""
+    from amplifier.profiles import ProfileLoader, compile_profile_to_mount_plan
+    from amplifier.agents import AgentLoader
+    from amplifier.module_resolution import StandardModuleSourceResolver
+
     # Load profile
-    profile_loader = ProfileLoader([profile_dir])
-    
+    profile_loader = ProfileLoader([PROFILE_DIR])
+
     try:
         profile = profile_loader.load_profile(profile_name)
     except Exception as e:
         raise ValueError(f"Failed to load profile '{profile_name}': {e}")
-    
+
     # Create agent resolver
     agent_resolver = StandardModuleSourceResolver(
         workspace_dir=Path(".embody/modules")
     )
-    
+
     # Create agent loader with resolver
     agent_loader = AgentLoader(resolver=agent_resolver)
-    
+
     # Compile profile to mount plan with agent discovery
     try:
         mount_plan = compile_profile_to_mount_plan(
@@ -58,5 +200,5 @@ def load_embody_profile(profile_name: str = "default") -> Dict[str, Any]:
         )
     except Exception as e:
         raise ValueError(f"Failed to compile profile to mount plan: {e}")
-    
+
     return mount_plan
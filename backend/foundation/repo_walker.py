@@ -0,0 +1,250 @@
+"""
+Repository Walker
+
+Single-pass discovery of design token files.
+
+Walks the repository once with os.scandir (breadth-first, so shallow files
+come first), matching every token file pattern in the same pass. Build
+output and dependency directories are pruned, .gitignore files are honored,
+and depth/entry/match budgets bound the work on very large monorepos.
+"""
+
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Tuple
+import os
+import re
+import time
+
+
+# File names that are always token files, at any depth
+TOKEN_FILE_NAMES = frozenset({
+    "tokens.json",
+    "design-tokens.json",
+    "tailwind.config.js",
+    "tailwind.config.ts",
+    "variables.css",
+    ":root.css",
+})
+
+# File name suffixes that mark token files
+TOKEN_FILE_SUFFIXES = (".tokens.json",)
+
+# Directories never worth descending into
+DEFAULT_IGNORED_DIRS = frozenset({
+    ".git",
+    ".hg",
+    ".svn",
+    "node_modules",
+    "bower_components",
+    "dist",
+    "build",
+    "out",
+    ".next",
+    ".nuxt",
+    ".svelte-kit",
+    ".turbo",
+    ".cache",
+    ".parcel-cache",
+    "coverage",
+    "storybook-static",
+    "vendor",
+    "__pycache__",
+    ".venv",
+    "venv",
+})
+
+MAX_DEPTH = int(os.getenv("EMBODY_TOKEN_SCAN_MAX_DEPTH", "12"))
+MAX_ENTRIES = int(os.getenv("EMBODY_TOKEN_SCAN_MAX_ENTRIES", "200000"))
+
+
+def is_token_file_name(name: str) -> bool:
+    """Check whether a file name matches any token file pattern"""
+    return name in TOKEN_FILE_NAMES or name.endswith(TOKEN_FILE_SUFFIXES)
+
+
+# Parsed .gitignore pattern:
+# (base dir relative to repo, compiled regex, negate, dir_only, anchored)
+IgnoreRule = Tuple[str, "re.Pattern[str]", bool, bool, bool]
+
+
+def walk_token_files(
+    repo_path: Path,
+    max_depth: Optional[int] = None,
+    max_entries: Optional[int] = None,
+    max_matches: Optional[int] = None,
+    deadline: Optional[float] = None,
+    ignored_dirs: frozenset = DEFAULT_IGNORED_DIRS,
+    use_gitignore: bool = True,
+) -> Dict[str, Any]:
+    """
+    Find token files in one breadth-first pass over the repository
+
+    Args:
+        repo_path: Repository root
+        max_depth: Deepest directory level to enter (env EMBODY_TOKEN_SCAN_MAX_DEPTH)
+        max_entries: Directory entries to examine before stopping (env EMBODY_TOKEN_SCAN_MAX_ENTRIES)
+        max_matches: Stop as soon as this many token files are found
+        deadline: time.monotonic() value at which to stop walking
+        ignored_dirs: Directory names that are never entered
+        use_gitignore: Honor .gitignore files found during the walk
+
+    Returns:
+        {
+            "files": List[Path] (breadth-first, name-sorted order),
+            "entries_scanned": int,
+            "truncated": Optional[str] ("depth", "entries", "matches" or
+                "time" when a budget cut the walk short)
+        }
+    """
+    max_depth = MAX_DEPTH if max_depth is None else max_depth
+    max_entries = MAX_ENTRIES if max_entries is None else max_entries
+
+    result: Dict[str, Any] = {"files": [], "entries_scanned": 0, "truncated": None}
+    queue: Deque[Tuple[str, str, int, Tuple[IgnoreRule, ...]]] = deque()
+    queue.append((str(repo_path), "", 0, ()))
+
+    while queue:
+        if deadline is not None and time.monotonic() >= deadline:
+            result["truncated"] = "time"
+            return result
+
+        dir_path, rel_dir, depth, rules = queue.popleft()
+
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        if use_gitignore and any(entry.name == ".gitignore" for entry in entries):
+            rules = rules + _read_gitignore(os.path.join(dir_path, ".gitignore"), rel_dir)
+
+        for entry in entries:
+            result["entries_scanned"] += 1
+            if result["entries_scanned"] > max_entries:
+                result["truncated"] = "entries"
+                return result
+
+            name = entry.name
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+
+            if is_dir:
+                if name in ignored_dirs or _is_ignored(rules, rel_path, name, True):
+                    continue
+                if depth + 1 > max_depth:
+                    result["truncated"] = result["truncated"] or "depth"
+                    continue
+                queue.append((entry.path, rel_path, depth + 1, rules))
+            elif is_token_file_name(name) and not _is_ignored(rules, rel_path, name, False):
+                result["files"].append(Path(entry.path))
+                if max_matches is not None and len(result["files"]) >= max_matches:
+                    result["truncated"] = "matches"
+                    return result
+
+    return result
+
+
+def _read_gitignore(gitignore_path: str, base: str) -> Tuple[IgnoreRule, ...]:
+    """Parse a .gitignore into rules (common subset of git's syntax)"""
+    try:
+        with open(gitignore_path, "r", encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return ()
+
+    rules = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            continue
+
+        rules.append((base, _translate_gitignore(line), negate, dir_only, anchored))
+
+    return tuple(rules)
+
+
+def _translate_gitignore(pattern: str) -> "re.Pattern[str]":
+    """
+    Compile a gitignore glob
+
+    Unlike fnmatch, "*" and "?" never match "/", and "**/" matches any
+    number of leading directories (including none).
+    """
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        ch = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+            continue
+        if ch == "*":
+            parts.append("[^/]*")
+        elif ch == "?":
+            parts.append("[^/]")
+        elif ch == "\\" and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        elif ch == "[":
+            end = i + 1
+            if end < n and pattern[end] in "!^":
+                end += 1
+            if end < n and pattern[end] == "]":
+                end += 1
+            end = pattern.find("]", end)
+            if end == -1:
+                parts.append(re.escape(ch))
+            else:
+                body = pattern[i + 1:end].replace("\\", "\\\\")
+                if body[0] in "!^":
+                    body = "^" + body[1:]
+                parts.append(f"[{body}]")
+                i = end + 1
+                continue
+        else:
+            parts.append(re.escape(ch))
+        i += 1
+    return re.compile("".join(parts) + r"\Z")
+
+
+def _is_ignored(rules: Tuple[IgnoreRule, ...], rel_path: str, name: str, is_dir: bool) -> bool:
+    """Apply gitignore rules in order; the last matching rule wins"""
+    ignored = False
+    for base, regex, negate, dir_only, anchored in rules:
+        if dir_only and not is_dir:
+            continue
+        if anchored:
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                target = rel_path[len(base) + 1:]
+            else:
+                target = rel_path
+        else:
+            target = name
+        if regex.match(target):
+            ignored = not negate
+    return ignored
@@ -2,11 +2,22 @@
 State Persistence
 
 Serialize/deserialize session state to JSON.
+
+State is stored as a snapshot (state.json) plus an append-only journal
+(state.journal) of the updates applied since. Each journal line is one
+delta; loading replays the journal on top of the snapshot, and saving a
+snapshot compacts the journal away. Deltas are idempotent, so replaying a
+journal that was already folded into the snapshot is harmless.
 """
 
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Set
 import json
+import os
+
+
+# Session directories already created by this process
+_known_dirs: Set[Path] = set()
 
 
 def get_session_dir(session_id: str) -> Path:
@@ -19,18 +30,19 @@ def get_session_dir(session_id: str) -> Path:
     Returns:
         Path to session directory
     """
-    sessions_dir = Path(".embody/sessions")
-    sessions_dir.mkdir(parents=True, exist_ok=True)
+    session_dir = Path(".embody/sessions") / session_id
     
-    session_dir = sessions_dir / session_id
-    session_dir.mkdir(parents=True, exist_ok=True)
+    # Only touch the filesystem the first time a directory is seen
+    if session_dir not in _known_dirs:
+        session_dir.mkdir(parents=True, exist_ok=True)
+        _known_dirs.add(session_dir)
     
     return session_dir
 
 
 def save_session_state(session_id: str, state: Dict[str, Any]) -> None:
     """
-    Persist session state to disk
+    Persist a full session state snapshot and compact the journal
     
     Args:
         session_id: Session identifier
@@ -41,18 +53,103 @@ def save_session_state(session_id: str, state: Dict[str, Any]) -> None:
     """
     session_dir = get_session_dir(session_id)
     state_file = session_dir / "state.json"
+    temp_file = session_dir / "state.json.tmp"
     
     try:
-        # Write with pretty formatting for human readability
-        with state_file.open("w", encoding="utf-8") as f:
+        # Write with pretty formatting for human readability; replace atomically
+        with temp_file.open("w", encoding="utf-8") as f:
             json.dump(state, f, indent=2, ensure_ascii=False)
+        os.replace(temp_file, state_file)
+        
+        # Snapshot now contains every journaled delta
+        journal_file = session_dir / "state.journal"
+        if journal_file.exists():
+            journal_file.write_bytes(b"")
     except Exception as e:
         raise IOError(f"Failed to save session state for {session_id}: {e}")
 
 
+def append_session_delta(session_id: str, delta: Dict[str, Any]) -> int:
+    """
+    Append one state delta to the session journal
+    
+    Args:
+        session_id: Session identifier
+        delta: Delta produced by make_session_delta()
+        
+    Returns:
+        Journal size in bytes after the append
+        
+    Raises:
+        IOError: If unable to write journal file
+    """
+    journal_file = get_session_dir(session_id) / "state.journal"
+    line = json.dumps(delta, ensure_ascii=False, separators=(",", ":")) + "\n"
+    
+    try:
+        with journal_file.open("a", encoding="utf-8") as f:
+            f.write(line)
+            return f.tell()
+    except Exception as e:
+        raise IOError(f"Failed to append session delta for {session_id}: {e}")
+
+
+def make_session_delta(
+    state: Dict[str, Any],
+    updates: Dict[str, Any],
+    appends: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Build an idempotent journal delta
+    
+    Must be called before the updates are applied to `state`, so appended
+    items can be recorded with their target index.
+    
+    Args:
+        state: Current state (before applying the delta)
+        updates: Top-level keys to set
+        appends: List key -> item to append
+        
+    Returns:
+        Delta dictionary for append_session_delta()
+    """
+    delta: Dict[str, Any] = {"set": updates}
+    if appends:
+        delta["append"] = [
+            {"key": key, "index": len(state.get(key, [])), "value": value}
+            for key, value in appends.items()
+        ]
+    return delta
+
+
+def apply_session_delta(state: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    """
+    Apply a journal delta to state in place
+    
+    Appends carry their list index, so applying a delta twice has the same
+    effect as applying it once.
+    
+    Args:
+        state: State dictionary to update
+        delta: Delta produced by make_session_delta()
+    """
+    for item in delta.get("append", []):
+        items = state.setdefault(item["key"], [])
+        index = item["index"]
+        if index < len(items):
+            items[index] = item["value"]
+        else:
+            items.append(item["value"])
+    
+    state.update(delta.get("set", {}))
+
+
 def load_session_state(session_id: str) -> Dict[str, Any]:
     """
-    Load session state from disk
+    Load session state from disk (snapshot plus journal replay)
+    
+    A truncated or corrupt journal tail (e.g. from a crash mid-write) is
+    dropped and cut from the file so later appends stay readable.
     
     Args:
         session_id: Session identifier
@@ -73,11 +170,127 @@ def load_session_state(session_id: str) -> Dict[str, Any]:
     try:
         with state_file.open("r", encoding="utf-8") as f:
             state = json.load(f)
-        return state
     except json.JSONDecodeError as e:
         raise ValueError(f"Malformed session state for {session_id}: {e}")
     except Exception as e:
         raise IOError(f"Failed to load session state for {session_id}: {e}")
+    
+    for delta in _read_journal(session_id, session_dir / "state.journal"):
+        apply_session_delta(state, delta)
+    
+    return state
+
+
+def _read_journal(session_id: str, journal_file: Path) -> List[Dict[str, Any]]:
+    """Read complete journal entries, truncating any damaged tail"""
+    if not journal_file.exists():
+        return []
+    
+    data = journal_file.read_bytes()
+    deltas = []
+    good_end = 0
+    
+    while good_end < len(data):
+        line_end = data.find(b"\n", good_end)
+        if line_end == -1:
+            # Last write never finished
+            break
+        try:
+            deltas.append(json.loads(data[good_end:line_end]))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            break
+        good_end = line_end + 1
+    
+    if good_end < len(data):
+        print(f"Warning: Dropping damaged journal tail for {session_id} ({len(data) - good_end} bytes)")
+        with journal_file.open("r+b") as f:
+            f.truncate(good_end)
+    
+    return deltas
+
+
+def save_sub_session(
+    parent_id: str,
+    sub_session_id: str,
+    record: Dict[str, Any],
+    keep: Optional[int] = None
+) -> int:
+    """
+    Persist an agent sub-session transcript under its parent session
+    
+    Args:
+        parent_id: Parent session identifier
+        sub_session_id: Sub-session identifier
+        record: {"agent": str, "parent_id": str, "transcript": List[Dict]}
+        keep: Transcripts kept per parent, most recently saved first
+            (None keeps all)
+        
+    Returns:
+        Number of older transcripts removed to stay within keep
+        
+    Raises:
+        IOError: If unable to write the transcript
+    """
+    agents_dir = get_session_dir(parent_id) / "agents"
+    record_file = agents_dir / f"{sub_session_id}.json"
+    temp_file = agents_dir / f"{sub_session_id}.json.tmp"
+    
+    try:
+        agents_dir.mkdir(exist_ok=True)
+        with temp_file.open("w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2, ensure_ascii=False, default=str)
+        os.replace(temp_file, record_file)
+    except Exception as e:
+        raise IOError(f"Failed to save sub-session {sub_session_id}: {e}")
+    
+    if keep is None:
+        return 0
+    
+    records = []
+    for path in agents_dir.glob("*.json"):
+        try:
+            records.append((path.stat().st_mtime_ns, path.name, path))
+        except FileNotFoundError:
+            continue
+    records.sort(reverse=True)
+    
+    removed = 0
+    for _, _, path in records[max(keep, 1):]:
+        if path == record_file:
+            continue
+        try:
+            path.unlink()
+            removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+def load_sub_session(parent_id: str, sub_session_id: str) -> Dict[str, Any]:
+    """
+    Load a sub-session transcript saved by save_sub_session()
+    
+    Args:
+        parent_id: Parent session identifier
+        sub_session_id: Sub-session identifier
+        
+    Returns:
+        Sub-session record
+        
+    Raises:
+        FileNotFoundError: If the sub-session was never saved
+        ValueError: If the record is malformed
+    """
+    record_file = get_session_dir(parent_id) / "agents" / f"{sub_session_id}.json"
+    
+    if not record_file.exists():
+        raise FileNotFoundError(f"Sub-session not found: {sub_session_id}")
+    
+    try:
+        with record_file.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Malformed sub-session {sub_session_id}: {e}")
 
 
 def session_exists(session_id: str) -> bool:
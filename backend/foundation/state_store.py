@@ -0,0 +1,523 @@
+"""
+State Store
+
+Pluggable backends for persisted session state, shared by every worker.
+
+Both backends keep a snapshot plus the deltas applied since (see
+state_persistence) and expose a revision per session that changes on every
+write. A worker holding state in memory compares revisions to tell whether
+another worker has written since, and writes are conditional on the
+revision the caller last saw, so a stale worker catches up (replaying
+only the newer deltas) instead of overwriting newer state.
+
+- file: state.json + state.journal under .embody/sessions, serialized
+  across processes with a per-session lock file. Suits workers sharing one
+  host (or a shared directory with working flock).
+- sqlite: one WAL-mode database holding snapshots and deltas. Suits many
+  workers on one host.
+
+Selected with EMBODY_STATE_BACKEND (file | sqlite).
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+
+from .state_persistence import (
+    get_session_dir,
+    save_session_state,
+    load_session_state,
+    append_session_delta,
+    apply_session_delta,
+    session_exists,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows - single-process use only
+    fcntl = None
+
+
+STATE_BACKENDS = ("file", "sqlite")
+
+# Seconds a SQLite writer waits for another worker's transaction
+SQLITE_TIMEOUT = 30
+
+
+def create_state_store(backend: Optional[str] = None) -> Any:
+    """
+    Create the configured state store
+
+    Args:
+        backend: file | sqlite (env EMBODY_STATE_BACKEND, default file)
+
+    Returns:
+        FileStateStore or SQLiteStateStore
+
+    Raises:
+        ValueError: If backend is unknown
+    """
+    backend = (backend or os.getenv("EMBODY_STATE_BACKEND", "file")).strip().lower()
+    if backend == "file":
+        return FileStateStore()
+    if backend == "sqlite":
+        return SQLiteStateStore(Path(os.getenv("EMBODY_STATE_DB", ".embody/sessions.db")))
+    raise ValueError(
+        f"Invalid EMBODY_STATE_BACKEND '{backend}' (expected one of: {', '.join(STATE_BACKENDS)})"
+    )
+
+
+class FileStateStore:
+    """Session state as state.json + state.journal files"""
+
+    name = "file"
+
+    def load(self, session_id: str) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Load session state and its revision
+
+        Raises:
+            FileNotFoundError: If session doesn't exist
+            ValueError: If state is malformed
+        """
+        with self._locked(session_id):
+            return load_session_state(session_id), self._revision(session_id)
+
+    def save(self, session_id: str, state: Dict[str, Any], expected: Optional[str] = None) -> Optional[str]:
+        """
+        Write a full snapshot (compacting the journal)
+
+        Args:
+            session_id: Session identifier
+            state: State to persist
+            expected: Only write if the stored revision still equals this
+                (None = write unconditionally)
+
+        Returns:
+            New revision, or None if another writer got there first
+
+        Raises:
+            IOError: If unable to write
+        """
+        with self._locked(session_id):
+            if expected is not None and self._revision(session_id) != expected:
+                return None
+            save_session_state(session_id, state)
+            return self._revision(session_id)
+
+    def append(self, session_id: str, delta: Dict[str, Any], expected: Optional[str]) -> Optional[str]:
+        """
+        Journal one delta
+
+        Args:
+            session_id: Session identifier
+            delta: Delta produced by make_session_delta()
+            expected: Revision the delta was built against
+
+        Returns:
+            New revision, or None if another writer got there first
+
+        Raises:
+            IOError: If unable to write
+        """
+        with self._locked(session_id):
+            if self._revision(session_id) != expected:
+                return None
+            append_session_delta(session_id, delta)
+            return self._revision(session_id)
+
+    def append_latest(
+        self,
+        session_id: str,
+        build_delta: Callable[[Dict[str, Any]], Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Journal a delta built against the latest stored state
+
+        The session stays locked from reading the state to writing the
+        delta, so unlike append() this can't lose a race. Used once append()
+        has reported a conflict.
+
+        Args:
+            session_id: Session identifier
+            build_delta: Builds the delta from the current state (called once)
+
+        Returns:
+            (state with the delta applied, new revision)
+
+        Raises:
+            FileNotFoundError: If session doesn't exist
+            IOError: If unable to read or write
+        """
+        with self._locked(session_id):
+            state = load_session_state(session_id)
+            delta = build_delta(state)
+            append_session_delta(session_id, delta)
+            apply_session_delta(state, delta)
+            return state, self._revision(session_id)
+
+    def refresh(self, session_id: str, state: Dict[str, Any], revision: Optional[str]) -> Optional[str]:
+        """
+        Bring a state loaded at `revision` up to date in place
+
+        Replays only the journal entries written since, instead of reloading
+        the whole state.
+
+        Returns:
+            Current revision, or None if the snapshot was rewritten since (or
+            the new entries can't be read) and the state must be reloaded
+        """
+        with self._locked(session_id):
+            current = self._revision(session_id)
+            if current is None or revision is None:
+                return None
+            if current == revision:
+                return current
+
+            snapshot, _, old_size = revision.rpartition(":")
+            current_snapshot, _, new_size = current.rpartition(":")
+            if snapshot != current_snapshot or int(new_size) < int(old_size):
+                return None
+
+            journal_file = Path(".embody/sessions") / session_id / "state.journal"
+            try:
+                with journal_file.open("rb") as f:
+                    f.seek(int(old_size))
+                    data = f.read(int(new_size) - int(old_size))
+                deltas = [json.loads(line) for line in data.splitlines()]
+            except (OSError, ValueError):
+                # Let a full load deal with a damaged journal
+                return None
+
+        for delta in deltas:
+            apply_session_delta(state, delta)
+        return current
+
+    def revision(self, session_id: str) -> Optional[str]:
+        """Current revision (None if the session doesn't exist)"""
+        return self._revision(session_id)
+
+    def journal_length(self, session_id: str) -> int:
+        """Journal entries not yet folded into the snapshot"""
+        try:
+            data = (Path(".embody/sessions") / session_id / "state.journal").read_bytes()
+        except FileNotFoundError:
+            return 0
+        return data.count(b"\n")
+
+    def exists(self, session_id: str) -> bool:
+        """Check if session state exists"""
+        return session_exists(session_id)
+
+    def close(self) -> None:
+        """Nothing to release"""
+
+    def _revision(self, session_id: str) -> Optional[str]:
+        """
+        Revision from file metadata
+
+        Snapshots are written by rename, so the inode changes with every
+        snapshot; journal appends change its size.
+        """
+        session_dir = Path(".embody/sessions") / session_id
+        try:
+            snapshot = os.stat(session_dir / "state.json")
+        except FileNotFoundError:
+            return None
+        try:
+            journal_size = os.stat(session_dir / "state.journal").st_size
+        except FileNotFoundError:
+            journal_size = 0
+        return f"{snapshot.st_ino}:{snapshot.st_mtime_ns}:{snapshot.st_size}:{journal_size}"
+
+    @contextmanager
+    def _locked(self, session_id: str) -> Iterator[None]:
+        """Exclusive cross-process lock on one session's files"""
+        if fcntl is None:
+            yield
+            return
+
+        fd = os.open(get_session_dir(session_id) / "state.lock", os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+
+class SQLiteStateStore:
+    """Session state as snapshot and delta rows in one SQLite database"""
+
+    name = "sqlite"
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            session_id TEXT PRIMARY KEY,
+            revision INTEGER NOT NULL,
+            state TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS deltas (
+            session_id TEXT NOT NULL,
+            revision INTEGER NOT NULL,
+            delta TEXT NOT NULL,
+            PRIMARY KEY (session_id, revision)
+        );
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+    def load(self, session_id: str) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Load session state (snapshot plus later deltas) and its revision
+
+        Raises:
+            FileNotFoundError: If session doesn't exist
+            ValueError: If state is malformed
+        """
+        conn = self._connection()
+        with self._transaction(conn, "BEGIN"):
+            state, revision = self._read_state(conn, session_id)
+        return state, str(revision)
+
+    def save(self, session_id: str, state: Dict[str, Any], expected: Optional[str] = None) -> Optional[str]:
+        """
+        Write a full snapshot (dropping folded-in deltas)
+
+        Args:
+            session_id: Session identifier
+            state: State to persist
+            expected: Only write if the stored revision still equals this
+                (None = write unconditionally)
+
+        Returns:
+            New revision, or None if another writer got there first
+
+        Raises:
+            IOError: If unable to write
+        """
+        payload = json.dumps(state, ensure_ascii=False)
+        conn = self._connection()
+        try:
+            with self._transaction(conn, "BEGIN IMMEDIATE"):
+                current = self._current_revision(conn, session_id)
+                if expected is not None and str(current) != expected:
+                    return None
+                revision = (current or 0) + 1
+                conn.execute(
+                    "INSERT OR REPLACE INTO snapshots (session_id, revision, state) VALUES (?, ?, ?)",
+                    (session_id, revision, payload)
+                )
+                conn.execute("DELETE FROM deltas WHERE session_id = ?", (session_id,))
+        except sqlite3.Error as e:
+            raise IOError(f"Failed to save session state for {session_id}: {e}")
+        return str(revision)
+
+    def append(self, session_id: str, delta: Dict[str, Any], expected: Optional[str]) -> Optional[str]:
+        """
+        Record one delta
+
+        Args:
+            session_id: Session identifier
+            delta: Delta produced by make_session_delta()
+            expected: Revision the delta was built against
+
+        Returns:
+            New revision, or None if another writer got there first
+
+        Raises:
+            IOError: If unable to write
+        """
+        payload = json.dumps(delta, ensure_ascii=False, separators=(",", ":"))
+        conn = self._connection()
+        try:
+            with self._transaction(conn, "BEGIN IMMEDIATE"):
+                current = self._current_revision(conn, session_id)
+                if current is None or str(current) != expected:
+                    return None
+                conn.execute(
+                    "INSERT INTO deltas (session_id, revision, delta) VALUES (?, ?, ?)",
+                    (session_id, current + 1, payload)
+                )
+        except sqlite3.Error as e:
+            raise IOError(f"Failed to append session delta for {session_id}: {e}")
+        return str(current + 1)
+
+    def append_latest(
+        self,
+        session_id: str,
+        build_delta: Callable[[Dict[str, Any]], Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Record a delta built against the latest stored state
+
+        Reads the state and writes the delta in one write transaction, so
+        unlike append() this can't lose a race. Used once append() has
+        reported a conflict.
+
+        Args:
+            session_id: Session identifier
+            build_delta: Builds the delta from the current state (called once)
+
+        Returns:
+            (state with the delta applied, new revision)
+
+        Raises:
+            FileNotFoundError: If session doesn't exist
+            ValueError: If stored state is malformed
+            IOError: If unable to write
+        """
+        conn = self._connection()
+        try:
+            with self._transaction(conn, "BEGIN IMMEDIATE"):
+                state, current = self._read_state(conn, session_id)
+                delta = build_delta(state)
+                conn.execute(
+                    "INSERT INTO deltas (session_id, revision, delta) VALUES (?, ?, ?)",
+                    (session_id, current + 1, json.dumps(delta, ensure_ascii=False, separators=(",", ":")))
+                )
+        except sqlite3.Error as e:
+            raise IOError(f"Failed to append session delta for {session_id}: {e}")
+        apply_session_delta(state, delta)
+        return state, str(current + 1)
+
+    def refresh(self, session_id: str, state: Dict[str, Any], revision: Optional[str]) -> Optional[str]:
+        """
+        Bring a state loaded at `revision` up to date in place
+
+        Applies only the deltas recorded since, instead of reloading the
+        whole state.
+
+        Returns:
+            Current revision, or None if a snapshot was written since (or the
+            new deltas can't be read) and the state must be reloaded
+        """
+        if revision is None:
+            return None
+
+        conn = self._connection()
+        with self._transaction(conn, "BEGIN"):
+            row = conn.execute(
+                "SELECT revision FROM snapshots WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None or row[0] > int(revision):
+                return None
+            rows = conn.execute(
+                "SELECT revision, delta FROM deltas WHERE session_id = ? AND revision > ? ORDER BY revision",
+                (session_id, int(revision))
+            ).fetchall()
+
+        try:
+            deltas = [json.loads(delta) for _, delta in rows]
+        except json.JSONDecodeError:
+            return None
+        for delta in deltas:
+            apply_session_delta(state, delta)
+        return str(rows[-1][0]) if rows else revision
+
+    def revision(self, session_id: str) -> Optional[str]:
+        """Current revision (None if the session doesn't exist)"""
+        current = self._current_revision(self._connection(), session_id)
+        return None if current is None else str(current)
+
+    def journal_length(self, session_id: str) -> int:
+        """Deltas not yet folded into the snapshot"""
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM deltas WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return row[0]
+
+    def exists(self, session_id: str) -> bool:
+        """Check if session state exists"""
+        return self.revision(session_id) is not None
+
+    def close(self) -> None:
+        """Close every connection opened by this store"""
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _read_state(self, conn: sqlite3.Connection, session_id: str) -> Tuple[Dict[str, Any], int]:
+        """
+        Snapshot plus later deltas, within the caller's transaction
+
+        Raises:
+            FileNotFoundError: If session doesn't exist
+            ValueError: If stored state is malformed
+        """
+        row = conn.execute(
+            "SELECT revision, state FROM snapshots WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Session state not found for {session_id}")
+        deltas = conn.execute(
+            "SELECT revision, delta FROM deltas WHERE session_id = ? AND revision > ? ORDER BY revision",
+            (session_id, row[0])
+        ).fetchall()
+
+        try:
+            state = json.loads(row[1])
+            revision = row[0]
+            for revision, delta in deltas:
+                apply_session_delta(state, json.loads(delta))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Malformed session state for {session_id}: {e}")
+
+        return state, revision
+
+    def _current_revision(self, conn: sqlite3.Connection, session_id: str) -> Optional[int]:
+        """Latest revision of a session (snapshot or delta)"""
+        row = conn.execute(
+            """
+            SELECT s.revision, (SELECT MAX(revision) FROM deltas WHERE session_id = s.session_id)
+            FROM snapshots s WHERE s.session_id = ?
+            """,
+            (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return max(row[0], row[1] or 0)
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection (opened on first use)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=SQLITE_TIMEOUT,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self._SCHEMA)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self, conn: sqlite3.Connection, begin: str) -> Iterator[None]:
+        """Explicit transaction: commit on exit, roll back on error"""
+        conn.execute(begin)
+        committed = False
+        try:
+            yield
+            conn.execute("COMMIT")
+            committed = True
+        finally:
+            if not committed:
+                conn.execute("ROLLBACK")
@@ -5,12 +5,83 @@ Extracts design tokens from repository code.
 """
 
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import json
-import re
+import mmap
+import os
+import time
 
+from .executor import run_blocking, get_executor, get_process_executor
+from .extraction_cache import (
+    load_extraction_cache,
+    save_extraction_cache,
+    load_blob_cache,
+    save_blob_cache,
+    stat_matches,
+    content_hash,
+    make_cache_entry,
+)
+from .repo_walker import (
+    walk_token_files,
+    is_token_file_name,
+    DEFAULT_IGNORED_DIRS,
+    MAX_DEPTH as SCAN_MAX_DEPTH,
+)
+from .git_objects import GitBlobReader, resolve_commit, list_tree
+from .token_ranking import select_candidates, measure_sample, BYTE_BUDGET, SAMPLE_BYTES, TIME_BUDGET_MS
+from .js_object_parser import find_object
+from .css_scanner import scan_css
+from .token_graph import build_token_graph, resolve_token_references
 
-async def extract_tokens_from_repo(repo_path: str) -> Dict[str, Any]:
+
+# How changed token files are parsed: "serial", "thread" or "process"
+PARSE_MODE = os.getenv("EMBODY_TOKEN_PARSE_MODE", "thread")
+
+# Skipped files listed in a result (the rest are only counted), so a huge
+# monorepo can't bloat the session state
+MAX_REPORTED_SKIPPED = 50
+
+# Blob bytes kept between ranking and parsing at a ref; selected blobs past
+# this are read a second time rather than holding every candidate in memory
+BLOB_RETAIN_BYTES = 2 * BYTE_BUDGET
+
+# Stylesheets are scanned for custom properties
+CSS_SUFFIXES = (".css", ".scss", ".sass")
+
+# Tailwind theme keys -> token category
+TAILWIND_CATEGORIES = {
+    "colors": "colors",
+    "backgroundColor": "colors",
+    "textColor": "colors",
+    "borderColor": "colors",
+    "ringColor": "colors",
+    "fill": "colors",
+    "stroke": "colors",
+    "fontFamily": "typography",
+    "fontSize": "typography",
+    "fontWeight": "typography",
+    "lineHeight": "typography",
+    "letterSpacing": "typography",
+    "spacing": "spacing",
+    "padding": "spacing",
+    "margin": "spacing",
+    "gap": "spacing",
+    "inset": "spacing",
+    "boxShadow": "effects",
+    "dropShadow": "effects",
+    "borderRadius": "effects",
+    "borderWidth": "effects",
+    "blur": "effects",
+    "opacity": "effects",
+    "transitionDuration": "behaviors",
+    "transitionTimingFunction": "behaviors",
+    "transitionDelay": "behaviors",
+    "animation": "behaviors",
+    "keyframes": "behaviors",
+}
+
+
+async def extract_tokens_from_repo(repo_path: str, ref: Optional[str] = None) -> Dict[str, Any]:
     """
     Extract design tokens from repository
     
@@ -22,6 +93,8 @@ async def extract_tokens_from_repo(repo_path: str) -> Dict[str, Any]:
     
     Args:
         repo_path: Path to repository root
+        ref: Git revision to read from the object database instead of the
+            working tree (branch, tag or commit; no checkout needed)
         
     Returns:
         {
@@ -30,38 +103,476 @@ async def extract_tokens_from_repo(repo_path: str) -> Dict[str, Any]:
             "spacing": {...},
             "effects": {...},
             "behaviors": {...},
+            "themes": {selector: {category: {...}}} (CSS variants, if any),
+            "aliases": {path: raw value} (tokens whose references were resolved),
+            "token_graph": {"tokens", "aliases", "cycles", "unresolved"},
             "source_files": [...]
         }
     """
+    # Globbing and parsing are blocking - keep them off the event loop
+    return await run_blocking(extract_tokens_from_repo_sync, repo_path, ref=ref, pool="extract")
+
+
+def extract_tokens_from_repo_sync(
+    repo_path: str,
+    use_cache: bool = True,
+    parse_mode: Optional[str] = None,
+    ref: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Extract design tokens from repository (blocking)
+    
+    Same as extract_tokens_from_repo() for callers already off the event loop.
+    Files unchanged since the last extraction of this repository are taken
+    from the extraction cache instead of being re-read and re-parsed. The
+    remaining files are parsed concurrently, then merged in relevance order
+    so the result is identical to a serial run.
+    
+    Args:
+        repo_path: Path to repository root
+        use_cache: Reuse and update the persistent extraction cache
+        parse_mode: "serial", "thread" or "process" (env EMBODY_TOKEN_PARSE_MODE)
+        ref: Git revision to extract at (see extract_tokens_from_repo)
+        
+    Returns:
+        Token dictionary (see extract_tokens_from_repo), plus
+        "cache": {"reused": int, "parsed": int},
+        "source_file_stats": [{"path", "bytes", "cached", "parse_ms"}],
+        "skipped_files": [{"path", "reason", "score"}] (at most MAX_REPORTED_SKIPPED),
+        "discovery": {"candidates", "skipped", "entries_scanned", "truncated", "elapsed_ms"} and,
+        with a ref, "ref": {"name": str, "commit": str}
+        
+    Raises:
+        ValueError: If ref is given but can't be resolved in a local git repository
+    """
     repo_path_obj = Path(repo_path)
     
     if not repo_path_obj.exists():
         return _empty_tokens_result(f"Repository path does not exist: {repo_path}")
     
+    if ref is not None:
+        return _extract_tokens_at_ref(repo_path_obj, ref, use_cache, parse_mode)
+    
     tokens = {
         "colors": {},
         "typography": {},
         "spacing": {},
         "effects": {},
         "behaviors": {},
-        "source_files": []
+        "source_files": [],
+        "source_file_stats": []
     }
     
-    # Try to find token files
-    token_files = _find_token_files(repo_path_obj)
+    # Pick the most relevant token files within budget
+    discovery = _find_token_files(repo_path_obj)
+    token_files = discovery["files"]
+    tokens["skipped_files"] = discovery["skipped"]
+    tokens["discovery"] = discovery["discovery"]
+    
+    # Merge least relevant first so the best file wins conflicting names
+    token_files = token_files[::-1]
+    rel_paths = [str(token_file.relative_to(repo_path_obj)) for token_file in token_files]
+    
+    cached_files = load_extraction_cache(repo_path_obj)["files"] if use_cache else {}
+    results = _load_all_file_tokens(token_files, [cached_files.get(rel) for rel in rel_paths], parse_mode)
     
-    for token_file in token_files:
-        tokens["source_files"].append(str(token_file.relative_to(repo_path_obj)))
-        file_tokens = _extract_from_file(token_file)
-        _merge_tokens(tokens, file_tokens)
+    cache_files: Dict[str, Any] = {}
+    reused = 0
+    
+    # Merge in selection order regardless of completion order
+    for token_file, rel_path, result in zip(token_files, rel_paths, results):
+        tokens["source_files"].append(rel_path)
+        
+        if isinstance(result, Exception):
+            # Non-blocking - log but continue
+            print(f"Warning: Failed to extract from {token_file}: {result}")
+            continue
+        
+        entry, was_cached, parse_ms = result
+        reused += was_cached
+        cache_files[rel_path] = entry
+        tokens["source_file_stats"].append({
+            "path": rel_path,
+            "bytes": entry["size"],
+            "cached": was_cached,
+            "parse_ms": parse_ms
+        })
+        _merge_tokens(tokens, entry["tokens"])
+    
+    if use_cache and cache_files != cached_files:
+        save_extraction_cache(repo_path_obj, cache_files)
     
     # If no tokens found, return empty but valid structure
     if not tokens["source_files"]:
-        return _empty_tokens_result("No design token files found")
+        empty = _empty_tokens_result("No design token files found")
+        empty["skipped_files"] = tokens["skipped_files"]
+        empty["discovery"] = tokens["discovery"]
+        return empty
+    
+    return _finish_tokens(tokens, reused, len(cache_files) - reused)
+
+
+def _extract_tokens_at_ref(
+    repo_path: Path,
+    ref: str,
+    use_cache: bool,
+    parse_mode: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Extract tokens from a commit's tree via git objects (no checkout)
+    
+    Candidates come from one `git ls-tree` listing and are ranked like
+    working-tree files; blobs are read through a single `git cat-file
+    --batch` process. Parsed tokens are cached by blob id with their
+    sample measure, so cached blobs are ranked without being read and
+    files that are identical across refs are parsed once. Uncached blobs
+    are read once: the bytes sampled for ranking are kept for parsing.
+    
+    Raises:
+        ValueError: If the ref can't be resolved or git is unavailable
+    """
+    start = time.monotonic()
+    deadline = start + TIME_BUDGET_MS / 1000
+    
+    commit = resolve_commit(repo_path, ref)
+    tree = list_tree(repo_path, commit)
+    candidates = [entry for entry in tree if _is_tree_candidate(entry["rel_path"])]
+    
+    tokens = {
+        "colors": {},
+        "typography": {},
+        "spacing": {},
+        "effects": {},
+        "behaviors": {},
+        "source_files": [],
+        "source_file_stats": [],
+        "ref": {"name": ref, "commit": commit}
+    }
+    
+    cached_blobs = load_blob_cache(repo_path) if use_cache else {}
+    used_blobs: Dict[str, Any] = {}
+    reused = 0
+    
+    # Uncached blobs read while ranking, kept (up to BLOB_RETAIN_BYTES) for parsing
+    blob_data: Dict[str, bytes] = {}
+    retained = 0
+    
+    def read_sample(candidate: Dict[str, Any]) -> Optional[Any]:
+        nonlocal retained
+        sha = candidate["sha"]
+        if sha in cached_blobs:
+            return tuple(cached_blobs[sha]["sample"])
+        data = blob_data.get(sha) or _read_blob(reader, sha)
+        if data is None:
+            return None
+        if sha not in blob_data and retained + len(data) <= BLOB_RETAIN_BYTES:
+            blob_data[sha] = data
+            retained += len(data)
+        return data[:SAMPLE_BYTES]
+    
+    with GitBlobReader(repo_path) as reader:
+        ranking = select_candidates(candidates, read_sample, deadline=deadline)
+        tokens["skipped_files"] = ranking["skipped"][:MAX_REPORTED_SKIPPED]
+        tokens["discovery"] = {
+            "candidates": len(candidates),
+            "skipped": len(ranking["skipped"]),
+            "entries_scanned": len(tree),
+            "truncated": None,
+            "elapsed_ms": round((time.monotonic() - start) * 1000, 2)
+        }
+        
+        # Merge least relevant first so the best file wins conflicting names
+        selected = ranking["selected"][::-1]
+        
+        jobs = []
+        samples = {}
+        for candidate in selected:
+            sha = candidate["sha"]
+            if sha in cached_blobs:
+                continue
+            # Blobs not sampled (past the deadline) or not retained are read here
+            data = blob_data.get(sha) or _read_blob(reader, sha)
+            if data is not None:
+                jobs.append((candidate["rel_path"], data))
+                samples[sha] = measure_sample(data[:SAMPLE_BYTES])
+    
+    blob_data.clear()
+    parsed = dict(zip(
+        [rel_path for rel_path, _ in jobs],
+        _parse_blobs(jobs, parse_mode)
+    ))
+    
+    for candidate in selected:
+        rel_path, sha = candidate["rel_path"], candidate["sha"]
+        tokens["source_files"].append(rel_path)
+        
+        if sha in cached_blobs:
+            entry, parse_ms, was_cached = cached_blobs[sha], 0.0, True
+        elif isinstance(parsed.get(rel_path), tuple):
+            (file_tokens, parse_ms), was_cached = parsed[rel_path], False
+            entry = {"tokens": file_tokens, "sample": list(samples[sha])}
+        else:
+            # Non-blocking - log but continue
+            print(f"Warning: Failed to extract from {rel_path} at {ref}: {parsed.get(rel_path, 'missing blob')}")
+            continue
+        
+        reused += was_cached
+        used_blobs[sha] = entry
+        tokens["source_file_stats"].append({
+            "path": rel_path,
+            "bytes": candidate["size"],
+            "cached": was_cached,
+            "parse_ms": parse_ms
+        })
+        _merge_tokens(tokens, entry["tokens"])
+    
+    if use_cache and any(sha not in cached_blobs for sha in used_blobs):
+        save_blob_cache(repo_path, used_blobs, cached_blobs)
+    
+    if not tokens["source_files"]:
+        empty = _empty_tokens_result(f"No design token files found at {ref}")
+        empty["skipped_files"] = tokens["skipped_files"]
+        empty["discovery"] = tokens["discovery"]
+        empty["ref"] = tokens["ref"]
+        return empty
+    
+    return _finish_tokens(tokens, reused, len(used_blobs) - reused)
+
+
+def _is_tree_candidate(rel_path: str) -> bool:
+    """Apply the working-tree walker's name, pruning and depth rules to a tree path"""
+    parts = rel_path.split("/")
+    return (
+        is_token_file_name(parts[-1])
+        and len(parts) - 1 <= SCAN_MAX_DEPTH
+        and not any(part in DEFAULT_IGNORED_DIRS for part in parts[:-1])
+    )
+
+
+def _read_blob(reader: GitBlobReader, sha: str) -> Optional[bytes]:
+    """Read a blob's content, or None if it's missing or unreadable"""
+    try:
+        return reader.read(sha)
+    except IOError:
+        return None
+
+
+def _parse_blobs(jobs: List[Tuple[str, bytes]], parse_mode: Optional[str]) -> List[Any]:
+    """
+    Parse blob contents, concurrently unless in serial mode
+    
+    Returns:
+        Per job, in input order: (tokens, parse_ms) or the exception raised
+    """
+    mode = (parse_mode or PARSE_MODE).lower()
+    
+    if mode == "serial" or len(jobs) < 2:
+        return [_run_blob_job(rel_path, data) for rel_path, data in jobs]
+    
+    executor = get_process_executor() if mode == "process" else get_executor("parse")
+    futures = [executor.submit(_run_blob_job, rel_path, data) for rel_path, data in jobs]
+    
+    results: List[Any] = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def _run_blob_job(rel_path: str, data: bytes) -> Tuple[Dict[str, Any], float]:
+    """Worker entry point: parse one blob, timing the work"""
+    start = time.perf_counter()
+    tokens = _extract_from_content(Path(rel_path), data)
+    return tokens, round((time.perf_counter() - start) * 1000, 2)
+
+
+def _finish_tokens(tokens: Dict[str, Any], reused: int, parsed: int) -> Dict[str, Any]:
+    """Resolve references and order the report (merged least relevant first)"""
+    # Resolve {alias} and var() references once, for every consumer
+    resolve_token_references(tokens)
+    
+    # Report best first
+    tokens["source_files"].reverse()
+    tokens["source_file_stats"].reverse()
+    tokens["cache"] = {"reused": reused, "parsed": parsed}
     
     return tokens
 
 
+async def diff_token_refs(
+    repo_path: str,
+    base_ref: str,
+    head_ref: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Compare extracted tokens between two refs
+    
+    Args:
+        repo_path: Path to a local git repository
+        base_ref: Git revision to compare from
+        head_ref: Git revision to compare to (None = working tree)
+        
+    Returns:
+        See diff_token_refs_sync()
+    """
+    return await run_blocking(diff_token_refs_sync, repo_path, base_ref, head_ref, pool="extract")
+
+
+def diff_token_refs_sync(
+    repo_path: str,
+    base_ref: str,
+    head_ref: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Compare extracted tokens between two refs (blocking)
+    
+    Both sides are extracted (cache-backed) and compared on resolved values
+    by canonical token path.
+    
+    Returns:
+        {
+            "base": {"ref": str, "commit": str},
+            "head": {"ref": Optional[str], "commit": Optional[str]},
+            "added": {path: value},
+            "removed": {path: value},
+            "changed": {path: {"from": value, "to": value}},
+            "unchanged": int
+        }
+        
+    Raises:
+        ValueError: If a ref can't be resolved
+    """
+    base = extract_tokens_from_repo_sync(repo_path, ref=base_ref)
+    head = extract_tokens_from_repo_sync(repo_path, ref=head_ref)
+    
+    base_values = build_token_graph(base)["values"]
+    head_values = build_token_graph(head)["values"]
+    
+    diff: Dict[str, Any] = {
+        "base": base.get("ref", {"name": base_ref, "commit": None}),
+        "head": head.get("ref", {"name": head_ref, "commit": None}),
+        "added": {},
+        "removed": {},
+        "changed": {},
+        "unchanged": 0
+    }
+    
+    for path, value in head_values.items():
+        if path not in base_values:
+            diff["added"][path] = value
+        elif base_values[path] != value:
+            diff["changed"][path] = {"from": base_values[path], "to": value}
+        else:
+            diff["unchanged"] += 1
+    
+    for path, value in base_values.items():
+        if path not in head_values:
+            diff["removed"][path] = value
+    
+    return diff
+
+
+def _load_all_file_tokens(
+    token_files: List[Path],
+    entries: List[Optional[Dict[str, Any]]],
+    parse_mode: Optional[str]
+) -> List[Any]:
+    """
+    Load every file's cache entry, parsing changed files in a worker pool
+    
+    Files whose stat matches their cache entry are resolved inline; only the
+    rest are dispatched.
+    
+    Returns:
+        Per file, in input order: (entry, cached, parse_ms) or the exception raised
+    """
+    mode = (parse_mode or PARSE_MODE).lower()
+    results: List[Any] = [None] * len(token_files)
+    jobs = []
+    
+    for index, (token_file, entry) in enumerate(zip(token_files, entries)):
+        try:
+            if stat_matches(entry, token_file.stat()):
+                results[index] = (entry, True, 0.0)
+                continue
+        except OSError as e:
+            results[index] = e
+            continue
+        jobs.append(index)
+    
+    if mode == "serial" or len(jobs) < 2:
+        for index in jobs:
+            results[index] = _run_file_job(str(token_files[index]), entries[index])
+        return results
+    
+    executor = get_process_executor() if mode == "process" else get_executor("parse")
+    futures = {
+        index: executor.submit(_run_file_job, str(token_files[index]), entries[index])
+        for index in jobs
+    }
+    for index, future in futures.items():
+        try:
+            results[index] = future.result()
+        except Exception as e:
+            # Worker crash (e.g. broken process pool)
+            results[index] = e
+    
+    return results
+
+
+def _run_file_job(file_path: str, entry: Optional[Dict[str, Any]]) -> Any:
+    """Worker entry point: load one file's tokens, timing the work"""
+    start = time.perf_counter()
+    try:
+        new_entry, was_cached = _load_file_tokens(Path(file_path), entry)
+    except OSError as e:
+        return e
+    return new_entry, was_cached, round((time.perf_counter() - start) * 1000, 2)
+
+
+def _load_file_tokens(
+    file_path: Path,
+    entry: Optional[Dict[str, Any]]
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Get a file's cache entry, reusing cached tokens when the file is unchanged
+    
+    A stat match skips the read; a content hash match skips the parse.
+    
+    Returns:
+        (cache entry, whether the tokens came from the cache)
+        
+    Raises:
+        OSError: If the file can't be read
+    """
+    stat = file_path.stat()
+    if stat_matches(entry, stat):
+        return entry, True
+    
+    if file_path.suffix in CSS_SUFFIXES and stat.st_size > 0:
+        # Compiled CSS can be several MB - hash and scan the mapping in place
+        with file_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _tokens_for_content(file_path, stat, data, entry)
+    
+    return _tokens_for_content(file_path, stat, file_path.read_bytes(), entry)
+
+
+def _tokens_for_content(
+    file_path: Path,
+    stat: os.stat_result,
+    data: Any,
+    entry: Optional[Dict[str, Any]]
+) -> Tuple[Dict[str, Any], bool]:
+    """Build a file's cache entry from its content, parsing only if the hash changed"""
+    digest = content_hash(data)
+    if entry is not None and entry.get("sha256") == digest:
+        return make_cache_entry(stat, digest, entry["tokens"]), True
+    
+    return make_cache_entry(stat, digest, _extract_from_content(file_path, data)), False
+
+
 def _empty_tokens_result(message: str) -> Dict[str, Any]:
     """Return empty tokens structure with message"""
     return {
@@ -75,44 +586,63 @@ def _empty_tokens_result(message: str) -> Dict[str, Any]:
     }
 
 
-def _find_token_files(repo_path: Path) -> list[Path]:
-    """Find potential token files in repository"""
-    token_files = []
-    
-    # Common token file patterns
-    patterns = [
-        "tokens.json",
-        "design-tokens.json",
-        "**/tokens.json",
-        "**/design-tokens.json",
-        "tailwind.config.js",
-        "tailwind.config.ts",
-        "**/tailwind.config.js",
-        "**/tailwind.config.ts",
-        "**/*.tokens.json",
-        "variables.css",
-        "**/variables.css",
-        "**/:root.css",
-    ]
-    
-    for pattern in patterns:
-        token_files.extend(repo_path.glob(pattern))
-    
-    # Deduplicate and limit
-    seen = set()
-    unique_files = []
-    for f in token_files:
-        if f not in seen and f.is_file():
-            seen.add(f)
-            unique_files.append(f)
-            if len(unique_files) >= 10:  # Limit to 10 files
-                break
-    
-    return unique_files
-
-
-def _extract_from_file(file_path: Path) -> Dict[str, Any]:
-    """Extract tokens from a single file"""
+def _find_token_files(repo_path: Path) -> Dict[str, Any]:
+    """
+    Find the most relevant token files in repository
+    
+    Every candidate found by the walk is ranked by name, location and token
+    density; the best are selected within the byte and time budgets.
+    
+    Returns:
+        {
+            "files": List[Path] (best first),
+            "skipped": [{"path", "reason", "score"}] (at most MAX_REPORTED_SKIPPED),
+            "discovery": {"candidates", "skipped", "entries_scanned", "truncated", "elapsed_ms"}
+        }
+    """
+    start = time.monotonic()
+    deadline = start + TIME_BUDGET_MS / 1000
+    
+    walk = walk_token_files(repo_path, deadline=deadline)
+    
+    candidates = []
+    for file_path in walk["files"]:
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            continue
+        candidates.append({
+            "path": file_path,
+            "rel_path": file_path.relative_to(repo_path).as_posix(),
+            "size": size
+        })
+    
+    ranking = select_candidates(candidates, _read_sample, deadline=deadline)
+    
+    return {
+        "files": [candidate["path"] for candidate in ranking["selected"]],
+        "skipped": ranking["skipped"][:MAX_REPORTED_SKIPPED],
+        "discovery": {
+            "candidates": len(candidates),
+            "skipped": len(ranking["skipped"]),
+            "entries_scanned": walk["entries_scanned"],
+            "truncated": walk["truncated"],
+            "elapsed_ms": round((time.monotonic() - start) * 1000, 2)
+        }
+    }
+
+
+def _read_sample(candidate: Dict[str, Any]) -> Optional[bytes]:
+    """Read the head of a candidate file for density scoring"""
+    try:
+        with candidate["path"].open("rb") as f:
+            return f.read(SAMPLE_BYTES)
+    except OSError:
+        return None
+
+
+def _extract_from_content(file_path: Path, data: Any) -> Dict[str, Any]:
+    """Extract tokens from a file's already-read (or memory-mapped) content"""
     tokens = {
         "colors": {},
         "typography": {},
@@ -122,14 +652,12 @@ def _extract_from_file(file_path: Path) -> Dict[str, Any]:
     }
     
     try:
-        content = file_path.read_text(encoding="utf-8")
-        
-        if file_path.suffix == ".json":
-            tokens = _extract_from_json(content)
-        elif file_path.suffix in [".css", ".scss", ".sass"]:
-            tokens = _extract_from_css(content)
+        if file_path.suffix in CSS_SUFFIXES:
+            tokens = _extract_from_css(data)
+        elif file_path.suffix == ".json":
+            tokens = _extract_from_json(bytes(data).decode("utf-8"))
         elif file_path.suffix in [".js", ".ts"]:
-            tokens = _extract_from_js_config(content)
+            tokens = _extract_from_js_config(bytes(data).decode("utf-8"))
     except Exception as e:
         # Non-blocking - log but continue
         print(f"Warning: Failed to extract from {file_path}: {e}")
@@ -157,41 +685,26 @@ def _extract_from_json(content: str) -> Dict[str, Any]:
     return {}
 
 
-def _extract_from_css(content: str) -> Dict[str, Any]:
-    """Extract CSS variables from CSS file"""
-    tokens = {
-        "colors": {},
-        "typography": {},
-        "spacing": {},
-        "effects": {},
-        "behaviors": {}
-    }
-    
-    # Find CSS variable declarations
-    # Pattern: --variable-name: value;
-    pattern = r'--([a-zA-Z0-9-_]+):\s*([^;]+);'
-    matches = re.findall(pattern, content)
-    
-    for name, value in matches:
-        value = value.strip()
-        
-        # Categorize by variable name
-        if any(x in name for x in ["color", "bg", "text", "border"]):
-            tokens["colors"][name] = value
-        elif any(x in name for x in ["font", "text", "family", "size", "weight", "line-height"]):
-            tokens["typography"][name] = value
-        elif any(x in name for x in ["spacing", "space", "margin", "padding", "gap"]):
-            tokens["spacing"][name] = value
-        elif any(x in name for x in ["shadow", "radius", "border-radius", "blur"]):
-            tokens["effects"][name] = value
-        elif any(x in name for x in ["transition", "duration", "timing", "animation"]):
-            tokens["behaviors"][name] = value
+def _extract_from_css(data: Any) -> Dict[str, Any]:
+    """
+    Extract CSS variables from CSS content
     
-    return tokens
+    Args:
+        data: bytes or a memory-mapped file - scanned without decoding it whole
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return scan_css(data)
 
 
 def _extract_from_js_config(content: str) -> Dict[str, Any]:
-    """Extract tokens from JavaScript/TypeScript config (Tailwind, etc.)"""
+    """
+    Extract tokens from JavaScript/TypeScript config (Tailwind, etc.)
+    
+    Parses the `theme` object literal (including `theme.extend`, merged on
+    top) into nested key/value tokens. Computed values such as
+    `defaultTheme.fontFamily.sans`, and spreads, are kept as their source text.
+    """
     tokens = {
         "colors": {},
         "typography": {},
@@ -200,32 +713,47 @@ def _extract_from_js_config(content: str) -> Dict[str, Any]:
         "behaviors": {}
     }
     
-    # This is a simplified extraction
-    # In a full implementation, you'd parse the JS AST
-    # For now, just look for obvious patterns
-    
-    # Try to find theme.extend or theme definitions
-    if "colors:" in content or "colors :" in content:
-        # Extract color definitions (simplified)
-        color_block = re.search(r'colors:\s*\{([^}]+)\}', content, re.DOTALL)
-        if color_block:
-            tokens["colors"]["_raw"] = color_block.group(1).strip()
+    theme = find_object(content, "theme")
+    if not isinstance(theme, dict):
+        return tokens
     
-    if "fontSize:" in content or "fontSize :" in content:
-        font_block = re.search(r'fontSize:\s*\{([^}]+)\}', content, re.DOTALL)
-        if font_block:
-            tokens["typography"]["_raw"] = font_block.group(1).strip()
+    extend = theme.pop("extend", None)
+    sections = [theme, extend] if isinstance(extend, dict) else [theme]
     
-    if "spacing:" in content or "spacing :" in content:
-        spacing_block = re.search(r'spacing:\s*\{([^}]+)\}', content, re.DOTALL)
-        if spacing_block:
-            tokens["spacing"]["_raw"] = spacing_block.group(1).strip()
+    for section in sections:
+        for key, value in section.items():
+            category = TAILWIND_CATEGORIES.get(key)
+            if category is None:
+                continue
+            
+            # Palettes are the color tokens themselves; other scales keep their key
+            if not isinstance(value, dict):
+                # Computed scale (e.g. a function) - keep its source text
+                tokens[category][key] = value
+            elif key == "colors":
+                _deep_merge(tokens[category], value)
+            else:
+                _deep_merge(tokens[category].setdefault(key, {}), value)
     
     return tokens
 
 
+def _deep_merge(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    """Recursively merge source into target (source wins on conflicts)"""
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_merge(target[key], value)
+        else:
+            target[key] = value
+
+
 def _merge_tokens(target: Dict[str, Any], source: Dict[str, Any]) -> None:
-    """Merge source tokens into target"""
+    """Merge source tokens (including theme variants) into target"""
     for category in ["colors", "typography", "spacing", "effects", "behaviors"]:
         if category in source:
             target[category].update(source[category])
+    
+    for theme, categories in source.get("themes", {}).items():
+        merged = target.setdefault("themes", {}).setdefault(theme, {})
+        for category, values in categories.items():
+            merged.setdefault(category, {}).update(values)
@@ -0,0 +1,351 @@
+"""
+Token Graph
+
+Resolves references between extracted design tokens.
+
+Style Dictionary / DTCG values point at other tokens with `{color.blue.500}`
+and CSS custom properties with `var(--brand, fallback)`. The merged token
+tree is flattened once into a graph keyed by canonical dotted path
+(`colors.blue.500`), with an alias edge for every reference. Each token is
+then resolved exactly once (memoized, with cycle detection), so looking up
+any token afterwards is a dict access.
+"""
+
+from typing import Any, Dict, List, Optional, Set
+import re
+
+
+CATEGORIES = ("colors", "typography", "spacing", "effects", "behaviors")
+
+# First segment of a Style Dictionary reference -> extracted category
+CATEGORY_ALIASES = {
+    "color": "colors",
+    "colors": "colors",
+    "font": "typography",
+    "fonts": "typography",
+    "typography": "typography",
+    "size": "spacing",
+    "space": "spacing",
+    "spacing": "spacing",
+    "shadow": "effects",
+    "shadows": "effects",
+    "effects": "effects",
+    "animation": "behaviors",
+    "motion": "behaviors",
+    "behaviors": "behaviors",
+}
+
+# Leaf markers for Style Dictionary and DTCG tokens
+_VALUE_KEYS = ("value", "$value")
+
+_REFERENCE = re.compile(
+    r'\{([^{}\s]+)\}'
+    r'|var\(\s*--([A-Za-z0-9_-]+)\s*(?:,\s*((?:[^()]|\([^()]*\))*))?\)'
+)
+
+# Alias hops followed in one recursive pass (keeps recursion bounded);
+# tokens further down a chain are resolved first, in passes of their own
+MAX_CHAIN = 100
+
+# Reported per list so a broken token file can't bloat the session state
+_MAX_REPORTED = 50
+
+
+def build_token_graph(tokens: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten tokens into a graph and resolve every reference
+
+    Args:
+        tokens: Merged extraction result (categories plus optional "themes")
+
+    Returns:
+        {
+            "values": {path: raw value},
+            "edges": {path: [referenced paths]},
+            "resolved": {path: resolved value},
+            "cycles": [path, ...] (tokens on a reference cycle, left raw),
+            "unresolved": {path: [reference, ...]}
+        }
+    """
+    graph: Dict[str, Any] = {
+        "values": {},
+        "edges": {},
+        "resolved": {},
+        "cycles": [],
+        "unresolved": {},
+        # (scope, css name) -> path, for var() lookups
+        "vars": {},
+        # path -> theme scope (None for base tokens)
+        "scopes": {},
+        # (path, remaining hops) -> (value, cut) for results cut short by
+        # MAX_CHAIN; valid within one pass only
+        "partial": {},
+        # (target path, reference) cut off by MAX_CHAIN in the current pass
+        "cut": [],
+    }
+
+    for category in CATEGORIES:
+        _flatten(graph, tokens.get(category), category, None)
+
+    for scope, categories in (tokens.get("themes") or {}).items():
+        for category in CATEGORIES:
+            _flatten(graph, categories.get(category), f"themes.{scope}.{category}", scope)
+
+    cycles: Set[str] = set()
+    for path in graph["values"]:
+        _resolve_root(graph, path, cycles)
+
+    graph["cycles"] = sorted(cycles)
+    del graph["vars"], graph["scopes"], graph["partial"], graph["cut"]
+    return graph
+
+
+def resolve_token_references(tokens: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replace token references with their resolved values, in place
+
+    Raw forms of every rewritten token are kept under tokens["aliases"]
+    (path -> raw), and tokens["token_graph"] summarizes the build.
+
+    Args:
+        tokens: Merged extraction result
+
+    Returns:
+        The same tokens dict
+    """
+    graph = build_token_graph(tokens)
+
+    aliases = {}
+    for path, raw in graph["values"].items():
+        value = graph["resolved"][path]
+        if value != raw:
+            aliases[path] = raw
+
+    for category in CATEGORIES:
+        _rewrite(tokens.get(category), category, graph["resolved"])
+    for scope, categories in (tokens.get("themes") or {}).items():
+        for category in CATEGORIES:
+            _rewrite(categories.get(category), f"themes.{scope}.{category}", graph["resolved"])
+
+    if aliases:
+        tokens["aliases"] = aliases
+    tokens["token_graph"] = {
+        "tokens": len(graph["values"]),
+        "aliases": len(aliases),
+        "cycles": graph["cycles"][:_MAX_REPORTED],
+        "unresolved": dict(list(graph["unresolved"].items())[:_MAX_REPORTED]),
+    }
+
+    return tokens
+
+
+def _flatten(graph: Dict[str, Any], node: Any, path: str, scope: Optional[str], depth: int = 0) -> None:
+    """Record every leaf under node by dotted path"""
+    if not isinstance(node, dict):
+        return
+
+    for key, value in node.items():
+        child = f"{path}.{key}"
+        if isinstance(value, dict) and not _is_leaf(value):
+            _flatten(graph, value, child, scope, depth + 1)
+            continue
+
+        graph["values"][child] = _leaf_value(value)
+        graph["scopes"][child] = scope
+        if depth == 0:
+            # Direct children of a category double as CSS custom properties
+            graph["vars"].setdefault((scope, str(key)), child)
+
+
+def _rewrite(node: Any, path: str, resolved: Dict[str, Any]) -> None:
+    """Write resolved values back into the token tree"""
+    if not isinstance(node, dict):
+        return
+
+    for key, value in node.items():
+        child = f"{path}.{key}"
+        if isinstance(value, dict) and not _is_leaf(value):
+            _rewrite(value, child, resolved)
+        elif child in resolved:
+            if isinstance(value, dict):
+                value[_value_key(value)] = resolved[child]
+            else:
+                node[key] = resolved[child]
+
+
+def _resolve_root(graph: Dict[str, Any], path: str, cycles: Set[str]) -> None:
+    """
+    Resolve one token with a full MAX_CHAIN budget
+
+    Tokens a pass couldn't reach within the budget are resolved first, each
+    in a pass of its own, and the pass is repeated; the memoized results
+    then don't depend on the order tokens are visited in. Only a reference
+    loop longer than MAX_CHAIN is left with references cut off.
+    """
+    resolved = graph["resolved"]
+    pending = [path]
+    waiting = {path}
+
+    while pending:
+        current = pending[-1]
+        if current not in resolved:
+            graph["partial"].clear()
+            graph["cut"] = []
+            value = _resolve(graph, current, {}, cycles)
+
+            if current not in resolved:
+                retry = False
+                for target, _ in graph["cut"]:
+                    if target in resolved:
+                        # Resolved later in the same pass
+                        retry = True
+                    elif target not in waiting:
+                        pending.append(target)
+                        waiting.add(target)
+                        retry = True
+                if retry:
+                    continue
+
+                # Cut only at tokens that are waiting on this one
+                resolved[current] = value
+                _report_unresolved(graph, current, [reference for _, reference in graph["cut"]])
+
+        pending.pop()
+
+
+def _resolve(graph: Dict[str, Any], path: str, visiting: Dict[str, None], cycles: Set[str]) -> Any:
+    """
+    Resolve one token (memoized); tokens on a cycle keep their raw value
+
+    A result cut short by MAX_CHAIN isn't memoized: it depends on how deep
+    the token was reached.
+    """
+    resolved = graph["resolved"]
+    if path in resolved:
+        return resolved[path]
+
+    key = (path, MAX_CHAIN - len(visiting))
+    partial = graph["partial"].get(key)
+    if partial is not None:
+        graph["cut"].extend(partial[1])
+        return partial[0]
+
+    raw = graph["values"][path]
+    if path in visiting:
+        # Everything from the first visit of path onwards is on the cycle
+        stack = list(visiting)
+        cycles.update(stack[stack.index(path):])
+        return raw
+
+    outer_cut = graph["cut"]
+    graph["cut"] = []
+    visiting[path] = None
+    value = raw if path in cycles else _substitute(graph, path, raw, visiting, cycles)
+    del visiting[path]
+    cut = graph["cut"]
+    outer_cut.extend(cut)
+    graph["cut"] = outer_cut
+
+    if path in cycles:
+        value = raw
+    elif cut:
+        graph["partial"][key] = (value, cut)
+        return value
+    resolved[path] = value
+    return value
+
+
+def _report_unresolved(graph: Dict[str, Any], path: str, references: List[str]) -> None:
+    """Record references left in a token's value (once each)"""
+    reported = graph["unresolved"].setdefault(path, [])
+    for reference in references:
+        if reference not in reported:
+            reported.append(reference)
+
+
+def _substitute(
+    graph: Dict[str, Any],
+    path: str,
+    raw: Any,
+    visiting: Dict[str, None],
+    cycles: Set[str]
+) -> Any:
+    """Replace every reference inside one raw value"""
+    if isinstance(raw, list):
+        return [_substitute(graph, path, item, visiting, cycles) for item in raw]
+    if not isinstance(raw, str) or ("{" not in raw and "var(" not in raw):
+        return raw
+
+    scope = graph["scopes"][path]
+    edges = graph["edges"].setdefault(path, [])
+
+    def replace(match: "re.Match[str]") -> Any:
+        reference, var_name, fallback = match.groups()
+        if reference:
+            target = _lookup_reference(graph, reference)
+        else:
+            # A theme's own override first, then the base token it overrides
+            target = graph["vars"].get((scope, var_name))
+            if target is None or target == path:
+                target = graph["vars"].get((None, var_name))
+
+        if target is not None and target != path:
+            if target not in edges:
+                edges.append(target)
+            if target in graph["resolved"] or len(visiting) < MAX_CHAIN:
+                value = _resolve(graph, target, visiting, cycles)
+                if target not in cycles:
+                    return value
+            else:
+                graph["cut"].append((target, match.group()))
+        elif target is None and fallback is not None:
+            return _substitute(graph, path, fallback.strip(), visiting, cycles)
+        else:
+            # A token cut short in one pass is substituted again in the next
+            _report_unresolved(graph, path, [match.group()])
+
+        return match.group()
+
+    # A value that is exactly one reference takes the target's type as-is
+    whole = _REFERENCE.fullmatch(raw.strip())
+    if whole:
+        return replace(whole)
+
+    return _REFERENCE.sub(lambda match: str(replace(match)), raw)
+
+
+def _lookup_reference(graph: Dict[str, Any], reference: str) -> Optional[str]:
+    """Canonical path for a Style Dictionary reference like color.blue.500"""
+    values = graph["values"]
+    parts = reference.split(".")
+    if parts[-1] in _VALUE_KEYS:
+        # Style Dictionary v2 spelling: {color.blue.500.value}
+        parts = parts[:-1]
+
+    candidates: List[str] = [".".join(parts)]
+    category = CATEGORY_ALIASES.get(parts[0])
+    if category:
+        candidates.append(".".join([category] + parts[1:]))
+    candidates.extend(f"{category}.{'.'.join(parts)}" for category in CATEGORIES)
+
+    for candidate in candidates:
+        if candidate in values:
+            return candidate
+    return None
+
+
+def _is_leaf(value: Dict[str, Any]) -> bool:
+    """Check whether a dict is a Style Dictionary / DTCG token"""
+    return any(key in value for key in _VALUE_KEYS)
+
+
+def _value_key(value: Dict[str, Any]) -> str:
+    """The value key a token dict uses"""
+    return "$value" if "$value" in value else "value"
+
+
+def _leaf_value(value: Any) -> Any:
+    """Raw value of a leaf"""
+    if isinstance(value, dict):
+        return value[_value_key(value)]
+    return value
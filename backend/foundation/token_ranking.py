@@ -0,0 +1,197 @@
+"""
+Token File Ranking
+
+Scores candidate token files and picks the best ones within a budget.
+
+A candidate's score combines its file name, where it lives in the repo
+(design-system packages beat fixtures and examples), and how densely its
+first few KB are packed with token declarations. Files are then taken in
+score order until the byte budget is spent; everything left out is
+reported with the reason it was skipped.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import math
+import os
+import re
+import time
+
+
+# Total bytes of token files parsed per extraction
+BYTE_BUDGET = int(os.getenv("EMBODY_TOKEN_BYTE_BUDGET", str(8 * 1024 * 1024)))
+
+# Wall-clock budget for discovery and ranking, in milliseconds
+TIME_BUDGET_MS = int(os.getenv("EMBODY_TOKEN_TIME_BUDGET_MS", "2000"))
+
+# Larger single files are almost always generated bundles
+MAX_FILE_BYTES = int(os.getenv("EMBODY_TOKEN_MAX_FILE_BYTES", str(5 * 1024 * 1024)))
+
+# Bytes read from each candidate to measure token density
+SAMPLE_BYTES = 64 * 1024
+
+_NAME_WEIGHTS = {
+    "design-tokens.json": 4.0,
+    "tokens.json": 3.0,
+    "tailwind.config.ts": 2.5,
+    "tailwind.config.js": 2.5,
+    "variables.css": 2.0,
+    ":root.css": 2.0,
+}
+_SUFFIX_WEIGHTS = {".tokens.json": 3.5}
+
+_PATH_BONUSES = {
+    "design-system": 2.0,
+    "design-tokens": 2.0,
+    "tokens": 1.5,
+    "theme": 1.0,
+    "themes": 1.0,
+    "styles": 0.5,
+    "brand": 1.0,
+    "foundations": 1.0,
+    "ui": 0.5,
+}
+_PATH_PENALTIES = {
+    "test": 2.0,
+    "tests": 2.0,
+    "__tests__": 2.0,
+    "fixtures": 2.5,
+    "__fixtures__": 2.5,
+    "examples": 2.0,
+    "example": 2.0,
+    "demo": 1.5,
+    "stories": 1.5,
+    "docs": 1.0,
+    "templates": 1.0,
+}
+
+_DEPTH_PENALTY = 0.2
+
+# Token declarations: CSS custom properties, Style Dictionary / DTCG values,
+# and token group keys - Tailwind theme keys, plain JSON groups and Style
+# Dictionary's singular category groups (quoted in JSON, bare in JS)
+_TOKEN_MARKERS = re.compile(
+    rb'--[A-Za-z0-9_-]+\s*:'
+    rb'|"\$?value"\s*:'
+    rb'|\b(?:colors?|fontSizes?|fontFamil(?:y|ies)|fontWeights?|lineHeights?|font|typography'
+    rb'|spacing|space|sizes?|boxShadows?|shadows?|borderRadius|radius|radii|opacity)"?\s*:'
+)
+
+
+# A sample, or its (markers, length) measure when the content isn't at hand
+Sample = Union[bytes, Tuple[int, int]]
+
+
+def measure_sample(sample: bytes) -> Tuple[int, int]:
+    """
+    Measure a content sample for density scoring
+
+    The measure depends only on content, so it can be cached alongside
+    parsed tokens and used to rank a file without reading it again.
+
+    Returns:
+        (token markers found, sample length in bytes)
+    """
+    return len(_TOKEN_MARKERS.findall(sample)), len(sample)
+
+
+def score_candidate(rel_path: str, size: int, sample: Optional[Sample]) -> float:
+    """
+    Score a candidate token file
+
+    Args:
+        rel_path: Path relative to repo root ("/"-separated)
+        size: File size in bytes
+        sample: First SAMPLE_BYTES of content or their measure_sample(),
+            or None if not sampled
+
+    Returns:
+        Relevance score (higher is better; <= 0 means not worth parsing)
+    """
+    parts = rel_path.lower().split("/")
+    name = parts[-1]
+
+    name_weight = _NAME_WEIGHTS.get(name, 0.0)
+    if not name_weight:
+        for suffix, weight in _SUFFIX_WEIGHTS.items():
+            if name.endswith(suffix):
+                name_weight = weight
+                break
+    score = name_weight
+
+    for part in parts[:-1]:
+        score += _PATH_BONUSES.get(part, 0.0)
+        score -= _PATH_PENALTIES.get(part, 0.0)
+
+    score -= _DEPTH_PENALTY * (len(parts) - 1)
+
+    if sample is not None:
+        markers, sample_bytes = sample if isinstance(sample, tuple) else measure_sample(sample)
+        if markers:
+            # Markers per KB, log-scaled so huge bundles don't dominate
+            density = markers / max(sample_bytes / 1024, 1.0)
+            score += min(math.log2(1 + density), 3.0)
+        elif not name_weight:
+            # Neither named like a token file nor containing any tokens
+            return min(score, 0.0)
+
+    return round(score, 3)
+
+
+def select_candidates(
+    candidates: List[Dict[str, Any]],
+    read_sample: Callable[[Dict[str, Any]], Optional[Sample]],
+    byte_budget: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Rank candidates and pick the best within the byte budget
+
+    Args:
+        candidates: [{"rel_path": str, "size": int, ...}] - extra keys are kept
+        read_sample: Returns the first SAMPLE_BYTES of a candidate, or their
+            measure_sample() (None on failure)
+        byte_budget: Total bytes to select (env EMBODY_TOKEN_BYTE_BUDGET)
+        deadline: time.monotonic() value after which candidates are no longer sampled
+
+    Returns:
+        {
+            "selected": [candidate + "score"], best first,
+            "skipped": [{"path", "reason", "score"}]
+        }
+    """
+    byte_budget = BYTE_BUDGET if byte_budget is None else byte_budget
+
+    skipped: List[Dict[str, Any]] = []
+    scored: List[Dict[str, Any]] = []
+
+    for candidate in candidates:
+        size = candidate["size"]
+        if size == 0:
+            skipped.append({"path": candidate["rel_path"], "reason": "empty", "score": None})
+            continue
+        if size > MAX_FILE_BYTES:
+            skipped.append({"path": candidate["rel_path"], "reason": "too_large", "score": None})
+            continue
+
+        # Past the deadline, rank on path and name alone
+        sample = None
+        if deadline is None or time.monotonic() < deadline:
+            sample = read_sample(candidate)
+
+        scored.append({**candidate, "score": score_candidate(candidate["rel_path"], size, sample)})
+
+    # Best first; ties go to the smaller, then the shallower-listed file
+    scored.sort(key=lambda c: (-c["score"], c["size"]))
+
+    selected: List[Dict[str, Any]] = []
+    used = 0
+    for candidate in scored:
+        if candidate["score"] <= 0:
+            skipped.append({"path": candidate["rel_path"], "reason": "low_relevance", "score": candidate["score"]})
+        elif used + candidate["size"] > byte_budget:
+            skipped.append({"path": candidate["rel_path"], "reason": "byte_budget", "score": candidate["score"]})
+        else:
+            used += candidate["size"]
+            selected.append(candidate)
+
+    return {"selected": selected, "skipped": skipped}
@@ -0,0 +1,151 @@
+"""
+Journey Summary
+
+Rolling, size-bounded summary of a design exploration session.
+
+Every generate/refine round is folded into the summary as it completes:
+the most recent rounds are kept in detail (concept names, feedback, what
+was learned), older rounds are merged into a compact "earlier" digest. The
+summary therefore stays the same size however long a designer explores,
+and the finalize step can document the journey without the full history.
+"""
+
+from typing import Any, Dict, List, Optional
+import os
+
+
+# Most recent rounds kept in detail
+DETAIL_ROUNDS = int(os.getenv("EMBODY_JOURNEY_DETAIL_ROUNDS", "4"))
+
+# Caps for the folded digest of older rounds
+MAX_DIGEST_IDS = 20
+MAX_DIGEST_LEARNINGS = 5
+MAX_TEXT_CHARS = 240
+MAX_QUALITIES = 5
+
+
+def update_journey_summary(summary: Optional[Dict[str, Any]], iteration: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fold one completed round into the summary
+
+    Args:
+        summary: Current summary (None to start a new journey)
+        iteration: Iteration as recorded in session state
+            ({"round", "concepts", "feedback", "learned", "confidence"})
+
+    Returns:
+        New summary:
+        {
+            "rounds": int,
+            "recent": [round summary],
+            "earlier": {"rounds", "liked", "disliked", "learned", "confidence"}
+        }
+    """
+    if summary is None or iteration.get("round", 1) <= 1:
+        summary = _empty_summary()
+    else:
+        summary = {
+            "rounds": summary.get("rounds", 0),
+            "recent": list(summary.get("recent", [])),
+            "earlier": {key: list(value) if isinstance(value, list) else value
+                        for key, value in summary.get("earlier", _empty_summary()["earlier"]).items()},
+        }
+
+    summary["recent"].append(summarize_round(iteration))
+    summary["rounds"] += 1
+
+    while len(summary["recent"]) > max(DETAIL_ROUNDS, 1):
+        _fold(summary["earlier"], summary["recent"].pop(0))
+
+    return summary
+
+
+def build_journey_summary(iterations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summarize a whole journey at once (for sessions recorded before summaries)
+
+    Args:
+        iterations: All iterations in session state
+
+    Returns:
+        Summary as returned by update_journey_summary()
+    """
+    summary = None
+    for iteration in iterations:
+        summary = update_journey_summary(summary, iteration)
+    return summary or _empty_summary()
+
+
+def summarize_round(iteration: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compact summary of one round
+
+    Returns:
+        {"round", "concepts": [{"id", "name", "qualities"}], "feedback",
+         "learned", "confidence"} (empty fields omitted)
+    """
+    concepts = iteration.get("concepts") or []
+    if isinstance(concepts, dict):
+        concepts = [concepts]
+
+    entry: Dict[str, Any] = {
+        "round": iteration.get("round"),
+        "concepts": [_concept_outline(concept) for concept in concepts if isinstance(concept, dict)],
+    }
+
+    feedback = {key: value for key, value in (iteration.get("feedback") or {}).items() if value}
+    if feedback:
+        entry["feedback"] = feedback
+    if iteration.get("learned"):
+        entry["learned"] = _clip(_text(iteration["learned"]))
+    if iteration.get("confidence") is not None:
+        entry["confidence"] = iteration["confidence"]
+
+    return entry
+
+
+def _empty_summary() -> Dict[str, Any]:
+    """Summary before any round"""
+    return {
+        "rounds": 0,
+        "recent": [],
+        "earlier": {"rounds": 0, "liked": [], "disliked": [], "learned": [], "confidence": []},
+    }
+
+
+def _fold(earlier: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """Merge one detailed round into the digest of older rounds"""
+    earlier["rounds"] += 1
+
+    feedback = entry.get("feedback", {})
+    earlier["liked"] = (earlier["liked"] + list(feedback.get("liked", [])))[-MAX_DIGEST_IDS:]
+    earlier["disliked"] = (earlier["disliked"] + list(feedback.get("disliked", [])))[-MAX_DIGEST_IDS:]
+
+    if entry.get("learned"):
+        earlier["learned"] = (earlier["learned"] + [entry["learned"]])[-MAX_DIGEST_LEARNINGS:]
+    if entry.get("confidence") is not None:
+        earlier["confidence"] = (earlier["confidence"] + [entry["confidence"]])[-MAX_DIGEST_IDS:]
+
+
+def _concept_outline(concept: Dict[str, Any]) -> Dict[str, Any]:
+    """A concept reduced to what identifies it"""
+    outline = {"id": concept.get("id"), "name": _clip(_text(concept.get("name", "")), 80)}
+    qualities = concept.get("qualities")
+    if isinstance(qualities, list) and qualities:
+        outline["qualities"] = [_clip(_text(quality), 40) for quality in qualities[:MAX_QUALITIES]]
+    return outline
+
+
+def _text(value: Any) -> str:
+    """Any value as display text"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "; ".join(_text(item) for item in value)
+    return str(value)
+
+
+def _clip(text: str, limit: int = MAX_TEXT_CHARS) -> str:
+    """Shorten text to limit characters"""
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
@@ -0,0 +1,170 @@
+"""
+Streaming JSON
+
+Incremental parsing of LLM JSON output while it is still being generated.
+"""
+
+from typing import Any, List, Optional
+import json
+
+
+class ConceptStreamParser:
+    """
+    Incrementally extract completed array elements from streamed LLM output
+
+    Feed text chunks as they arrive; each call returns the elements that were
+    completed by that chunk. Elements are taken from the top-level array, or
+    from the `array_key` array when the top-level value is an object.
+
+    Text outside JSON values (prose, markdown fences) is skipped. A brace
+    pair in prose is treated as a top-level object without the target key
+    and ignored once it closes. A top-level array is only recognized when
+    nothing but markdown fences comes before it, so a bracket in prose
+    (e.g. "Note [1 of 2 drafts: {...}") isn't taken for the element array.
+    """
+
+    def __init__(self, array_key: str = "concepts"):
+        """
+        Args:
+            array_key: Key of the element array inside a top-level object
+        """
+        self.array_key = array_key
+        self.emitted = 0
+        self.done = False
+
+        self._stack: List[str] = []      # open containers of the current top-level value
+        self._prose = False              # non-fence text seen outside JSON values
+        self._line: List[str] = []       # outside text on the current line
+        self._in_string = False
+        self._escape = False
+
+        self._array_depth: Optional[int] = None   # stack depth inside the element array
+        self._key_parts: Optional[List[str]] = None  # string being read at depth 1 of a root object
+        self._last_key: Optional[str] = None
+        self._pending_key: Optional[str] = None   # key whose value comes next
+
+        self._capture: Optional[List[str]] = None  # text of the element being captured
+        self._capture_start = 0
+        self._capture_depth = 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Consume the next chunk of streamed text
+
+        Args:
+            chunk: Next piece of LLM output
+
+        Returns:
+            Elements completed within this chunk, in order
+        """
+        completed: List[Any] = []
+        if self.done:
+            return completed
+
+        stack = self._stack
+        self._capture_start = 0
+
+        for i, ch in enumerate(chunk):
+            if not stack:
+                # Outside any JSON value - wait for one to start
+                if ch == "{" or (ch == "[" and not self._after_prose()):
+                    self._open_root(ch)
+                elif ch == "\n":
+                    self._prose = self._after_prose()
+                    self._line = []
+                else:
+                    self._line.append(ch)
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_parts is not None:
+                        self._last_key = "".join(self._key_parts)
+                        self._key_parts = None
+                elif self._key_parts is not None:
+                    self._key_parts.append(ch)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._capture is None and len(stack) == 1 and stack[0] == "{":
+                    self._key_parts = []
+            elif ch == ":":
+                if len(stack) == 1 and self._capture is None:
+                    self._pending_key = self._last_key
+            elif ch == "," and len(stack) == 1:
+                self._pending_key = None
+            elif ch == "{" or ch == "[":
+                if self._capture is None and self._array_depth == len(stack):
+                    self._capture = []
+                    self._capture_start = i
+                    self._capture_depth = len(stack)
+                elif (
+                    ch == "["
+                    and self._array_depth is None
+                    and len(stack) == 1
+                    and self._pending_key == self.array_key
+                ):
+                    self._array_depth = 2
+                stack.append(ch)
+            elif ch == "}" or ch == "]":
+                stack.pop()
+                if self._capture is not None and len(stack) == self._capture_depth:
+                    self._capture.append(chunk[self._capture_start:i + 1])
+                    element = self._finish_capture()
+                    if element is not None:
+                        completed.append(element)
+                elif self._array_depth is not None and len(stack) < self._array_depth:
+                    # Element array closed
+                    self._array_depth = -1
+                if not stack:
+                    self._close_root()
+                    if self.emitted:
+                        # Only the first value that yielded elements counts
+                        self.done = True
+                        return completed
+
+        if self._capture is not None:
+            self._capture.append(chunk[self._capture_start:])
+
+        return completed
+
+    def _after_prose(self) -> bool:
+        """Whether text other than markdown fences came before this point"""
+        if self._prose:
+            return True
+        line = "".join(self._line).strip()
+        return bool(line) and not line.startswith("```")
+
+    def _open_root(self, ch: str) -> None:
+        """Start tracking a new top-level value"""
+        self._stack.append(ch)
+        self._array_depth = 1 if ch == "[" else None
+        self._last_key = None
+        self._pending_key = None
+
+    def _close_root(self) -> None:
+        """Reset after a top-level value ends"""
+        # A later array is no longer at the start of the output
+        self._prose = True
+        self._line = []
+        self._array_depth = None
+        self._key_parts = None
+        self._last_key = None
+        self._pending_key = None
+
+    def _finish_capture(self) -> Optional[Any]:
+        """Parse the captured element text"""
+        text = "".join(self._capture)
+        self._capture = None
+        try:
+            element = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        self.emitted += 1
+        return element
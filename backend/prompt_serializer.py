@@ -0,0 +1,391 @@
+"""
+Prompt Serializer
+
+Compact, deduplicated serialization of structured data for agent prompts.
+
+Payloads are emitted as canonical JSON (sorted keys, no whitespace) after
+dropping non-design metadata (source file lists, cache and discovery
+stats, raw blobs, `_`-prefixed keys). Long strings that repeat are stored
+once in a `$refs` table and referenced as "@n". A payload over its token
+budget is truncated section by section, least important first, with
+explicit "… N more" markers so the agent knows data was elided.
+
+Container sizes are measured once and kept current as the payload
+shrinks, so fitting a large payload never re-serializes it. Per-label
+payload sizes are counted for get_prompt_stats(); set
+EMBODY_PROMPT_SIZE_LOG=true to also log each payload's before/after size.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import heapq
+import json
+import os
+import threading
+
+
+# Default budget per serialized payload, in (estimated) LLM tokens
+PROMPT_TOKEN_BUDGET = int(os.getenv("EMBODY_PROMPT_TOKEN_BUDGET", "4000"))
+
+# Rough chars-per-token ratio for JSON; only used for budgeting
+CHARS_PER_TOKEN = 4
+
+# Log every labelled payload's size (debugging prompt budgets)
+PROMPT_SIZE_LOG = os.getenv("EMBODY_PROMPT_SIZE_LOG", "false").strip().lower() in ("1", "true", "yes", "on")
+
+# Keys that describe how data was gathered, not the design itself
+METADATA_KEYS = frozenset({
+    "source_files",
+    "source_file_stats",
+    "skipped_files",
+    "discovery",
+    "cache",
+    "note",
+    "token_graph",
+    "aliases",
+    "ref",
+    "timestamp",
+    "created_at",
+    "updated_at",
+})
+
+# Token sections, most important first
+TOKEN_PRIORITIES = ("colors", "typography", "spacing", "effects", "behaviors", "themes")
+
+# Strings shorter than this are cheaper inline than as a reference
+MIN_DEDUP_LENGTH = 12
+
+REFS_LEGEND = 'Strings like "@1" stand for the matching entry in "$refs"; the data is under "$values".'
+
+_TRUNCATION_MARKER = "…"
+
+# label -> {"calls", "chars", "max_chars", "truncated"}
+_payload_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def serialize_for_prompt(
+    data: Any,
+    budget_tokens: Optional[int] = None,
+    priorities: Sequence[str] = (),
+    label: Optional[str] = None
+) -> str:
+    """
+    Serialize data for inclusion in an agent prompt
+
+    Args:
+        data: JSON-compatible value (not modified)
+        budget_tokens: Size ceiling in estimated tokens (env EMBODY_PROMPT_TOKEN_BUDGET)
+        priorities: Top-level keys, most important first; unlisted keys
+            rank below them and are truncated first
+        label: Name the payload is counted under in get_prompt_stats()
+
+    Returns:
+        Compact JSON text, preceded by REFS_LEGEND if references were used
+    """
+    budget_tokens = PROMPT_TOKEN_BUDGET if budget_tokens is None else budget_tokens
+    max_chars = budget_tokens * CHARS_PER_TOKEN
+
+    stripped = _strip(data)
+    stripped_chars = len(_dumps(stripped))
+    compact = _fit(stripped, stripped_chars, max_chars, priorities)
+    deduped = _dedupe(compact)
+    text = _dumps(deduped)
+
+    if label:
+        with _stats_lock:
+            stats = _payload_stats.setdefault(label, {"calls": 0, "chars": 0, "max_chars": 0, "truncated": 0})
+            stats["calls"] += 1
+            stats["chars"] += len(text)
+            stats["max_chars"] = max(stats["max_chars"], len(text))
+            stats["truncated"] += stripped_chars > max_chars
+
+        if PROMPT_SIZE_LOG:
+            before = len(_dumps(data, default=str))
+            print(
+                f"Prompt payload '{label}': {before} -> {len(text)} chars "
+                f"(~{len(text) // CHARS_PER_TOKEN} tokens, budget {budget_tokens})"
+            )
+
+    if deduped is not compact:
+        return f"{REFS_LEGEND}\n{text}"
+    return text
+
+
+def get_prompt_stats() -> Dict[str, Any]:
+    """
+    Get serialized payload sizes per label
+
+    Returns:
+        {label: {"calls": int, "chars": int, "avg_chars": float,
+                 "max_chars": int, "truncated": int}}
+    """
+    with _stats_lock:
+        return {
+            label: {**stats, "avg_chars": round(stats["chars"] / stats["calls"], 1)}
+            for label, stats in _payload_stats.items()
+        }
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimated LLM token count of a string"""
+    return len(text) // CHARS_PER_TOKEN
+
+
+def _dumps(value: Any, default: Any = None) -> str:
+    """Canonical compact JSON"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=True, default=default)
+
+
+def _strip(value: Any) -> Any:
+    """Copy value without metadata, private keys and empty containers"""
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            key = str(key)
+            if key in METADATA_KEYS or key.startswith("_"):
+                continue
+            item = _strip(item)
+            if item in ({}, [], None, ""):
+                continue
+            result[key] = item
+        return result
+
+    if isinstance(value, (list, tuple)):
+        return [_strip(item) for item in value]
+
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+
+    return str(value)
+
+
+def _fit(value: Any, size: int, max_chars: int, priorities: Sequence[str]) -> Any:
+    """
+    Truncate value until it serializes within max_chars
+
+    Args:
+        value: Stripped payload (modified in place)
+        size: Its serialized length
+        max_chars: Size ceiling
+        priorities: Top-level keys, most important first
+    """
+    if size <= max_chars:
+        return value
+
+    if not isinstance(value, dict):
+        index = _SizeIndex(value)
+        while index.size > max_chars and index.shrink():
+            pass
+        return value
+
+    # Least important sections first
+    rank = {key: index for index, key in enumerate(priorities)}
+    order = sorted(value, key=lambda key: (-rank.get(key, len(rank)), key))
+
+    for key in order:
+        index = _SizeIndex(value[key])
+        rest = size - index.size
+        while rest + index.size > max_chars and index.shrink():
+            pass
+        size = rest + index.size
+        if size <= max_chars:
+            break
+        # Still too big with this section cut to the bone - drop it
+        value[key] = _TRUNCATION_MARKER
+        size = rest + len(_dumps(_TRUNCATION_MARKER))
+
+    return value
+
+
+class _SizeIndex:
+    """
+    Serialized size of every container in a value, kept current as it shrinks
+
+    Compact JSON length is the sum of its parts, so sizes are computed once
+    bottom-up; a shrink only adjusts the shrunk container and its ancestors.
+    Containers worth halving sit in a max-heap by size with stale entries
+    skipped lazily.
+    """
+
+    def __init__(self, root: Any):
+        self._sizes: Dict[int, int] = {}
+        # Real (non-marker) items per container; only a shrink changes them
+        self._items: Dict[int, int] = {}
+        self._parents: Dict[int, Any] = {}
+        self._heap: List[Tuple[int, int, Any]] = []
+        self._pushed = 0
+
+        stack: List[Tuple[Any, bool]] = [(root, False)]
+        while stack:
+            node, measured_children = stack.pop()
+            if measured_children:
+                self._measure(node)
+                continue
+            if not isinstance(node, (dict, list)):
+                continue
+            stack.append((node, True))
+            for child in (node.values() if isinstance(node, dict) else node):
+                if isinstance(child, (dict, list)):
+                    self._parents[id(child)] = node
+                    stack.append((child, False))
+
+        self.size = self._size_of(root)
+
+    def shrink(self) -> bool:
+        """
+        Halve the largest truncatable container
+
+        Returns:
+            False once nothing is left to truncate
+        """
+        target = self._largest()
+        if target is None:
+            return False
+
+        before = self._sizes[id(target)]
+        for removed in _halve(target):
+            self._forget(removed)
+        self._measure(target)
+        delta = self._sizes[id(target)] - before
+
+        node = self._parents.get(id(target))
+        while node is not None:
+            self._sizes[id(node)] += delta
+            self._push(node)
+            node = self._parents.get(id(node))
+
+        self.size += delta
+        return True
+
+    def _largest(self) -> Optional[Any]:
+        """Largest container with more than one real item, or None"""
+        while self._heap:
+            negative_size, _, node = self._heap[0]
+            if self._sizes.get(id(node)) == -negative_size and self._items[id(node)] > 1:
+                return node
+            heapq.heappop(self._heap)
+        return None
+
+    def _size_of(self, value: Any) -> int:
+        if isinstance(value, (dict, list)):
+            return self._sizes[id(value)]
+        return len(_dumps(value))
+
+    def _measure(self, node: Any) -> None:
+        """Size a container from its (already sized) children"""
+        items = node.values() if isinstance(node, dict) else node
+        if not any(isinstance(item, (dict, list)) for item in items):
+            # Flat containers (most of a token payload) in one C-level dump
+            size = len(_dumps(node))
+        elif isinstance(node, dict):
+            size = sum(len(_dumps(key)) + 1 + self._size_of(item) for key, item in node.items())
+            size += 2 + max(len(node) - 1, 0)
+        else:
+            size = sum(self._size_of(item) for item in node) + 2 + max(len(node) - 1, 0)
+        self._sizes[id(node)] = size
+        self._items[id(node)] = _real_items(node)
+        self._push(node)
+
+    def _push(self, node: Any) -> None:
+        if self._items[id(node)] > 1:
+            self._pushed += 1
+            heapq.heappush(self._heap, (-self._sizes[id(node)], self._pushed, node))
+
+    def _forget(self, value: Any) -> None:
+        """Drop a removed subtree's containers from the index"""
+        stack = [value]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, (dict, list)):
+                self._sizes.pop(id(node), None)
+                self._items.pop(id(node), None)
+                self._parents.pop(id(node), None)
+                stack.extend(node.values() if isinstance(node, dict) else node)
+
+
+def _halve(target: Any) -> List[Any]:
+    """
+    Cut a container to half its real items plus a truncation marker
+
+    Returns:
+        The removed items
+    """
+    if isinstance(target, dict):
+        keys = [key for key in sorted(target) if key != _TRUNCATION_MARKER]
+        dropped = _count_dropped(target.get(_TRUNCATION_MARKER)) + len(keys) - len(keys) // 2
+        removed = [target.pop(key) for key in keys[len(keys) // 2:]]
+        target[_TRUNCATION_MARKER] = f"{dropped} more"
+        return removed
+
+    items = [item for item in target if not _is_list_marker(item)]
+    dropped = sum(_count_dropped(item) for item in target if _is_list_marker(item))
+    dropped += len(items) - len(items) // 2
+    target[:] = items[:len(items) // 2] + [f"{_TRUNCATION_MARKER} {dropped} more"]
+    return items[len(items) // 2:]
+
+
+def _real_items(node: Any) -> int:
+    """Number of items in a container that aren't truncation markers"""
+    if isinstance(node, dict):
+        return len(node) - (_TRUNCATION_MARKER in node)
+    return sum(1 for item in node if not _is_list_marker(item))
+
+
+def _is_list_marker(item: Any) -> bool:
+    """Check whether a list item is a truncation marker"""
+    return isinstance(item, str) and item.startswith(f"{_TRUNCATION_MARKER} ") and item.endswith(" more")
+
+
+def _count_dropped(marker: Any) -> int:
+    """Number of items a truncation marker stands for"""
+    if not isinstance(marker, str):
+        return 0
+    digits = "".join(char for char in marker if char.isdigit())
+    return int(digits) if digits else 0
+
+
+def _dedupe(value: Any) -> Any:
+    """Move long repeated strings into a $refs table when that saves space"""
+    counts: Dict[str, int] = {}
+    _count_strings(value, counts)
+
+    refs: Dict[str, str] = {}
+    for text, count in sorted(counts.items(), key=lambda item: (-item[1] * len(item[0]), item[0])):
+        if count < 2 or len(text) < MIN_DEDUP_LENGTH:
+            continue
+        ref = f"@{len(refs) + 1}"
+        # Each use shrinks to the ref; the table pays for one copy plus its key
+        saved = count * (len(text) - len(ref)) - (len(text) + len(ref) + 6)
+        if saved > 0:
+            refs[text] = ref
+
+    if not refs:
+        return value
+
+    return {
+        "$refs": {ref: text for text, ref in refs.items()},
+        "$values": _replace_strings(value, refs),
+    }
+
+
+def _count_strings(value: Any, counts: Dict[str, int]) -> None:
+    """Count string values (not keys) throughout value"""
+    if isinstance(value, dict):
+        for item in value.values():
+            _count_strings(item, counts)
+    elif isinstance(value, list):
+        for item in value:
+            _count_strings(item, counts)
+    elif isinstance(value, str):
+        counts[value] = counts.get(value, 0) + 1
+
+
+def _replace_strings(value: Any, refs: Dict[str, str]) -> Any:
+    """Swap deduplicated strings for their refs"""
+    if isinstance(value, dict):
+        return {key: _replace_strings(item, refs) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_replace_strings(item, refs) for item in value]
+    if isinstance(value, str):
+        return refs.get(value, value)
+    return value
@@ -0,0 +1,339 @@
+"""
+Response Cache
+
+Content-addressed cache of agent responses, with record/replay.
+
+Each agent call is keyed by a hash of the agent name, the normalized
+instruction and the profile fingerprint (agents, prompts and provider/model
+configuration), so editing any of those naturally misses. Entries live in
+an in-memory LRU backed by one JSON file per key on disk.
+
+Modes (env EMBODY_RESPONSE_CACHE):
+- off: every call reaches the LLM (default)
+- on: read-through cache with a TTL
+- record: every call reaches the LLM and (re)writes its entry - used to
+  capture fixtures
+- replay: responses come only from recorded entries, regardless of age;
+  a miss is an error and no provider is ever contacted, so the API runs
+  deterministically offline (e.g. for demos and benchmarks)
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import time
+import uuid
+
+from .foundation import get_profile_fingerprint, run_blocking
+
+
+RESPONSE_CACHE_MODES = ("off", "on", "record", "replay")
+
+# Bump when the key derivation or entry format changes
+RESPONSE_CACHE_VERSION = 1
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + disk) cache of agent responses"""
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        cache_dir: Optional[Path] = None,
+    ):
+        """
+        Args:
+            mode: off | on | record | replay (env EMBODY_RESPONSE_CACHE, default off)
+            max_entries: Responses kept in memory (env EMBODY_RESPONSE_CACHE_SIZE, default 256)
+            ttl: Seconds before an entry expires in "on" mode, 0 = never
+                (env EMBODY_RESPONSE_CACHE_TTL, default 86400)
+            cache_dir: Directory for entry files (env EMBODY_RESPONSE_CACHE_DIR,
+                default .embody/cache/responses)
+
+        Raises:
+            ValueError: If mode is unknown
+        """
+        self.mode = (mode or os.getenv("EMBODY_RESPONSE_CACHE", "off")).strip().lower()
+        if self.mode not in RESPONSE_CACHE_MODES:
+            raise ValueError(
+                f"Invalid EMBODY_RESPONSE_CACHE '{self.mode}' "
+                f"(expected one of: {', '.join(RESPONSE_CACHE_MODES)})"
+            )
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("EMBODY_RESPONSE_CACHE_SIZE", "256"))
+        self.ttl = ttl if ttl is not None else float(os.getenv("EMBODY_RESPONSE_CACHE_TTL", "86400"))
+        self.cache_dir = cache_dir or Path(os.getenv("EMBODY_RESPONSE_CACHE_DIR", ".embody/cache/responses"))
+
+        # key -> entry, least recently used first
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "stores": 0,
+            "evictions": 0,
+            "replay_misses": 0,
+            "write_failures": 0,
+            "saved_ms": 0.0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """Whether responses are looked up or recorded at all"""
+        return self.mode != "off"
+
+    @property
+    def replaying(self) -> bool:
+        """Whether the cache is the only source of responses"""
+        return self.mode == "replay"
+
+    async def make_key(self, agent: str, instruction: str) -> str:
+        """
+        Cache key for one agent call
+
+        Args:
+            agent: Agent name
+            instruction: Task instruction for agent
+
+        Returns:
+            Hex digest
+        """
+        version = await run_blocking(get_profile_fingerprint)
+        return make_cache_key(agent, instruction, version)
+
+    async def get(self, key: str, agent: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Look up a response
+
+        Args:
+            key: Key from make_key()
+            agent: Agent name (for the replay error message)
+
+        Returns:
+            Entry ({"content": str, "elapsed_ms": float, ...}) or None on a miss
+
+        Raises:
+            ValueError: On a miss in replay mode
+        """
+        if self.mode in ("off", "record"):
+            return None
+
+        entry = self._memory.get(key)
+        if entry is not None and self._expired(entry):
+            del self._memory[key]
+            self._stats["expired"] += 1
+            entry = None
+
+        if entry is not None:
+            self._memory.move_to_end(key)
+            self._stats["memory_hits"] += 1
+        else:
+            entry = await run_blocking(self._read_entry, key)
+            if entry is not None and self._expired(entry):
+                self._stats["expired"] += 1
+                entry = None
+            if entry is not None:
+                self._stats["disk_hits"] += 1
+                self._remember(key, entry)
+
+        if entry is None:
+            self._stats["misses"] += 1
+            if self.replaying:
+                self._stats["replay_misses"] += 1
+                raise ValueError(
+                    f"No recorded response for {agent or 'agent'} call (key {key[:12]}) "
+                    f"in {self.cache_dir}; record it with EMBODY_RESPONSE_CACHE=record"
+                )
+            return None
+
+        self._stats["saved_ms"] += entry.get("elapsed_ms", 0.0)
+        return entry
+
+    async def put(self, key: str, agent: str, instruction: str, content: str, elapsed_ms: float) -> None:
+        """
+        Store a fresh response (no-op unless mode is "on" or "record")
+
+        Disk failures are logged; the response is still kept in memory.
+
+        Args:
+            key: Key from make_key()
+            agent: Agent name
+            instruction: Task instruction (kept in the entry for reviewing fixtures)
+            content: Agent response content
+            elapsed_ms: How long the live call took
+        """
+        if self.mode not in ("on", "record"):
+            return
+
+        entry = {
+            "version": RESPONSE_CACHE_VERSION,
+            "key": key,
+            "agent": agent,
+            "instruction": instruction,
+            "content": content,
+            "elapsed_ms": round(elapsed_ms, 2),
+            "created_at": time.time(),
+        }
+        self._remember(key, entry)
+        self._stats["stores"] += 1
+
+        if not await run_blocking(self._write_entry, key, entry):
+            self._stats["write_failures"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            Hit/miss/store counters, time saved on hits (ms), mode and sizes
+        """
+        hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "saved_ms": round(self._stats["saved_ms"], 2),
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "mode": self.mode,
+            "size": len(self._memory),
+            "max_size": self.max_entries,
+            "ttl": self.ttl,
+        }
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        """Check an entry's age against the TTL (recorded fixtures never expire in replay)"""
+        if self.replaying or self.ttl <= 0:
+            return False
+        return time.time() - entry.get("created_at", 0) > self.ttl
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        """Insert into the memory tier, evicting least recently used entries"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > max(self.max_entries, 0):
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _entry_file(self, key: str) -> Path:
+        """On-disk location of an entry (fanned out by key prefix)"""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _read_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load an entry from disk; None when missing, unreadable or stale format"""
+        entry_file = self._entry_file(key)
+        try:
+            with entry_file.open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable response cache entry {entry_file}: {e}")
+            return None
+
+        if not isinstance(entry, dict) or entry.get("version") != RESPONSE_CACHE_VERSION:
+            return None
+        if not isinstance(entry.get("content"), str):
+            return None
+        return entry
+
+    def _write_entry(self, key: str, entry: Dict[str, Any]) -> bool:
+        """Write an entry via temp file + rename; log failures"""
+        entry_file = self._entry_file(key)
+        temp_file = entry_file.with_name(f"{entry_file.name}.{uuid.uuid4().hex}.tmp")
+
+        try:
+            entry_file.parent.mkdir(parents=True, exist_ok=True)
+            with temp_file.open("w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, indent=2)
+            os.replace(temp_file, entry_file)
+            return True
+        except Exception as e:
+            print(f"Warning: Failed to save response cache entry: {e}")
+            try:
+                temp_file.unlink()
+            except OSError:
+                pass
+            return False
+
+
+class OfflineSession:
+    """
+    Stand-in for AmplifierSession in replay mode
+
+    Accepts capability registration and hooks like the real session, but
+    never loads a profile or contacts a provider; every response must come
+    from the response cache.
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.coordinator = _OfflineCoordinator()
+
+    async def execute(self, prompt: str) -> Any:
+        raise ValueError("Offline replay session cannot call the LLM")
+
+    async def cleanup(self) -> None:
+        pass
+
+
+class _OfflineCoordinator:
+    """Minimal coordinator surface used by SessionManager"""
+
+    def __init__(self):
+        self.capabilities: Dict[str, Any] = {}
+        self.hooks = _OfflineHooks()
+
+    def register_capability(self, name: str, value: Any) -> None:
+        self.capabilities[name] = value
+
+    async def mount(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+class _OfflineHooks:
+    """Hook registry that never fires"""
+
+    def register(self, *args: Any, **kwargs: Any) -> Any:
+        return lambda: None
+
+
+def make_cache_key(agent: str, instruction: str, version: str) -> str:
+    """
+    Hash of (agent, normalized instruction, profile version)
+
+    Args:
+        agent: Agent name
+        instruction: Task instruction for agent
+        version: Profile fingerprint
+
+    Returns:
+        Hex digest
+    """
+    material = json.dumps(
+        [RESPONSE_CACHE_VERSION, agent, normalize_instruction(instruction), version],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def normalize_instruction(instruction: str) -> str:
+    """
+    Canonical form of an instruction for keying
+
+    Trailing whitespace, indentation-only differences in blank lines and
+    runs of blank lines don't change what the agent is asked, so they don't
+    change the key.
+    """
+    lines = [line.rstrip() for line in instruction.strip().splitlines()]
+    normalized = []
+    for line in lines:
+        if not line and normalized and not normalized[-1]:
+            continue
+        normalized.append(line)
+    return "\n".join(normalized)
@@ -4,22 +4,67 @@ Embody Backend Service
 FastAPI service that provides design system exploration via Amplifier Foundation.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Any, Optional, Tuple
+import json
 import os
 from dotenv import load_dotenv
 
 from .session_manager import SessionManager, parse_llm_json
+from .json_stream import ConceptStreamParser
+from .prompt_serializer import serialize_for_prompt, TOKEN_PRIORITIES, CHARS_PER_TOKEN
+from .concept_diff import concept_payload
+from .journey_summary import update_journey_summary, build_journey_summary
+from .foundation import get_session_dir, run_blocking, diff_token_refs
 
 # Load environment variables
 load_dotenv()
 
+# Initialize SessionManager
+session_manager = SessionManager()
+
+# Hard ceiling on the documentation-builder payload, however long the journey
+FINALIZE_MAX_CHARS = int(os.getenv("EMBODY_FINALIZE_MAX_CHARS", "24000"))
+
+# Start concept generation in the background as soon as context is gathered
+SPECULATIVE_CONCEPTS = os.getenv("EMBODY_SPECULATIVE_CONCEPTS", "false").strip().lower() in ("1", "true", "yes", "on")
+
+# Upper bound on concepts (and agent calls) per parallel generate-concepts request
+MAX_FAN_OUT = 8
+
+# Interpretive directions handed out to parallel concept-generator calls, in order
+DIVERSITY_DIRECTIONS = (
+    "the most faithful evolution of the current tokens",
+    "the boldest reinterpretation of the goal",
+    "a restrained, minimal reading",
+    "an expressive, high-contrast reading",
+    "a warm, human, approachable reading",
+    "a precise, systematic, technical reading",
+    "an unexpected reference from another domain",
+    "a timeless, classic reading",
+)
+
+# Finalize payload sections, most important first
+FINALIZE_PRIORITIES = ("selected_concept", "intent", "journey", "starting_tokens")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Pre-warm the session pool on startup and release it on shutdown"""
+    await session_manager.start()
+    yield
+    await session_manager.shutdown()
+
+
 app = FastAPI(
     title="Embody API",
     description="Amplifier-powered design system exploration",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -32,14 +77,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize SessionManager
-session_manager = SessionManager()
-
-
 # Request/Response Models
 
 class CreateSessionRequest(BaseModel):
     repo_path: str = Field(..., description="Path to repository with design tokens")
+    ref: Optional[str] = Field(None, description="Git branch, tag or commit to read tokens at (default: working tree)")
+
+
+class TokenDiffRequest(BaseModel):
+    repo_path: str = Field(..., description="Path to local git repository")
+    base_ref: str = Field(..., description="Git ref to compare from")
+    head_ref: Optional[str] = Field(None, description="Git ref to compare to (default: working tree)")
 
 
 class CreateSessionResponse(BaseModel):
@@ -54,6 +102,13 @@ class GatherContextRequest(BaseModel):
     constraints: List[str] = Field(default_factory=list, description="Design constraints")
 
 
+class GenerateConceptsRequest(BaseModel):
+    parallel: bool = Field(False, description="Generate each concept in its own concurrent agent call")
+    count: Optional[int] = Field(None, ge=1, le=MAX_FAN_OUT, description="Concepts to generate in parallel mode (default: generation guidance)")
+    concurrency: Optional[int] = Field(None, ge=1, le=MAX_FAN_OUT, description="Max concurrent agent calls (default: EMBODY_FANOUT_CONCURRENCY)")
+    first_k: Optional[int] = Field(None, ge=1, le=MAX_FAN_OUT, description="Return as soon as this many concepts are ready")
+
+
 class FeedbackRequest(BaseModel):
     liked: List[str] = Field(default_factory=list, description="Liked concept IDs")
     disliked: List[str] = Field(default_factory=list, description="Disliked concept IDs")
@@ -76,6 +131,16 @@ async def health_check():
     }
 
 
+@app.get("/api/stats")
+async def get_stats():
+    """
+    Runtime counters
+    
+    Returns session pool (including pool-wait time) and profile cache stats.
+    """
+    return session_manager.get_stats()
+
+
 @app.post("/api/sessions/create", response_model=CreateSessionResponse)
 async def create_session(request: CreateSessionRequest):
     """
@@ -87,7 +152,7 @@ async def create_session(request: CreateSessionRequest):
     - Returns session ID and tokens
     """
     try:
-        result = await session_manager.create_session(request.repo_path)
+        result = await session_manager.create_session(request.repo_path, ref=request.ref)
         return CreateSessionResponse(**result)
     except Exception as e:
         raise HTTPException(
@@ -99,24 +164,33 @@ async def create_session(request: CreateSessionRequest):
         )
 
 
-@app.post("/api/sessions/{session_id}/gather-context")
-async def gather_context(session_id: str, request: GatherContextRequest):
+@app.post("/api/tokens/diff")
+async def diff_tokens(request: TokenDiffRequest):
     """
-    Gather designer intent context
+    Compare design tokens between two git refs
     
-    Uses embody-collection:context-gatherer agent to:
-    - Parse designer inputs
-    - Infer implicit needs
-    - Provide generation guidance
+    Reads both sides from git objects (no checkout); head_ref defaults to
+    the working tree. Returns added, removed and changed tokens by path.
     """
     try:
-        # Check session exists
-        session = await session_manager.get_session(session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        # Build instruction for context-gatherer agent
-        instruction = f"""
+        return await diff_token_refs(request.repo_path, request.base_ref, request.head_ref)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Token diff failed",
+                "detail": str(e)
+            }
+        )
+
+
+# Agent instruction builders and result handlers
+#
+# Shared by the blocking endpoints and their SSE streaming variants.
+
+def _build_context_instruction(request: GatherContextRequest) -> str:
+    """Build instruction for context-gatherer agent"""
+    return f"""
 Analyze the designer's intent from these inputs:
 
 - Goal: {request.goal}
@@ -127,32 +201,477 @@ Return your analysis as JSON with:
 1. parsed_intent (primary_goal, explicit_qualities, implicit_needs, constraints, design_focus)
 2. generation_guidance (concept_count, diversity_level, emphasis, avoid)
 """
+
+
+async def _apply_context(session_id: str, request: GatherContextRequest, response: str) -> Dict[str, Any]:
+    """Parse context-gatherer response and record it in session state"""
+    parsed_intent = parse_llm_json(response)
+    
+    await session_manager.update_session_state(session_id, {
+        "context": {
+            "goal": request.goal,
+            "qualities": request.qualities,
+            "constraints": request.constraints,
+            "parsed_intent": parsed_intent
+        },
+        "phase": "concept_generation"
+    })
+    
+    if SPECULATIVE_CONCEPTS:
+        # Designers nearly always generate next; generate-concepts adopts this run
+        state = await session_manager.get_session_state(session_id, readonly=True)
+        session_manager.speculate(
+            session_id,
+            agent="embody-collection:concept-generator",
+            instruction=_build_concepts_instruction(state)
+        )
+    
+    return {
+        "parsed_intent": parsed_intent,
+        "phase": "concept_generation"
+    }
+
+
+def _build_concepts_instruction(state: Dict[str, Any]) -> str:
+    """Build instruction for concept-generator agent"""
+    return f"""
+Generate 3-4 distinct design concepts based on:
+
+Current Tokens:
+{serialize_for_prompt(state.get('extracted_tokens', {}), priorities=TOKEN_PRIORITIES, label="extracted_tokens")}
+
+Designer Intent:
+{serialize_for_prompt(state.get('context', {}).get('parsed_intent', {}), label="parsed_intent")}
+
+For each concept, provide:
+- id, name, description
+- qualities (list of defining characteristics)
+- tokens (colors, typography, spacing, effects)
+- rationale (why this fits the intent)
+- accessibility (contrast ratios, WCAG level)
+
+Return as JSON array of concepts.
+"""
+
+
+def _build_seeded_concept_instructions(state: Dict[str, Any], count: Optional[int]) -> List[str]:
+    """
+    Build one single-concept instruction per parallel concept-generator call
+    
+    Each call gets its own interpretive direction and emphasis area (from
+    generation_guidance) plus the directions of its siblings, so
+    independently generated concepts still spread across the design space.
+    """
+    parsed_intent = state.get('context', {}).get('parsed_intent', {})
+    guidance = parsed_intent.get('generation_guidance', {}) if isinstance(parsed_intent, dict) else {}
+    
+    if count is None:
+        try:
+            count = int(guidance.get('concept_count') or 4)
+        except (TypeError, ValueError):
+            count = 4
+    count = max(1, min(count, MAX_FAN_OUT))
+    
+    emphasis = guidance.get('emphasis') or []
+    if isinstance(emphasis, str):
+        emphasis = [emphasis]
+    
+    directions = [DIVERSITY_DIRECTIONS[index % len(DIVERSITY_DIRECTIONS)] for index in range(count)]
+    tokens = serialize_for_prompt(state.get('extracted_tokens', {}), priorities=TOKEN_PRIORITIES, label="extracted_tokens")
+    intent = serialize_for_prompt(parsed_intent, label="parsed_intent")
+    
+    instructions = []
+    for index, direction in enumerate(directions):
+        focus = f"\nEmphasize: {emphasis[index % len(emphasis)]}" if emphasis else ""
+        siblings = "\n".join(f"- {other}" for other in directions if other != direction)
+        instructions.append(f"""
+Generate exactly ONE design concept based on:
+
+Current Tokens:
+{tokens}
+
+Designer Intent:
+{intent}
+
+Concept {index + 1} of {count} (variation seed {index + 1}).
+Direction: interpret the intent as {direction}.{focus}
+
+Other concepts in this set are generated separately and explore:
+{siblings or "- (none)"}
+Stay clearly distinct from them.
+
+Provide:
+- id ("concept-{index + 1}"), name, description
+- qualities (list of defining characteristics)
+- tokens (colors, typography, spacing, effects)
+- rationale (why this fits the intent)
+- accessibility (contrast ratios, WCAG level)
+
+Return as a single JSON object.
+""")
+    return instructions
+
+
+def _parse_seeded_concept(response: str, index: int) -> Dict[str, Any]:
+    """
+    Parse one parallel concept-generator response
+    
+    Raises:
+        ValueError: If the response holds no concept
+    """
+    result = parse_llm_json(response)
+    if isinstance(result, dict) and isinstance(result.get("concepts"), list):
+        result = result["concepts"]
+    if isinstance(result, list):
+        result = next((item for item in result if isinstance(item, dict)), None)
+    if not isinstance(result, dict):
+        raise ValueError("No concept in response")
+    
+    result["id"] = result.get("id") or f"concept-{index + 1}"
+    return result
+
+
+async def _fan_out_concepts(
+    session_id: str,
+    state: Dict[str, Any],
+    request: GenerateConceptsRequest
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Generate concepts with concurrent seeded concept-generator calls
+    
+    Yields:
+        (seed index, concept) as each call completes; unparseable responses
+        are logged and skipped (and don't count towards first_k)
+    """
+    seen_ids = set()
+    
+    async for index, concept in session_manager.fan_out_agent(
+        session_id,
+        agent="embody-collection:concept-generator",
+        instructions=_build_seeded_concept_instructions(state, request.count),
+        concurrency=request.concurrency,
+        first_k=request.first_k,
+        parse=lambda index, response: _parse_seeded_concept(response, index)
+    ):
+        # Seeded calls can't see each other's ids
+        if concept["id"] in seen_ids:
+            concept["id"] = f"{concept['id']}-{index + 1}"
+        seen_ids.add(concept["id"])
+        
+        yield index, concept
+
+
+async def _apply_concepts(session_id: str, response: str) -> Dict[str, Any]:
+    """Parse concept-generator response and record the first iteration"""
+    result = parse_llm_json(response)
+    concepts = result.get("concepts", result) if isinstance(result, dict) else result
+    return await _record_concepts(session_id, concepts)
+
+
+async def _record_concepts(session_id: str, concepts: Any) -> Dict[str, Any]:
+    """Record generated concepts as the first iteration"""
+    iteration = {
+        "round": 1,
+        "concepts": concepts,
+        "feedback": {},
+        "timestamp": None
+    }
+    
+    await session_manager.update_session_state(
+        session_id,
+        {
+            "phase": "feedback",
+            "journey_summary": update_journey_summary(None, iteration)
+        },
+        appends={"iterations": iteration}
+    )
+    
+    return {
+        "concepts": concepts,
+        "round": 1,
+        "phase": "feedback"
+    }
+
+
+def _build_refine_instruction(state: Dict[str, Any], request: FeedbackRequest) -> str:
+    """
+    Build instruction for refinement-engine agent
+    
+    Raises:
+        HTTPException: If there are no concepts to refine
+    """
+    iterations = state.get("iterations", [])
+    
+    if not iterations:
+        raise HTTPException(status_code=400, detail="No concepts to refine")
+    
+    current_round = len(iterations)
+    previous_concepts = _concept_list(iterations[-1]["concepts"])
+    
+    # One shared base plus per-concept deltas instead of N full copies
+    payload = concept_payload(
+        previous_concepts,
+        _concept_list(iterations[-2]["concepts"]) if len(iterations) > 1 else None
+    )
+    
+    return f"""
+Refine concepts based on designer feedback:
+
+Round: {current_round + 1}
+
+Previous Concepts (each concept is "shared" deep-merged with its "set", minus its dotted "unset" paths;
+a key like "a.b" beside a plain "a" value is a path that couldn't nest; "\\." in a path is a literal dot):
+{serialize_for_prompt(payload, priorities=("concepts", "shared"), label="previous_concepts")}
+
+Feedback:
+- Liked: {request.liked}
+- Disliked: {request.disliked}
+- Explored: {request.explored}
+
+Generate 2-3 refined concepts that:
+1. Build on liked directions
+2. Avoid disliked approaches
+3. Blend promising elements
+
+Return as JSON with:
+- refinement_round
+- learned_from_feedback
+- approach
+- concepts (array)
+- confidence (0-1)
+- next_round_guidance
+"""
+
+
+def _concept_list(concepts: Any) -> List[Any]:
+    """Concepts of an iteration as a list (agents occasionally return one object)"""
+    if isinstance(concepts, list):
+        return concepts
+    return [concepts] if concepts else []
+
+
+async def _apply_refinement(
+    session_id: str,
+    state: Dict[str, Any],
+    request: FeedbackRequest,
+    response: str
+) -> Dict[str, Any]:
+    """Parse refinement-engine response and record the new iteration"""
+    refined = parse_llm_json(response)
+    
+    current_round = len(state.get("iterations", []))
+    
+    # Check if ready for finalization
+    phase = "finalization" if refined.get("confidence", 0.0) > 0.85 else "feedback"
+    
+    iteration = {
+        "round": current_round + 1,
+        "concepts": refined.get("concepts", []),
+        "feedback": {
+            "liked": request.liked,
+            "disliked": request.disliked,
+            "explored": request.explored
+        },
+        "learned": refined.get("learned_from_feedback", ""),
+        "confidence": refined.get("confidence", 0.0),
+        "timestamp": None
+    }
+    
+    # Sessions started before journey summaries get one rebuilt once
+    summary = state.get("journey_summary") or build_journey_summary(state.get("iterations", []))
+    
+    await session_manager.update_session_state(
+        session_id,
+        {
+            "phase": phase,
+            "journey_summary": update_journey_summary(summary, iteration)
+        },
+        appends={"iterations": iteration}
+    )
+    
+    return {
+        "concepts": refined.get("concepts", []),
+        "round": current_round + 1,
+        "learned": refined.get("learned_from_feedback", ""),
+        "confidence": refined.get("confidence", 0.0),
+        "phase": phase
+    }
+
+
+def _build_finalize_instruction(state: Dict[str, Any], request: FinalizeRequest) -> str:
+    """
+    Build instruction for documentation-builder agent
+    
+    Sends the rolling journey summary, the selected concept in full and the
+    resolved starting tokens - never the full iteration history - within
+    the FINALIZE_MAX_CHARS ceiling.
+    """
+    journey = {
+        "selected_concept": _find_concept(state, request.selected_concept_id),
+        "intent": state.get("context", {}),
+        "journey": state.get("journey_summary") or build_journey_summary(state.get("iterations", [])),
+        "starting_tokens": state.get("extracted_tokens", {})
+    }
+    
+    return f"""
+Create comprehensive documentation for this design journey:
+
+Design Journey (starting tokens, intent, round-by-round summary, selected concept):
+{serialize_for_prompt(journey, budget_tokens=FINALIZE_MAX_CHARS // CHARS_PER_TOKEN, priorities=FINALIZE_PRIORITIES, label="finalize")}
+
+Selected Concept ID: {request.selected_concept_id}
+
+Generate documentation that includes:
+1. Starting point (extracted tokens, current feeling)
+2. Design intent (goals, qualities, constraints)
+3. Exploration journey (rounds, feedback, learnings - earlier rounds are digested)
+4. Final direction (selected concept details, rationale)
+5. Engineering handoff (implementation phases, critical paths)
+6. Success metrics
+
+Return as JSON with:
+- markdown (full documentation)
+- final_direction (selected concept details)
+- exports (figma_tokens, css_variables, tailwind_config)
+"""
+
+
+def _find_concept(state: Dict[str, Any], concept_id: str) -> Any:
+    """Most recent concept with this id, or the bare id if it isn't recorded"""
+    for iteration in reversed(state.get("iterations", [])):
+        for concept in _concept_list(iteration.get("concepts")):
+            if isinstance(concept, dict) and str(concept.get("id")) == concept_id:
+                return concept
+    return {"id": concept_id}
+
+
+async def _apply_finalize(session_id: str, request: FinalizeRequest, response: str) -> Dict[str, Any]:
+    """Parse documentation-builder response, write markdown and record it"""
+    documentation = parse_llm_json(response)
+    
+    # Save markdown documentation to file
+    session_dir = await run_blocking(get_session_dir, session_id)
+    doc_file = session_dir / "documentation.md"
+    await run_blocking(doc_file.write_text, documentation.get("markdown", ""), encoding="utf-8")
+    
+    await session_manager.update_session_state(session_id, {
+        "phase": "completed",
+        "selected_concept_id": request.selected_concept_id,
+        "documentation": documentation
+    })
+    
+    return {
+        "documentation": documentation,
+        "phase": "completed",
+        "doc_file": str(doc_file)
+    }
+
+
+async def _require_session(session_id: str) -> None:
+    """
+    Ensure the session is active
+    
+    Raises:
+        HTTPException: 404 if session not found
+    """
+    session = await session_manager.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+
+async def _load_state_or_404(session_id: str) -> Dict[str, Any]:
+    """
+    Load session state before a stream starts
+    
+    Raises:
+        HTTPException: 404 if no state exists for the session
+    """
+    try:
+        return await session_manager.get_session_state(session_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+
+def _sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _stream_agent_response(
+    session_id: str,
+    agent: str,
+    instruction: str,
+    finish: Callable[[str], Awaitable[Dict[str, Any]]],
+    error: str,
+    stream_concepts: bool = False
+) -> StreamingResponse:
+    """
+    Stream an agent run as Server-Sent Events
+    
+    Emits `token` and `progress` events while the agent runs, then a single
+    `result` event with the same payload the blocking endpoint returns.
+    Failures after the stream has started are reported as an `error` event.
+    
+    Args:
+        session_id: Session identifier
+        agent: Agent name
+        instruction: Task instruction for agent
+        finish: Parses the full response and updates session state
+        error: Error label for the `error` event
+        stream_concepts: Also emit a `concept` event as each concept completes
+    """
+    async def events():
+        concept_parser = ConceptStreamParser() if stream_concepts else None
+        try:
+            async for item in session_manager.stream_agent(session_id, agent, instruction):
+                if item["event"] == "response":
+                    yield _sse("progress", {"stage": "parsing", "agent": agent})
+                    yield _sse("result", await finish(item["data"]["content"]))
+                    continue
+                
+                yield _sse(item["event"], item["data"])
+                
+                if concept_parser is not None and item["event"] == "token":
+                    first_index = concept_parser.emitted
+                    for offset, concept in enumerate(concept_parser.feed(item["data"]["text"])):
+                        yield _sse("concept", {
+                            "index": first_index + offset,
+                            "concept": concept
+                        })
+        except Exception as e:
+            yield _sse("error", {
+                "error": error,
+                "detail": str(e),
+                "session_id": session_id
+            })
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/api/sessions/{session_id}/gather-context")
+async def gather_context(session_id: str, request: GatherContextRequest):
+    """
+    Gather designer intent context
+    
+    Uses embody-collection:context-gatherer agent to:
+    - Parse designer inputs
+    - Infer implicit needs
+    - Provide generation guidance
+    """
+    try:
+        await _require_session(session_id)
         
-        # Execute agent
         response = await session_manager.execute_agent(
             session_id=session_id,
             agent="embody-collection:context-gatherer",
-            instruction=instruction
+            instruction=_build_context_instruction(request)
         )
         
-        # Parse response
-        parsed_intent = parse_llm_json(response)
-        
-        # Update session state
-        session_manager.update_session_state(session_id, {
-            "context": {
-                "goal": request.goal,
-                "qualities": request.qualities,
-                "constraints": request.constraints,
-                "parsed_intent": parsed_intent
-            },
-            "phase": "concept_generation"
-        })
-        
-        return {
-            "parsed_intent": parsed_intent,
-            "phase": "concept_generation"
-        }
+        return await _apply_context(session_id, request, response)
         
     except HTTPException:
         raise
@@ -167,73 +686,49 @@ Return your analysis as JSON with:
         )
 
 
+@app.post("/api/sessions/{session_id}/gather-context/stream")
+async def gather_context_stream(session_id: str, request: GatherContextRequest):
+    """Streaming (SSE) variant of gather-context"""
+    await _require_session(session_id)
+    
+    return _stream_agent_response(
+        session_id,
+        agent="embody-collection:context-gatherer",
+        instruction=_build_context_instruction(request),
+        finish=lambda response: _apply_context(session_id, request, response),
+        error="Context gathering failed"
+    )
+
+
 @app.post("/api/sessions/{session_id}/generate-concepts")
-async def generate_concepts(session_id: str):
+async def generate_concepts(session_id: str, request: Optional[GenerateConceptsRequest] = None):
     """
     Generate initial design concepts
     
     Uses embody-collection:concept-generator agent to create 3-4 distinct
-    design concepts based on parsed intent and current tokens.
+    design concepts based on parsed intent and current tokens. With
+    `parallel`, each concept comes from its own concurrent, diversity-seeded
+    agent call, so wall-clock time approaches that of a single concept.
     """
     try:
-        # Check session exists
-        session = await session_manager.get_session(session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
+        await _require_session(session_id)
         
-        # Load session state
-        state = session_manager.get_session_state(session_id)
+        state = await session_manager.get_session_state(session_id)
         
-        # Build instruction for concept-generator agent
-        instruction = f"""
-Generate 3-4 distinct design concepts based on:
-
-Current Tokens:
-{state.get('extracted_tokens', {})}
-
-Designer Intent:
-{state.get('context', {}).get('parsed_intent', {})}
-
-For each concept, provide:
-- id, name, description
-- qualities (list of defining characteristics)
-- tokens (colors, typography, spacing, effects)
-- rationale (why this fits the intent)
-- accessibility (contrast ratios, WCAG level)
-
-Return as JSON array of concepts.
-"""
+        if request is not None and request.parallel:
+            generated = [item async for item in _fan_out_concepts(session_id, state, request)]
+            if not generated:
+                raise ValueError("No concept could be parsed from the agent responses")
+            concepts = [concept for _, concept in sorted(generated, key=lambda item: item[0])]
+            return await _record_concepts(session_id, concepts)
         
-        # Execute agent
         response = await session_manager.execute_agent(
             session_id=session_id,
             agent="embody-collection:concept-generator",
-            instruction=instruction
+            instruction=_build_concepts_instruction(state)
         )
         
-        # Parse response
-        result = parse_llm_json(response)
-        concepts = result.get("concepts", result) if isinstance(result, dict) else result
-        
-        # Update session state with first iteration
-        iterations = state.get("iterations", [])
-        iterations.append({
-            "round": 1,
-            "concepts": concepts,
-            "feedback": {},
-            "timestamp": None
-        })
-        
-        session_manager.update_session_state(session_id, {
-            "iterations": iterations,
-            "phase": "feedback"
-        })
-        
-        return {
-            "concepts": concepts,
-            "round": 1,
-            "phase": "feedback"
-        }
+        return await _apply_concepts(session_id, response)
         
     except HTTPException:
         raise
@@ -248,6 +743,65 @@ Return as JSON array of concepts.
         )
 
 
+@app.post("/api/sessions/{session_id}/generate-concepts/stream")
+async def generate_concepts_stream(session_id: str, request: Optional[GenerateConceptsRequest] = None):
+    """Streaming (SSE) variant of generate-concepts"""
+    await _require_session(session_id)
+    state = await _load_state_or_404(session_id)
+    
+    if request is not None and request.parallel:
+        return _stream_fan_out_concepts(session_id, state, request)
+    
+    return _stream_agent_response(
+        session_id,
+        agent="embody-collection:concept-generator",
+        instruction=_build_concepts_instruction(state),
+        finish=lambda response: _apply_concepts(session_id, response),
+        error="Concept generation failed",
+        stream_concepts=True
+    )
+
+
+def _stream_fan_out_concepts(
+    session_id: str,
+    state: Dict[str, Any],
+    request: GenerateConceptsRequest
+) -> StreamingResponse:
+    """
+    Stream parallel concept generation as Server-Sent Events
+    
+    Emits a `concept` event as each seeded call completes (in completion
+    order, with its seed index), then the same `result` event as the
+    blocking endpoint.
+    """
+    async def events():
+        try:
+            yield _sse("progress", {"stage": "started", "agent": "embody-collection:concept-generator", "parallel": True})
+            
+            generated = []
+            async for index, concept in _fan_out_concepts(session_id, state, request):
+                generated.append((index, concept))
+                yield _sse("concept", {"index": index, "concept": concept})
+            
+            if not generated:
+                raise ValueError("No concept could be parsed from the agent responses")
+            
+            concepts = [concept for _, concept in sorted(generated, key=lambda item: item[0])]
+            yield _sse("result", await _record_concepts(session_id, concepts))
+        except Exception as e:
+            yield _sse("error", {
+                "error": "Concept generation failed",
+                "detail": str(e),
+                "session_id": session_id
+            })
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/api/sessions/{session_id}/refine")
 async def refine_concepts(session_id: str, request: FeedbackRequest):
     """
@@ -257,88 +811,18 @@ async def refine_concepts(session_id: str, request: FeedbackRequest):
     based on designer feedback (liked/disliked/explored).
     """
     try:
-        # Check session exists
-        session = await session_manager.get_session(session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
+        await _require_session(session_id)
         
-        # Load session state
-        state = session_manager.get_session_state(session_id)
-        iterations = state.get("iterations", [])
-        
-        if not iterations:
-            raise HTTPException(status_code=400, detail="No concepts to refine")
-        
-        current_round = len(iterations)
-        previous_concepts = iterations[-1]["concepts"]
-        
-        # Build instruction for refinement-engine agent
-        instruction = f"""
-Refine concepts based on designer feedback:
-
-Round: {current_round + 1}
-
-Previous Concepts:
-{previous_concepts}
-
-Feedback:
-- Liked: {request.liked}
-- Disliked: {request.disliked}
-- Explored: {request.explored}
-
-Generate 2-3 refined concepts that:
-1. Build on liked directions
-2. Avoid disliked approaches
-3. Blend promising elements
-
-Return as JSON with:
-- refinement_round
-- learned_from_feedback
-- approach
-- concepts (array)
-- confidence (0-1)
-- next_round_guidance
-"""
+        state = await session_manager.get_session_state(session_id)
+        instruction = _build_refine_instruction(state, request)
         
-        # Execute agent
         response = await session_manager.execute_agent(
             session_id=session_id,
             agent="embody-collection:refinement-engine",
             instruction=instruction
         )
         
-        # Parse response
-        refined = parse_llm_json(response)
-        
-        # Update session state
-        iterations.append({
-            "round": current_round + 1,
-            "concepts": refined.get("concepts", []),
-            "feedback": {
-                "liked": request.liked,
-                "disliked": request.disliked,
-                "explored": request.explored
-            },
-            "learned": refined.get("learned_from_feedback", ""),
-            "confidence": refined.get("confidence", 0.0),
-            "timestamp": None
-        })
-        
-        # Check if ready for finalization
-        phase = "finalization" if refined.get("confidence", 0.0) > 0.85 else "feedback"
-        
-        session_manager.update_session_state(session_id, {
-            "iterations": iterations,
-            "phase": phase
-        })
-        
-        return {
-            "concepts": refined.get("concepts", []),
-            "round": current_round + 1,
-            "learned": refined.get("learned_from_feedback", ""),
-            "confidence": refined.get("confidence", 0.0),
-            "phase": phase
-        }
+        return await _apply_refinement(session_id, state, request, response)
         
     except HTTPException:
         raise
@@ -353,6 +837,22 @@ Return as JSON with:
         )
 
 
+@app.post("/api/sessions/{session_id}/refine/stream")
+async def refine_concepts_stream(session_id: str, request: FeedbackRequest):
+    """Streaming (SSE) variant of refine"""
+    await _require_session(session_id)
+    state = await _load_state_or_404(session_id)
+    
+    return _stream_agent_response(
+        session_id,
+        agent="embody-collection:refinement-engine",
+        instruction=_build_refine_instruction(state, request),
+        finish=lambda response: _apply_refinement(session_id, state, request, response),
+        error="Refinement failed",
+        stream_concepts=True
+    )
+
+
 @app.post("/api/sessions/{session_id}/finalize")
 async def finalize_direction(session_id: str, request: FinalizeRequest):
     """
@@ -362,65 +862,17 @@ async def finalize_direction(session_id: str, request: FinalizeRequest):
     comprehensive documentation of the design journey.
     """
     try:
-        # Check session exists
-        session = await session_manager.get_session(session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
+        await _require_session(session_id)
         
-        # Load session state
-        state = session_manager.get_session_state(session_id)
+        state = await session_manager.get_session_state(session_id)
         
-        # Build instruction for documentation-builder agent
-        instruction = f"""
-Create comprehensive documentation for this design journey:
-
-Session State:
-{state}
-
-Selected Concept ID: {request.selected_concept_id}
-
-Generate documentation that includes:
-1. Starting point (extracted tokens, current feeling)
-2. Design intent (goals, qualities, constraints)
-3. Exploration journey (all rounds, feedback, learnings)
-4. Final direction (selected concept details, rationale)
-5. Engineering handoff (implementation phases, critical paths)
-6. Success metrics
-
-Return as JSON with:
-- markdown (full documentation)
-- final_direction (selected concept details)
-- exports (figma_tokens, css_variables, tailwind_config)
-"""
-        
-        # Execute agent
         response = await session_manager.execute_agent(
             session_id=session_id,
             agent="embody-collection:documentation-builder",
-            instruction=instruction
+            instruction=_build_finalize_instruction(state, request)
         )
         
-        # Parse response
-        documentation = parse_llm_json(response)
-        
-        # Save markdown documentation to file
-        from .foundation import get_session_dir
-        session_dir = get_session_dir(session_id)
-        doc_file = session_dir / "documentation.md"
-        doc_file.write_text(documentation.get("markdown", ""), encoding="utf-8")
-        
-        # Update session state
-        session_manager.update_session_state(session_id, {
-            "phase": "completed",
-            "selected_concept_id": request.selected_concept_id,
-            "documentation": documentation
-        })
-        
-        return {
-            "documentation": documentation,
-            "phase": "completed",
-            "doc_file": str(doc_file)
-        }
+        return await _apply_finalize(session_id, request, response)
         
     except HTTPException:
         raise
@@ -435,6 +887,21 @@ Return as JSON with:
         )
 
 
+@app.post("/api/sessions/{session_id}/finalize/stream")
+async def finalize_direction_stream(session_id: str, request: FinalizeRequest):
+    """Streaming (SSE) variant of finalize"""
+    await _require_session(session_id)
+    state = await _load_state_or_404(session_id)
+    
+    return _stream_agent_response(
+        session_id,
+        agent="embody-collection:documentation-builder",
+        instruction=_build_finalize_instruction(state, request),
+        finish=lambda response: _apply_finalize(session_id, request, response),
+        error="Finalization failed"
+    )
+
+
 @app.get("/api/sessions/{session_id}")
 async def get_session(session_id: str):
     """
@@ -448,9 +915,8 @@ async def get_session(session_id: str):
     - Current phase
     """
     try:
-        # Load state from disk
-        state = session_manager.get_session_state(session_id)
-        return state
+        # Served from memory when cached; read-only, so skip the copy
+        return await session_manager.get_session_state(session_id, readonly=True)
         
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -469,4 +935,9 @@ if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", "8000"))
     host = os.getenv("HOST", "0.0.0.0")
-    uvicorn.run(app, host=host, port=port)
+    workers = int(os.getenv("EMBODY_WORKERS", "1"))
+    if workers > 1:
+        # Worker processes import the app themselves; state is shared via EMBODY_STATE_BACKEND
+        uvicorn.run("backend.service:app", host=host, port=port, workers=workers)
+    else:
+        uvicorn.run(app, host=host, port=port)
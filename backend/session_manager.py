@@ -5,19 +5,51 @@ Manages Amplifier session lifecycle for design exploration.
 """
 
 from pathlib import Path
-from typing import Any, Dict, Optional
-import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Set, Tuple
+import asyncio
+import copy
+import heapq
+import os
 import json
 import re
+import time
+import uuid
 from datetime import datetime, UTC
 
 from .foundation import (
     load_embody_profile,
+    get_profile_cache_stats,
     extract_tokens_from_repo,
-    save_session_state,
-    load_session_state,
+    create_state_store,
     get_session_dir,
+    make_session_delta,
+    apply_session_delta,
+    save_sub_session,
+    load_sub_session,
+    run_blocking,
+    shutdown_executors,
 )
+from .session_pool import SessionPool
+from .response_cache import ResponseCache, OfflineSession, make_cache_key
+from .prompt_serializer import get_prompt_stats
+
+
+# Orchestrator hook events forwarded by SessionManager.stream_agent
+STREAM_TOKEN_EVENTS = ("content_block:delta",)
+STREAM_PROGRESS_EVENTS = ("content_block:start", "tool:pre", "tool:post")
+
+# How execute_agent reaches an agent: via the orchestrator's task tool, or
+# straight into a child session
+AGENT_DISPATCH_MODES = ("task", "direct")
+
+# Mount plan sections holding module lists, merged by module name for agents
+MODULE_LIST_KEYS = ("providers", "tools", "hooks")
+
+_SUB_SESSION_ID = re.compile(r"^([\w-]+)\.[\w.-]+$")
+
+_SESSION_ID = re.compile(r"^[\w-]+$")
 
 
 class SessionManager:
@@ -26,14 +58,213 @@ class SessionManager:
     def __init__(self, sessions_dir: Path = Path(".embody/sessions")):
         self.sessions_dir = sessions_dir
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
-        self.active_sessions: Dict[str, Any] = {}  # session_id -> AmplifierSession
+        # session_id -> AmplifierSession, least recently used first
+        self.active_sessions: "OrderedDict[str, Any]" = OrderedDict()
+        
+        # Idle eviction: sessions are cleaned up after idle_ttl seconds unused or
+        # when more than max_active are live, and rebuilt from state on next use
+        self.idle_ttl = float(os.getenv("EMBODY_SESSION_IDLE_TTL", "1800"))
+        self.max_active = int(os.getenv("EMBODY_MAX_ACTIVE_SESSIONS", "64"))
+        self._last_used: Dict[str, float] = {}
+        self._in_use: Dict[str, int] = {}
+        self._rehydrating: Dict[str, asyncio.Task] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        self._lifecycle_stats = {
+            "evicted_idle": 0,
+            "evicted_capacity": 0,
+            "evict_ms": 0.0,
+            "rehydrated": 0,
+            "rehydrate_failures": 0,
+            "rehydrate_ms": 0.0,
+            "max_rehydrate_ms": 0.0,
+        }
+        self.pool = SessionPool(self._build_session)
+        self.response_cache = ResponseCache()
+        
+        self.agent_dispatch = os.getenv("EMBODY_AGENT_DISPATCH", "task").strip().lower()
+        if self.agent_dispatch not in AGENT_DISPATCH_MODES:
+            raise ValueError(
+                f"Invalid EMBODY_AGENT_DISPATCH '{self.agent_dispatch}' "
+                f"(expected one of: {', '.join(AGENT_DISPATCH_MODES)})"
+            )
+        self._dispatch_stats = {
+            "calls": 0,
+            "failures": 0,
+            "total_ms": 0.0,
+            "last_ms": 0.0,
+            "max_ms": 0.0,
+            "sub_sessions": 0,
+            "sub_session_setup_ms": 0.0,
+            "transcripts_saved": 0,
+            "transcripts_pruned": 0,
+        }
+        # Resumable sub-session transcripts kept per parent session
+        self.sub_session_keep = int(os.getenv("EMBODY_SUB_SESSION_KEEP", "20"))
+        
+        # Concurrent single-agent fan-out (parallel concept generation)
+        self.fan_out_concurrency = int(os.getenv("EMBODY_FANOUT_CONCURRENCY", "4"))
+        self._fan_out_stats = {
+            "runs": 0,
+            "calls": 0,
+            "failures": 0,
+            "rejected": 0,
+            "cancelled": 0,
+            "last_wall_ms": 0.0,
+        }
+        
+        # Speculative agent runs: session_id -> {"key", "agent", "task", "started", "finished", "expiry"}
+        self.speculation_ttl = float(os.getenv("EMBODY_SPECULATION_TTL", "600"))
+        self._speculations: Dict[str, Dict[str, Any]] = {}
+        self._speculation_stats = {
+            "started": 0,
+            "hits": 0,
+            "ready_hits": 0,
+            "in_flight_hits": 0,
+            "cancelled": 0,
+            "expired": 0,
+            "abandoned": 0,
+            "failures": 0,
+            "saved_ms": 0.0,
+        }
+        
+        # Persisted state, shared by every worker (file | sqlite)
+        self.state_store = create_state_store()
+        
+        # Write-through session state cache: session_id -> state, LRU order.
+        # Each entry remembers the store revision it reflects; with revision
+        # checks on, a hit is only served if no other worker wrote since.
+        # Checking costs a threadpool hop and a stat/query per hit, so "auto"
+        # only checks when other writers are possible: several workers, or a
+        # SQLite database other processes may open.
+        revision_check = os.getenv("EMBODY_STATE_REVISION_CHECK", "auto").strip().lower()
+        if revision_check == "auto":
+            self.revision_checks = (
+                int(os.getenv("EMBODY_WORKERS", "1")) > 1 or self.state_store.name == "sqlite"
+            )
+        else:
+            self.revision_checks = revision_check in ("1", "true", "yes", "on")
+        self._state_revisions: Dict[str, Optional[str]] = {}
+        self.state_cache_size = int(os.getenv("EMBODY_STATE_CACHE_SIZE", "256"))
+        self._state_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._dirty_states: Set[str] = set()
+        self._state_stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "journal_appends": 0,
+            "snapshots": 0,
+            "write_failures": 0,
+            "stale_reloads": 0,
+            "refreshes": 0,
+            "conflicts": 0,
+        }
+        
+        # Journal entries since the last snapshot, per session
+        self.journal_compact_every = int(os.getenv("EMBODY_JOURNAL_COMPACT_EVERY", "20"))
+        self._journal_entries: Dict[str, int] = {}
+        self._state_locks: Dict[str, asyncio.Lock] = {}
+    
+    async def start(self) -> None:
+        """Start background work (pre-warming the session pool, idle eviction)"""
+        await self.pool.start()
+        if self._sweeper is None and self.idle_ttl > 0:
+            self._sweeper = asyncio.create_task(self._sweep_loop())
     
-    async def create_session(self, repo_path: str) -> Dict[str, Any]:
+    async def shutdown(self) -> None:
+        """Stop background work, release pooled sessions and flush state"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        for session_id in list(self.active_sessions):
+            await self.cleanup_session(session_id)
+        for session_id in list(self._speculations):
+            self._discard_speculation(session_id, "abandoned")
+        await self.pool.close()
+        await self.flush_session_states()
+        shutdown_executors()
+        self.state_store.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get runtime counters for monitoring
+        
+        Returns:
+            {
+                "active_sessions": int,
+                "pool": Dict[str, Any],
+                "profile_cache": Dict[str, Any],
+                "state_cache": Dict[str, Any],
+                "response_cache": Dict[str, Any],
+                "prompt_payloads": Dict[str, Any] (serialized sizes per label),
+                "dispatch": Dict[str, Any] (live agent run latencies, ms),
+                "speculation": Dict[str, Any] (hit/waste counters and rates),
+                "fan_out": Dict[str, Any],
+                "lifecycle": Dict[str, Any] (eviction/rehydration counts, ms)
+            }
+        """
+        lifecycle = self._lifecycle_stats
+        evicted = lifecycle["evicted_idle"] + lifecycle["evicted_capacity"]
+        rehydrated = lifecycle["rehydrated"]
+        speculation = self._speculation_stats
+        started = speculation["started"]
+        wasted = speculation["cancelled"] + speculation["expired"] + speculation["abandoned"] + speculation["failures"]
+        dispatch = self._dispatch_stats
+        calls = dispatch["calls"]
+        sub_sessions = dispatch["sub_sessions"]
+        return {
+            "active_sessions": len(self.active_sessions),
+            "pool": self.pool.get_stats(),
+            "profile_cache": get_profile_cache_stats(),
+            "state_cache": {
+                **self._state_stats,
+                "size": len(self._state_cache),
+                "max_size": self.state_cache_size,
+                "dirty": len(self._dirty_states),
+                "backend": self.state_store.name,
+                "revision_checks": self.revision_checks,
+            },
+            "response_cache": self.response_cache.get_stats(),
+            "prompt_payloads": get_prompt_stats(),
+            "dispatch": {
+                **dispatch,
+                "mode": self.agent_dispatch,
+                "total_ms": round(dispatch["total_ms"], 2),
+                "avg_ms": round(dispatch["total_ms"] / calls, 2) if calls else 0.0,
+                "sub_session_setup_ms": round(dispatch["sub_session_setup_ms"], 2),
+                "avg_sub_session_setup_ms": (
+                    round(dispatch["sub_session_setup_ms"] / sub_sessions, 2) if sub_sessions else 0.0
+                ),
+            },
+            "speculation": {
+                **speculation,
+                "saved_ms": round(speculation["saved_ms"], 2),
+                "pending": len(self._speculations),
+                "hit_rate": round(speculation["hits"] / started, 3) if started else 0.0,
+                "waste_rate": round(wasted / started, 3) if started else 0.0,
+            },
+            "fan_out": {**self._fan_out_stats, "max_concurrency": self.fan_out_concurrency},
+            "lifecycle": {
+                **lifecycle,
+                "evict_ms": round(lifecycle["evict_ms"], 2),
+                "avg_evict_ms": round(lifecycle["evict_ms"] / evicted, 2) if evicted else 0.0,
+                "rehydrate_ms": round(lifecycle["rehydrate_ms"], 2),
+                "avg_rehydrate_ms": round(lifecycle["rehydrate_ms"] / rehydrated, 2) if rehydrated else 0.0,
+                "in_use": sum(1 for count in self._in_use.values() if count),
+                "idle_ttl": self.idle_ttl,
+                "max_active": self.max_active,
+            },
+        }
+    
+    async def create_session(self, repo_path: str, ref: Optional[str] = None) -> Dict[str, Any]:
         """
         Create new design exploration session
         
+        Checks out a pre-initialized AmplifierSession from the pool, so the
+        only per-request work is capability registration and token extraction.
+        
         Args:
             repo_path: Path to repository with design tokens
+            ref: Git revision to extract tokens at (None = working tree)
             
         Returns:
             {
@@ -42,17 +273,77 @@ class SessionManager:
                 "created_at": str (ISO timestamp)
             }
             
+        Raises:
+            ValueError: If profile loading or session initialization fails,
+                or ref can't be resolved
+        """
+        session_id, session = await self.pool.acquire()
+        self._register_capabilities(session)
+        
+        # Extract tokens from repository (non-blocking on failure)
+        try:
+            extracted_tokens = await extract_tokens_from_repo(repo_path, ref=ref)
+        except ValueError:
+            # Unresolvable ref - don't leak the pooled session
+            try:
+                await session.cleanup()
+            except Exception as e:
+                print(f"Warning: Session cleanup failed: {e}")
+            raise
+        
+        # Create initial session state
+        state = {
+            "session_id": session_id,
+            "created_at": datetime.now(UTC).isoformat(),
+            "updated_at": datetime.now(UTC).isoformat(),
+            "repo_path": repo_path,
+            "ref": ref,
+            "extracted_tokens": extracted_tokens,
+            "profile": "default",
+            "phase": "context_gathering",
+            "context": {},
+            "iterations": [],
+            "documentation": {}
+        }
+        
+        # Persist state (failures are logged and retried - keep in-memory state)
+        async with self._state_lock(session_id):
+            self._cache_state(session_id, state)
+            self._dirty_states.add(session_id)
+            await self._write_state(session_id)
+        
+        # Store in active sessions
+        await self._activate(session_id, session)
+        
+        return {
+            "session_id": session_id,
+            "extracted_tokens": extracted_tokens,
+            "created_at": state["created_at"]
+        }
+    
+    async def _build_session(self, session_id: str) -> Any:
+        """
+        Build and initialize an AmplifierSession (used as the pool factory)
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            Initialized AmplifierSession
+            
         Raises:
             ValueError: If profile loading or session initialization fails
         """
+        if self.response_cache.replaying:
+            # Responses come from recorded fixtures - no profile or provider needed
+            return OfflineSession(session_id)
+        
         from amplifier.session import AmplifierSession
         from amplifier.module_resolution import StandardModuleSourceResolver
         
-        session_id = str(uuid.uuid4())
-        
-        # Load profile and compile to mount plan
+        # Load profile and compile to mount plan (blocking file I/O)
         try:
-            mount_plan = load_embody_profile()
+            mount_plan = await run_blocking(load_embody_profile)
         except Exception as e:
             raise ValueError(f"Failed to load embody profile: {e}")
         
@@ -80,61 +371,146 @@ class SessionManager:
         except Exception as e:
             raise ValueError(f"Failed to initialize session: {e}")
         
-        # Register session capabilities for task tool
-        session.coordinator.register_capability("session.spawn", self._spawn_sub_session)
-        session.coordinator.register_capability("session.resume", self._resume_sub_session)
+        return session
+    
+    async def get_session(self, session_id: str) -> Optional[Any]:
+        """
+        Retrieve active AmplifierSession by ID
         
-        # Extract tokens from repository (non-blocking on failure)
-        extracted_tokens = await extract_tokens_from_repo(repo_path)
+        A session evicted for idleness, lost to a restart or created by
+        another worker is rebuilt transparently when its persisted state
+        exists. Its conversation
+        context starts empty; everything agents need is rebuilt from state.
         
-        # Create initial session state
-        state = {
-            "session_id": session_id,
-            "created_at": datetime.now(UTC).isoformat(),
-            "updated_at": datetime.now(UTC).isoformat(),
-            "repo_path": repo_path,
-            "extracted_tokens": extracted_tokens,
-            "profile": "default",
-            "phase": "context_gathering",
-            "context": {},
-            "iterations": [],
-            "documentation": {}
-        }
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            AmplifierSession or None if not found
+            
+        Raises:
+            ValueError: If the session exists but can't be rebuilt
+        """
+        session = self.active_sessions.get(session_id)
+        if session is not None:
+            self._touch(session_id)
+            return session
+        
+        if not _SESSION_ID.match(session_id):
+            return None
+        if session_id not in self._state_cache and not await run_blocking(self.state_store.exists, session_id):
+            return None
+        
+        # Concurrent requests for one evicted session share a single rebuild
+        task = self._rehydrating.get(session_id)
+        if task is None:
+            task = asyncio.create_task(self._rehydrate(session_id))
+            self._rehydrating[session_id] = task
+            task.add_done_callback(lambda _: self._rehydrating.pop(session_id, None))
+        return await asyncio.shield(task)
+    
+    async def _rehydrate(self, session_id: str) -> Any:
+        """Rebuild an evicted session under its original id"""
+        stats = self._lifecycle_stats
+        started = time.perf_counter()
         
-        # Persist state
         try:
-            save_session_state(session_id, state)
-        except Exception as e:
-            # Log but don't fail - keep in-memory state
-            print(f"Warning: Failed to persist session state: {e}")
+            session = await self._build_session(session_id)
+        except Exception:
+            stats["rehydrate_failures"] += 1
+            raise
         
-        # Store in active sessions
+        self._register_capabilities(session)
+        await self._activate(session_id, session)
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats["rehydrated"] += 1
+        stats["rehydrate_ms"] += elapsed_ms
+        stats["max_rehydrate_ms"] = round(max(stats["max_rehydrate_ms"], elapsed_ms), 2)
+        return session
+    
+    def _register_capabilities(self, session: Any) -> None:
+        """Register session capabilities for task tool"""
+        session.coordinator.register_capability("session.spawn", self._spawn_sub_session)
+        session.coordinator.register_capability("session.resume", self._resume_sub_session)
+    
+    async def _activate(self, session_id: str, session: Any) -> None:
+        """Track a live session, evicting least recently used ones over max_active"""
         self.active_sessions[session_id] = session
+        self._touch(session_id)
         
-        return {
-            "session_id": session_id,
-            "extracted_tokens": extracted_tokens,
-            "created_at": state["created_at"]
-        }
+        for candidate in list(self.active_sessions):
+            if len(self.active_sessions) <= max(self.max_active, 1):
+                break
+            if candidate != session_id and not self._is_busy(candidate):
+                await self._evict(candidate, "evicted_capacity")
     
-    async def get_session(self, session_id: str) -> Optional[Any]:
+    def _touch(self, session_id: str) -> None:
+        """Mark a session as just used"""
+        self._last_used[session_id] = time.monotonic()
+        if session_id in self.active_sessions:
+            self.active_sessions.move_to_end(session_id)
+    
+    @contextmanager
+    def _using(self, session_id: str) -> Iterator[None]:
+        """Protect a session from eviction while an agent runs on it"""
+        self._in_use[session_id] = self._in_use.get(session_id, 0) + 1
+        try:
+            yield
+        finally:
+            self._in_use[session_id] -= 1
+            if not self._in_use[session_id]:
+                del self._in_use[session_id]
+            self._touch(session_id)
+    
+    def _is_busy(self, session_id: str) -> bool:
+        """Check whether an agent call or speculative run is using the session"""
+        if self._in_use.get(session_id):
+            return True
+        speculation = self._speculations.get(session_id)
+        return speculation is not None and not speculation["task"].done()
+    
+    async def _evict(self, session_id: str, reason: str) -> None:
+        """Release a live session; its state stays on disk for rehydration"""
+        started = time.perf_counter()
+        await self.cleanup_session(session_id)
+        self._lifecycle_stats[reason] += 1
+        self._lifecycle_stats["evict_ms"] += (time.perf_counter() - started) * 1000
+    
+    async def evict_idle_sessions(self) -> int:
         """
-        Retrieve active AmplifierSession by ID
+        Clean up sessions unused for longer than idle_ttl
         
-        Args:
-            session_id: Session identifier
-            
         Returns:
-            AmplifierSession or None if not found
+            Number of sessions evicted
         """
-        return self.active_sessions.get(session_id)
+        cutoff = time.monotonic() - self.idle_ttl
+        idle = [
+            session_id for session_id in list(self.active_sessions)
+            if self._last_used.get(session_id, 0) < cutoff and not self._is_busy(session_id)
+        ]
+        for session_id in idle:
+            await self._evict(session_id, "evicted_idle")
+        return len(idle)
     
-    def get_session_state(self, session_id: str) -> Dict[str, Any]:
+    async def _sweep_loop(self) -> None:
+        """Periodically evict idle sessions"""
+        interval = min(max(self.idle_ttl / 4, 1.0), 60.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle_sessions()
+            except Exception as e:
+                print(f"Warning: Idle session sweep failed: {e}")
+    
+    async def get_session_state(self, session_id: str, readonly: bool = False) -> Dict[str, Any]:
         """
-        Load session state from disk
+        Get session state, from memory when cached
         
         Args:
             session_id: Session identifier
+            readonly: Return the cached object itself instead of a copy.
+                Callers must not mutate it.
             
         Returns:
             Session state dictionary
@@ -143,30 +519,230 @@ class SessionManager:
             FileNotFoundError: If session doesn't exist
             ValueError: If state is malformed
         """
-        return load_session_state(session_id)
+        state = await self._cached_state(session_id)
+        return state if readonly else copy.deepcopy(state)
     
-    def update_session_state(self, session_id: str, updates: Dict[str, Any]) -> None:
+    async def update_session_state(
+        self,
+        session_id: str,
+        updates: Dict[str, Any],
+        appends: Optional[Dict[str, Any]] = None
+    ) -> None:
         """
         Update and persist session state
         
+        The change is appended to the session journal, so write cost is
+        proportional to the update rather than the whole state, then applied
+        to the cached state. The journal is compacted into a snapshot every
+        `journal_compact_every` entries. Writes are conditional on the state
+        revision the update was built from: if another worker wrote first,
+        the update is rebuilt against the latest state while the store holds
+        the session locked, so it can't conflict again. A failed write is logged
+        and the full state is retried on the next flush. Updates to one
+        session are serialized; disk writes run in the I/O thread pool.
+        
         Args:
             session_id: Session identifier
             updates: Dictionary with updates to merge into state
+            appends: List field -> item to append (e.g. {"iterations": {...}})
             
         Raises:
             FileNotFoundError: If session doesn't exist
         """
-        # Load current state
-        state = load_session_state(session_id)
+        # Copied so later caller mutations can't leak into the cache
+        updates = copy.deepcopy(updates)
+        appends = copy.deepcopy(appends or {})
+        
+        async with self._state_lock(session_id):
+            state = await self._cached_state(session_id, locked=True)
+            
+            updates["updated_at"] = datetime.now(UTC).isoformat()
+            delta = make_session_delta(state, updates, copy.deepcopy(appends))
+            
+            if await self._persist_delta(session_id, state, delta):
+                return
+            
+            # Another worker wrote first. Retrying optimistically reloads the
+            # whole state each time and starves under sustained contention,
+            # so rebuild the delta inside the store's lock instead.
+            self._forget_state(session_id)
+            try:
+                state, revision = await run_blocking(
+                    self.state_store.append_latest,
+                    session_id,
+                    lambda latest: make_session_delta(latest, updates, copy.deepcopy(appends))
+                )
+            except FileNotFoundError:
+                raise
+            except Exception as e:
+                self._state_stats["write_failures"] += 1
+                raise IOError(f"Failed to persist session state for {session_id}: {e}")
+            
+            self._cache_state(session_id, state)
+            self._state_revisions[session_id] = revision
+            await self._journaled(session_id)
+    
+    async def flush_session_states(self) -> None:
+        """Retry persisting any cached states whose last write failed"""
+        for session_id in list(self._dirty_states):
+            async with self._state_lock(session_id):
+                await self._write_state(session_id)
+    
+    def _state_lock(self, session_id: str) -> asyncio.Lock:
+        """Per-session lock serializing state mutation and persistence"""
+        lock = self._state_locks.get(session_id)
+        if lock is None:
+            lock = self._state_locks[session_id] = asyncio.Lock()
+        return lock
+    
+    async def _cached_state(self, session_id: str, locked: bool = False) -> Dict[str, Any]:
+        """Return the cached state object, loading it from the store on a miss or when stale"""
+        state = self._state_cache.get(session_id)
+        if state is not None and await self._state_is_current(session_id):
+            self._state_cache.move_to_end(session_id)
+            self._state_stats["hits"] += 1
+            return state
+        
+        if not locked:
+            async with self._state_lock(session_id):
+                return await self._cached_state(session_id, locked=True)
+        
+        if state is not None:
+            # Another worker wrote since - replay just its deltas if the store can
+            revision = await run_blocking(
+                self.state_store.refresh, session_id, state, self._state_revisions.get(session_id)
+            )
+            if revision is not None:
+                self._state_cache.move_to_end(session_id)
+                self._state_revisions[session_id] = revision
+                self._state_stats["refreshes"] += 1
+                return state
+        
+        self._state_stats["stale_reloads" if state is not None else "misses"] += 1
+        state, revision, entries = await run_blocking(self._load_state, session_id)
+        self._cache_state(session_id, state)
+        self._state_revisions[session_id] = revision
+        # Entries already journaled count towards the next compaction
+        self._journal_entries[session_id] = entries
+        return state
+    
+    def _load_state(self, session_id: str) -> Tuple[Dict[str, Any], Optional[str], int]:
+        """Load state, its revision and the stored journal length (runs in the I/O pool)"""
+        state, revision = self.state_store.load(session_id)
+        return state, revision, self.state_store.journal_length(session_id)
+    
+    async def _state_is_current(self, session_id: str) -> bool:
+        """Check that no other worker has written the session since it was cached"""
+        if not self.revision_checks or session_id in self._dirty_states:
+            # Unpersisted local changes are newer than anything stored
+            return True
+        revision = await run_blocking(self.state_store.revision, session_id)
+        return revision == self._state_revisions.get(session_id)
+    
+    def _cache_state(self, session_id: str, state: Dict[str, Any]) -> None:
+        """Insert state into the cache, evicting least recently used clean entries"""
+        self._state_cache[session_id] = state
+        self._state_cache.move_to_end(session_id)
+        
+        for cached_id in list(self._state_cache):
+            if len(self._state_cache) <= self.state_cache_size:
+                break
+            if cached_id == session_id or cached_id in self._dirty_states:
+                # Never drop unpersisted state; flush_session_states() retries it
+                continue
+            lock = self._state_locks.get(cached_id)
+            if lock is not None and lock.locked():
+                continue
+            del self._state_cache[cached_id]
+            self._state_revisions.pop(cached_id, None)
+            self._state_locks.pop(cached_id, None)
+            self._journal_entries.pop(cached_id, None)
+            self._state_stats["evictions"] += 1
+    
+    def _forget_state(self, session_id: str) -> None:
+        """Drop a stale cached state so the next access reloads it"""
+        self._state_cache.pop(session_id, None)
+        self._state_revisions.pop(session_id, None)
+        self._journal_entries.pop(session_id, None)
+    
+    async def _persist_delta(self, session_id: str, state: Dict[str, Any], delta: Dict[str, Any]) -> bool:
+        """
+        Journal a delta and apply it to the cached state
+        
+        Compacts to a snapshot when the journal grows.
+        
+        Returns:
+            False if another worker wrote first (nothing was applied)
+        """
+        if session_id in self._dirty_states:
+            # An earlier write was lost - only a full snapshot is consistent
+            apply_session_delta(state, delta)
+            await self._write_state(session_id)
+            return True
+        
+        try:
+            revision = await run_blocking(
+                self.state_store.append, session_id, delta, self._state_revisions.get(session_id)
+            )
+        except Exception as e:
+            apply_session_delta(state, delta)
+            self._dirty_states.add(session_id)
+            self._state_stats["write_failures"] += 1
+            print(f"Warning: Failed to persist session state: {e}")
+            return True
+        
+        if revision is None:
+            self._state_stats["conflicts"] += 1
+            return False
+        
+        apply_session_delta(state, delta)
+        self._state_revisions[session_id] = revision
+        await self._journaled(session_id)
+        return True
+    
+    async def _journaled(self, session_id: str) -> None:
+        """Count a journal append, compacting to a snapshot when the journal grows"""
+        self._state_stats["journal_appends"] += 1
+        entries = self._journal_entries.get(session_id, 0) + 1
+        self._journal_entries[session_id] = entries
+        
+        if entries >= self.journal_compact_every:
+            await self._write_state(session_id, conditional=True)
+    
+    async def _write_state(self, session_id: str, conditional: bool = False) -> None:
+        """
+        Write a full snapshot of cached state, tracking failures as dirty
         
-        # Merge updates
-        state.update(updates)
+        Args:
+            session_id: Session identifier
+            conditional: Skip the write (and drop the cached state) if another
+                worker wrote since the cached revision. Unconditional writes
+                are for new sessions and for retrying lost writes.
+        """
+        state = self._state_cache.get(session_id)
+        if state is None:
+            return
+        
+        expected = self._state_revisions.get(session_id) if conditional else None
+        
+        try:
+            revision = await run_blocking(self.state_store.save, session_id, state, expected)
+        except Exception as e:
+            self._dirty_states.add(session_id)
+            self._state_stats["write_failures"] += 1
+            print(f"Warning: Failed to persist session state: {e}")
+            return
         
-        # Update timestamp
-        state["updated_at"] = datetime.now(UTC).isoformat()
+        if revision is None:
+            # Compaction lost a race with another worker; reload on next access
+            self._state_stats["conflicts"] += 1
+            self._forget_state(session_id)
+            return
         
-        # Persist
-        save_session_state(session_id, state)
+        self._state_revisions[session_id] = revision
+        self._dirty_states.discard(session_id)
+        self._journal_entries.pop(session_id, None)
+        self._state_stats["snapshots"] += 1
     
     async def execute_agent(
         self,
@@ -175,7 +751,14 @@ class SessionManager:
         instruction: str
     ) -> str:
         """
-        Execute agent task using task tool
+        Execute agent task
+        
+        In "task" dispatch mode the session's orchestrator is asked to run
+        the agent through the task tool; in "direct" mode the agent runs in
+        a child session straight away, skipping the orchestrator round-trips.
+        Adopts a matching speculative run started by speculate(), and is
+        served from the response cache when it is enabled and holds the
+        same (agent, instruction, profile) call.
         
         Args:
             session_id: Session identifier
@@ -186,30 +769,402 @@ class SessionManager:
             Agent response content
             
         Raises:
-            ValueError: If session not found or agent execution fails
+            ValueError: If session not found, agent execution fails or a
+                replayed response was never recorded
         """
         session = await self.get_session(session_id)
         
         if not session:
             raise ValueError(f"Session not found: {session_id}")
         
-        # Build prompt for agent execution via task tool
-        prompt = f"""
-Use the task tool to execute this agent task:
-
-Agent: {agent}
-
-Task:
-{instruction}
-
-Return the result in a structured format.
-"""
+        with self._using(session_id):
+            speculation = self._claim_speculation(session_id, agent, instruction)
+            if speculation is not None:
+                content = await self._await_speculation(speculation)
+                if content is not None:
+                    return content
+        
+            return await self._run_agent(session, agent, instruction)
+    
+    async def fan_out_agent(
+        self,
+        session_id: str,
+        agent: str,
+        instructions: List[str],
+        concurrency: Optional[int] = None,
+        first_k: Optional[int] = None,
+        parse: Optional[Callable[[int, str], Any]] = None
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Run independent calls to one agent concurrently
+        
+        Every call runs in its own child session (concurrent calls can't
+        share the orchestrator's context), at most `concurrency` at a time.
+        Failed calls, and responses `parse` rejects, are logged and skipped.
+        With first_k, the remaining calls are cancelled once that many
+        responses have been accepted.
+        
+        Args:
+            session_id: Session identifier
+            agent: Agent name
+            instructions: One instruction per call
+            concurrency: Max calls in flight (env EMBODY_FANOUT_CONCURRENCY, default 4)
+            first_k: Stop after this many accepted responses
+            parse: Turns (index, response content) into the yielded value,
+                raising ValueError to reject the response (default: yield
+                the content as is)
+            
+        Yields:
+            (index into instructions, parsed response), in completion order
+            
+        Raises:
+            ValueError: If session not found or every call failed
+        """
+        session = await self.get_session(session_id)
+        
+        if not session:
+            raise ValueError(f"Session not found: {session_id}")
+        
+        with self._using(session_id):
+            # A pending single-call speculation can't match fanned-out instructions
+            self._discard_speculation(session_id, "cancelled")
+        
+            limit = max(1, min(concurrency or self.fan_out_concurrency, len(instructions)))
+            semaphore = asyncio.Semaphore(limit)
+            stats = self._fan_out_stats
+            started = time.perf_counter()
+        
+            async def run(index: int, instruction: str) -> Tuple[int, str]:
+                async with semaphore:
+                    return index, await self._run_agent(session, agent, instruction, isolated=True)
+        
+            tasks = [asyncio.create_task(run(index, instruction)) for index, instruction in enumerate(instructions)]
+            stats["runs"] += 1
+            stats["calls"] += len(tasks)
+            succeeded = 0
+            accepted = 0
+            first_error: Optional[Exception] = None
+        
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    try:
+                        index, content = await next_done
+                    except Exception as e:
+                        stats["failures"] += 1
+                        first_error = first_error or e
+                        print(f"Warning: Fan-out {agent} call failed: {e}")
+                        continue
+                
+                    succeeded += 1
+                    if parse is not None:
+                        try:
+                            content = parse(index, content)
+                        except ValueError as e:
+                            stats["rejected"] += 1
+                            print(f"Warning: Skipping unparseable {agent} response {index + 1}: {e}")
+                            continue
+                
+                    accepted += 1
+                    yield index, content
+                
+                    if first_k and accepted >= first_k:
+                        break
+            
+                if not succeeded:
+                    raise ValueError(f"Agent execution failed: all {len(tasks)} calls failed ({first_error})")
+            finally:
+                pending = [task for task in tasks if not task.done()]
+                for task in pending:
+                    task.cancel()
+                stats["cancelled"] += len(pending)
+                stats["last_wall_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    
+    async def _run_agent(self, session: Any, agent: str, instruction: str, isolated: bool = False) -> str:
+        """
+        Run one agent call on a session (response cache, then live dispatch)
+        
+        isolated forces a child session even in "task" dispatch mode.
+        """
+        cache_key, cached = await self._cached_response(agent, instruction)
+        if cached is not None:
+            return cached["content"]
+        
+        started = time.perf_counter()
         
         try:
-            result = await session.execute(prompt)
-            return result.content
+            if isolated or self.agent_dispatch == "direct":
+                # Nothing learns the child's id, so it can't be resumed - don't persist it
+                result = await self._spawn_sub_session(agent, instruction, session, persist=False)
+                content = result["output"]
+            else:
+                result = await session.execute(_build_agent_prompt(agent, instruction))
+                content = result.content
         except Exception as e:
+            self._record_dispatch(started, failed=True)
             raise ValueError(f"Agent execution failed: {e}")
+        
+        elapsed_ms = self._record_dispatch(started)
+        if cache_key is not None:
+            await self.response_cache.put(cache_key, agent, instruction, content, elapsed_ms)
+        
+        return content
+    
+    async def stream_agent(
+        self,
+        session_id: str,
+        agent: str,
+        instruction: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute agent task, yielding events as the orchestrator emits them
+        
+        Token deltas and tool activity are captured through session hooks
+        (the child session's hooks in direct dispatch mode) while execute()
+        runs in a background task. A response cache hit is replayed as a
+        single token event.
+        
+        Args:
+            session_id: Session identifier
+            agent: Agent name (e.g., "embody-collection:context-gatherer")
+            instruction: Task instruction for agent
+            
+        Yields:
+            {"event": "token", "data": {"text": str}}
+            {"event": "progress", "data": {"stage": str, ...}}
+            {"event": "response", "data": {"content": str}} (always last)
+            
+        Raises:
+            ValueError: If session not found or agent execution fails
+        """
+        session = await self.get_session(session_id)
+        
+        if not session:
+            raise ValueError(f"Session not found: {session_id}")
+        
+        with self._using(session_id):
+            speculation = self._claim_speculation(session_id, agent, instruction)
+            if speculation is not None:
+                yield {"event": "progress", "data": {"stage": "speculative", "agent": agent}}
+                content = await self._await_speculation(speculation)
+                if content is not None:
+                    yield {"event": "token", "data": {"text": content}}
+                    yield {"event": "response", "data": {"content": content}}
+                    return
+        
+            cache_key, cached = await self._cached_response(agent, instruction)
+            if cached is not None:
+                yield {"event": "progress", "data": {"stage": "cached", "agent": agent}}
+                yield {"event": "token", "data": {"text": cached["content"]}}
+                yield {"event": "response", "data": {"content": cached["content"]}}
+                return
+        
+            from amplifier.hooks import HookResult
+        
+            started = time.perf_counter()
+            child = None
+        
+            if self.agent_dispatch == "direct":
+                try:
+                    child = await self._start_sub_session(agent, session)
+                except Exception as e:
+                    self._record_dispatch(started, failed=True)
+                    raise ValueError(f"Agent execution failed: {e}")
+                target, prompt = child, instruction
+            else:
+                target, prompt = session, _build_agent_prompt(agent, instruction)
+        
+            queue: asyncio.Queue = asyncio.Queue()
+        
+            async def on_delta(event: str, data: Dict[str, Any]):
+                text = _delta_text(data)
+                if text:
+                    queue.put_nowait({"event": "token", "data": {"text": text}})
+                return HookResult(action="continue")
+        
+            async def on_progress(event: str, data: Dict[str, Any]):
+                progress = {"stage": event, "agent": agent}
+                tool_name = data.get("tool_name") if isinstance(data, dict) else None
+                if tool_name:
+                    progress["tool"] = tool_name
+                queue.put_nowait({"event": "progress", "data": progress})
+                return HookResult(action="continue")
+        
+            hooks = target.coordinator.hooks
+            unregister = [hooks.register(event, on_delta, name=f"embody-stream-{event}") for event in STREAM_TOKEN_EVENTS]
+            unregister += [hooks.register(event, on_progress, name=f"embody-stream-{event}") for event in STREAM_PROGRESS_EVENTS]
+        
+            execution = asyncio.create_task(target.execute(prompt))
+            execution.add_done_callback(lambda _: queue.put_nowait(None))
+        
+            try:
+                yield {"event": "progress", "data": {"stage": "started", "agent": agent}}
+            
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        break
+                    yield item
+            
+                try:
+                    result = execution.result()
+                except Exception as e:
+                    self._record_dispatch(started, failed=True)
+                    raise ValueError(f"Agent execution failed: {e}")
+            
+                elapsed_ms = self._record_dispatch(started)
+                if cache_key is not None:
+                    await self.response_cache.put(cache_key, agent, instruction, result.content, elapsed_ms)
+            
+                yield {"event": "response", "data": {"content": result.content}}
+            finally:
+                # Client disconnects close the generator early
+                if not execution.done():
+                    execution.cancel()
+                for remove in unregister:
+                    if callable(remove):
+                        remove()
+                if child is not None:
+                    await self._finish_sub_session(child, agent, persist=False)
+    
+    async def _cached_response(
+        self,
+        agent: str,
+        instruction: str
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Look up an agent call in the response cache
+        
+        Returns:
+            (cache key or None when caching is off, cached entry or None)
+            
+        Raises:
+            ValueError: On a miss in replay mode
+        """
+        if not self.response_cache.enabled:
+            return None, None
+        
+        cache_key = await self.response_cache.make_key(agent, instruction)
+        return cache_key, await self.response_cache.get(cache_key, agent)
+    
+    def speculate(self, session_id: str, agent: str, instruction: str) -> None:
+        """
+        Start an agent call in the background, ahead of the request for it
+        
+        A later execute_agent/stream_agent call for the same session, agent
+        and (normalized) instruction adopts the run instead of starting its
+        own. The run is cancelled when a different call arrives for the
+        session, when the session is cleaned up or when it is replaced by a
+        newer speculation; an unclaimed result is dropped by a timer
+        speculation_ttl seconds after the run finishes.
+        
+        The run always executes in an isolated child session (as in direct
+        dispatch), never on the session's orchestrator, so cancelling it
+        can't leave a half-finished turn in the session's context.
+        
+        Args:
+            session_id: Session identifier
+            agent: Agent name
+            instruction: Task instruction, exactly as the later call will build it
+        """
+        session = self.active_sessions.get(session_id)
+        if session is None:
+            return
+        
+        self._discard_speculation(session_id, "cancelled")
+        
+        speculation = {
+            "key": make_cache_key(agent, instruction, ""),
+            "agent": agent,
+            "started": time.monotonic(),
+            "finished": None,
+            "expiry": None,
+        }
+        
+        def expire() -> None:
+            if self._speculations.get(session_id) is speculation:
+                self._discard_speculation(session_id, "expired")
+        
+        def finished(task: asyncio.Task) -> None:
+            speculation["finished"] = time.monotonic()
+            if task.cancelled():
+                return
+            # Retrieve the exception so unclaimed failures aren't logged as unhandled
+            if task.exception() is not None:
+                self._speculation_stats["failures"] += 1
+            if self._speculations.get(session_id) is speculation:
+                speculation["expiry"] = asyncio.get_running_loop().call_later(self.speculation_ttl, expire)
+        
+        speculation["task"] = asyncio.create_task(self._run_agent(session, agent, instruction, isolated=True))
+        speculation["task"].add_done_callback(finished)
+        self._speculations[session_id] = speculation
+        self._speculation_stats["started"] += 1
+    
+    def _claim_speculation(self, session_id: str, agent: str, instruction: str) -> Optional[Dict[str, Any]]:
+        """
+        Take the session's speculative run if it matches this call
+        
+        A non-matching run means inputs changed, so it is cancelled.
+        """
+        speculation = self._speculations.get(session_id)
+        if speculation is None:
+            return None
+        
+        if speculation["key"] != make_cache_key(agent, instruction, ""):
+            self._discard_speculation(session_id, "cancelled")
+            return None
+        
+        if speculation["expiry"] is not None:
+            speculation["expiry"].cancel()
+        return self._speculations.pop(session_id)
+    
+    async def _await_speculation(self, speculation: Dict[str, Any]) -> Optional[str]:
+        """Result of a claimed speculative run; None if it failed (caller runs live)"""
+        stats = self._speculation_stats
+        ready = speculation["task"].done()
+        
+        try:
+            content = await speculation["task"]
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Warning: Speculative {speculation['agent']} run failed, running live: {e}")
+            return None
+        
+        # Time the run had already spent before it was asked for
+        head_start = (speculation["finished"] if ready else time.monotonic()) - speculation["started"]
+        stats["hits"] += 1
+        stats["ready_hits" if ready else "in_flight_hits"] += 1
+        stats["saved_ms"] += head_start * 1000
+        return content
+    
+    def _discard_speculation(self, session_id: str, reason: str) -> None:
+        """Drop a session's speculative run, cancelling it if still running"""
+        speculation = self._speculations.pop(session_id, None)
+        if speculation is None:
+            return
+        
+        if speculation["expiry"] is not None:
+            speculation["expiry"].cancel()
+        task = speculation["task"]
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled() and task.exception() is not None:
+            # Already counted as a failure
+            return
+        self._speculation_stats[reason] += 1
+    
+    def _record_dispatch(self, started: float, failed: bool = False) -> float:
+        """Record one live agent run in the dispatch latency stats; returns elapsed ms"""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats = self._dispatch_stats
+        if failed:
+            stats["failures"] += 1
+            return elapsed_ms
+        stats["calls"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["last_ms"] = round(elapsed_ms, 2)
+        stats["max_ms"] = round(max(stats["max_ms"], elapsed_ms), 2)
+        return elapsed_ms
     
     async def cleanup_session(self, session_id: str) -> None:
         """
@@ -218,6 +1173,8 @@ Return the result in a structured format.
         Args:
             session_id: Session identifier
         """
+        self._discard_speculation(session_id, "abandoned")
+        
         # Remove from active sessions
         if session_id in self.active_sessions:
             session = self.active_sessions[session_id]
@@ -229,24 +1186,271 @@ Return the result in a structured format.
                 print(f"Warning: Session cleanup failed: {e}")
             
             del self.active_sessions[session_id]
+        
+        self._last_used.pop(session_id, None)
     
     # Helper methods for task tool capabilities
     
-    async def _spawn_sub_session(self, *args, **kwargs):
-        """Spawn sub-session for task tool"""
-        # This would be implemented based on Amplifier Foundation's sub-session protocol
-        # For now, placeholder
-        pass
+    async def _spawn_sub_session(
+        self,
+        agent_name: str,
+        instruction: str,
+        parent_session: Any,
+        agent_configs: Optional[Dict[str, Any]] = None,
+        sub_session_id: Optional[str] = None,
+        persist: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Run an agent in a child session (the "session.spawn" capability)
+        
+        The child is configured from the parent's mount plan overlaid with
+        the agent's own configuration and starts with an empty context. Its
+        transcript is saved under the parent session so it can be resumed
+        (the last EMBODY_SUB_SESSION_KEEP per parent are kept).
+        
+        Args:
+            agent_name: Agent name (e.g., "embody-collection:concept-generator")
+            instruction: Task instruction for agent
+            parent_session: Session the agent is delegated from
+            agent_configs: Agent name -> config overlay (default: the parent
+                mount plan's "agents")
+            sub_session_id: Identifier to use for the child session
+            persist: Save the transcript for session.resume (off for direct
+                dispatch, whose callers never see the child's id)
+            
+        Returns:
+            {"output": str, "session_id": str}
+            
+        Raises:
+            ValueError: If the agent is unknown or the child session fails
+        """
+        child = await self._start_sub_session(agent_name, parent_session, agent_configs, sub_session_id)
+        try:
+            result = await child.execute(instruction)
+        except Exception as e:
+            raise ValueError(f"Sub-session {child.session_id} failed: {e}")
+        finally:
+            await self._finish_sub_session(child, agent_name, persist)
+        
+        return {"output": result.content, "session_id": child.session_id}
+    
+    async def _resume_sub_session(self, sub_session_id: str, instruction: str) -> Dict[str, Any]:
+        """
+        Continue a saved agent sub-session (the "session.resume" capability)
+        
+        Args:
+            sub_session_id: Identifier returned by _spawn_sub_session()
+            instruction: Follow-up instruction
+            
+        Returns:
+            {"output": str, "session_id": str}
+            
+        Raises:
+            ValueError: If the sub-session is unknown or fails
+        """
+        parent_id = _sub_session_parent(sub_session_id)
+        try:
+            record = await run_blocking(load_sub_session, parent_id, sub_session_id)
+        except FileNotFoundError as e:
+            raise ValueError(str(e))
+        
+        parent_config = await run_blocking(load_embody_profile)
+        child = await self._start_sub_session(
+            record["agent"],
+            parent_config,
+            sub_session_id=sub_session_id,
+            transcript=record.get("transcript", [])
+        )
+        try:
+            result = await child.execute(instruction)
+        except Exception as e:
+            raise ValueError(f"Sub-session {sub_session_id} failed: {e}")
+        finally:
+            await self._finish_sub_session(child, record["agent"])
+        
+        return {"output": result.content, "session_id": sub_session_id}
+    
+    async def _start_sub_session(
+        self,
+        agent_name: str,
+        parent: Any,
+        agent_configs: Optional[Dict[str, Any]] = None,
+        sub_session_id: Optional[str] = None,
+        transcript: Optional[List[Dict[str, Any]]] = None
+    ) -> Any:
+        """
+        Build and initialize a child AmplifierSession for one agent
+        
+        Args:
+            agent_name: Agent name
+            parent: Parent AmplifierSession, or a mount plan when resuming
+            agent_configs: Agent name -> config overlay (default: parent's "agents")
+            sub_session_id: Identifier for the child (default: derived from parent id)
+            transcript: Messages to restore into the child's context
+            
+        Returns:
+            Initialized child AmplifierSession
+            
+        Raises:
+            ValueError: If the agent is unknown or the child can't be initialized
+        """
+        from amplifier.session import AmplifierSession
+        from amplifier.module_resolution import StandardModuleSourceResolver
+        
+        started = time.perf_counter()
+        
+        if isinstance(parent, dict):
+            parent_config, parent_id, resolver = parent, _sub_session_parent(sub_session_id or ""), None
+        else:
+            parent_config = getattr(parent, "config", None) or {}
+            parent_id = parent.session_id
+            resolver = parent.coordinator.get("module-source-resolver")
+        
+        agent_config = _find_agent_config(
+            agent_configs if agent_configs is not None else parent_config.get("agents"),
+            agent_name
+        )
+        if agent_config is None:
+            raise ValueError(f"Agent not found: {agent_name}")
+        
+        sub_session_id = sub_session_id or f"{parent_id}.{agent_name.split(':')[-1]}.{uuid.uuid4().hex[:8]}"
+        
+        try:
+            child = AmplifierSession(
+                config=_merge_agent_config(parent_config, agent_config),
+                session_id=sub_session_id,
+                parent_id=parent_id
+            )
+            # Modules are already downloaded by the parent - share its resolver
+            await child.coordinator.mount(
+                "module-source-resolver",
+                resolver or StandardModuleSourceResolver(workspace_dir=Path(".embody/modules"))
+            )
+            await child.initialize()
+        except Exception as e:
+            raise ValueError(f"Failed to initialize sub-session for {agent_name}: {e}")
+        
+        # Agents may delegate further
+        child.coordinator.register_capability("session.spawn", self._spawn_sub_session)
+        child.coordinator.register_capability("session.resume", self._resume_sub_session)
+        
+        if transcript:
+            context = child.coordinator.get("context")
+            for message in transcript:
+                await context.add_message(message)
+        
+        setup_ms = (time.perf_counter() - started) * 1000
+        self._dispatch_stats["sub_sessions"] += 1
+        self._dispatch_stats["sub_session_setup_ms"] += setup_ms
+        
+        return child
     
-    async def _resume_sub_session(self, *args, **kwargs):
-        """Resume sub-session for task tool"""
-        # This would be implemented based on Amplifier Foundation's sub-session protocol
-        # For now, placeholder
-        pass
+    async def _finish_sub_session(self, child: Any, agent_name: str, persist: bool = True) -> None:
+        """
+        Release a child session, saving its transcript if it is resumable
+        
+        Saved transcripts beyond sub_session_keep per parent are pruned,
+        oldest first. Failures are logged, never raised.
+        """
+        if persist:
+            try:
+                transcript = await child.coordinator.get("context").get_messages()
+                record = {
+                    "agent": agent_name,
+                    "parent_id": _sub_session_parent(child.session_id),
+                    "transcript": transcript,
+                }
+                pruned = await run_blocking(
+                    save_sub_session, record["parent_id"], child.session_id, record, self.sub_session_keep
+                )
+                self._dispatch_stats["transcripts_saved"] += 1
+                self._dispatch_stats["transcripts_pruned"] += pruned
+            except Exception as e:
+                print(f"Warning: Failed to save sub-session transcript: {e}")
+        
+        try:
+            await child.cleanup()
+        except Exception as e:
+            print(f"Warning: Sub-session cleanup failed: {e}")
 
 
 # Utility helper functions
 
+def _build_agent_prompt(agent: str, instruction: str) -> str:
+    """Build prompt for agent execution via task tool"""
+    return f"""
+Use the task tool to execute this agent task:
+
+Agent: {agent}
+
+Task:
+{instruction}
+
+Return the result in a structured format.
+"""
+
+
+def _find_agent_config(agent_configs: Any, agent_name: str) -> Optional[Dict[str, Any]]:
+    """Look up an agent by full ("collection:agent") or bare name"""
+    if not isinstance(agent_configs, dict):
+        return None
+    config = agent_configs.get(agent_name)
+    if config is None and ":" in agent_name:
+        config = agent_configs.get(agent_name.split(":", 1)[1])
+    return config if isinstance(config, dict) else None
+
+
+def _merge_agent_config(parent: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Overlay an agent's configuration on the parent mount plan
+    
+    Nested sections merge key by key; module lists (providers, tools,
+    hooks) merge by module name so an agent can reconfigure or add a module
+    without restating the rest. The parent plan is not modified.
+    """
+    merged = copy.deepcopy(parent)
+    for key, value in overlay.items():
+        current = merged.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            merged[key] = _merge_agent_config(current, value)
+        elif key in MODULE_LIST_KEYS and isinstance(current, list) and isinstance(value, list):
+            modules = {item.get("module"): item for item in current if isinstance(item, dict)}
+            for item in value:
+                if isinstance(item, dict) and item.get("module") in modules:
+                    modules[item["module"]] = _merge_agent_config(modules[item["module"]], item)
+                elif isinstance(item, dict):
+                    modules[item.get("module")] = copy.deepcopy(item)
+            merged[key] = list(modules.values())
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def _sub_session_parent(sub_session_id: str) -> str:
+    """
+    Parent session id encoded in a sub-session id ("<parent>.<agent>.<suffix>")
+    
+    Raises:
+        ValueError: If the id is malformed (it is also used as a file name)
+    """
+    match = _SUB_SESSION_ID.match(sub_session_id)
+    if not match or ".." in sub_session_id:
+        raise ValueError(f"Invalid sub-session id: {sub_session_id}")
+    return match.group(1)
+
+
+def _delta_text(data: Any) -> str:
+    """Pull streamed text out of a content delta hook payload"""
+    if not isinstance(data, dict):
+        return ""
+    delta = data.get("delta", data)
+    if isinstance(delta, str):
+        return delta
+    if isinstance(delta, dict):
+        return delta.get("text") or ""
+    return ""
+
+
 def parse_llm_json(content: str) -> Dict[str, Any]:
     """
     Extract and parse JSON from LLM response
@@ -254,7 +1458,7 @@ def parse_llm_json(content: str) -> Dict[str, Any]:
     Handles:
     - Raw JSON
     - JSON in markdown code blocks
-    - JSON mixed with text
+    - JSON mixed with text (including prose that contains braces)
     
     Args:
         content: LLM response content
@@ -268,17 +1472,108 @@ def parse_llm_json(content: str) -> Dict[str, Any]:
     # Try to find JSON in markdown code block
     json_block_match = re.search(r'```(?:json)?\n(.*?)\n```', content, re.DOTALL)
     if json_block_match:
-        json_str = json_block_match.group(1)
-    else:
-        # Try to find JSON object/array directly
-        json_match = re.search(r'(\{.*\}|\[.*\])', content, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(1)
+        try:
+            return json.loads(json_block_match.group(1))
+        except (json.JSONDecodeError, RecursionError):
+            pass
+    
+    # Fast path: one value with nothing but prose after it, the usual shape.
+    # It is then the largest candidate, so the scanner would pick it too.
+    first = _JSON_OPENER.search(content)
+    if first:
+        try:
+            value, end = _JSON_DECODER.raw_decode(content, first.start())
+        except (json.JSONDecodeError, RecursionError):
+            pass
         else:
-            # Assume entire content is JSON
-            json_str = content
+            if not _JSON_OPENER.search(content, end):
+                return value
     
+    # Try each balanced value, largest first; a value that fails to parse
+    # (e.g. a prose brace pair wrapping the payload) yields its children
+    candidates = [(start - end, start, end, children) for start, end, children in _find_json_spans(content)]
+    heapq.heapify(candidates)
+    while candidates:
+        _, start, end, children = heapq.heappop(candidates)
+        try:
+            return json.loads(content[start:end])
+        except RecursionError:
+            # Children are nested at least as deeply
+            continue
+        except json.JSONDecodeError:
+            for child_start, child_end, grandchildren in children:
+                heapq.heappush(candidates, (child_start - child_end, child_start, child_end, grandchildren))
+    
+    # Assume entire content is JSON
     try:
-        return json.loads(json_str)
+        return json.loads(content)
     except json.JSONDecodeError as e:
         raise ValueError(f"Failed to parse JSON from LLM response: {e}")
+    except RecursionError:
+        raise ValueError("Failed to parse JSON from LLM response: nested too deeply")
+
+
+def _find_json_spans(content: str) -> List[Tuple[int, int, list]]:
+    """
+    Find candidate JSON values in a single pass
+    
+    Scans once, tracking string/escape state inside brackets, and returns the
+    span of every balanced object/array that is not nested in another
+    balanced one, each with the balanced spans directly inside it. Spans
+    inside an opener that never closes (e.g. a stray "{" in prose) are
+    promoted, so one bad brace cannot swallow the real payload. Top-level
+    spans are disjoint, so trying them all costs O(n) in total.
+    
+    Args:
+        content: LLM response content
+        
+    Returns:
+        List of (start, end, child spans) in document order
+    """
+    spans: List[Tuple[int, int, list]] = []
+    # Each open bracket: (closing char, start offset, balanced child spans)
+    stack: List[Tuple[str, int, List[Tuple[int, int, list]]]] = []
+    pos = 0
+    
+    while True:
+        match = _JSON_STRUCTURE.search(content, pos)
+        if not match:
+            break
+        ch = match.group()
+        pos = match.end()
+        
+        if ch == '"':
+            # Quotes only matter inside a value; prose quotes are ignored
+            if stack:
+                string_match = _JSON_STRING.match(content, match.start())
+                if not string_match:
+                    # Unterminated string runs to the end of the content
+                    break
+                pos = string_match.end()
+        elif ch == "{" or ch == "[":
+            stack.append(("}" if ch == "{" else "]", match.start(), []))
+        elif not stack or stack[-1][0] != ch:
+            # Stray or mismatched closer in prose - ignore
+            continue
+        else:
+            _, start, children = stack.pop()
+            (stack[-1][2] if stack else spans).append((start, pos, children))
+    
+    # Unclosed openers: promote their balanced children
+    for _, _, children in stack:
+        spans.extend(children)
+    
+    spans.sort()
+    return spans
+
+
+# Start of a JSON object/array
+_JSON_OPENER = re.compile(r'[{\[]')
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Characters that change JSON scanner state; everything else is skipped by the regex engine
+_JSON_STRUCTURE = re.compile(r'[{}\[\]"]')
+
+# A complete JSON string literal (unrolled loop, no backtracking)
+_JSON_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
@@ -0,0 +1,194 @@
+"""
+Session Pool
+
+Keeps a small pool of pre-initialized AmplifierSessions so that creating a
+design exploration session does not pay for module download and mounting.
+"""
+
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, Tuple
+from collections import deque
+import asyncio
+import os
+import time
+import uuid
+
+
+# Factory signature: session_id -> initialized AmplifierSession
+SessionFactory = Callable[[str], Awaitable[Any]]
+
+
+class SessionPool:
+    """Pool of pre-warmed AmplifierSessions, refilled in the background"""
+
+    def __init__(
+        self,
+        factory: SessionFactory,
+        min_size: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+    ):
+        """
+        Args:
+            factory: Coroutine that builds an initialized session for an id
+            min_size: Idle sessions to keep ready (env EMBODY_POOL_MIN_SIZE, default 2)
+            idle_ttl: Seconds before an idle session is recycled (env EMBODY_POOL_IDLE_TTL, default 1800)
+        """
+        self.factory = factory
+        self.min_size = min_size if min_size is not None else int(os.getenv("EMBODY_POOL_MIN_SIZE", "2"))
+        self.idle_ttl = idle_ttl if idle_ttl is not None else float(os.getenv("EMBODY_POOL_IDLE_TTL", "1800"))
+
+        # (session_id, session, idle_since)
+        self._idle: Deque[Tuple[str, Any, float]] = deque()
+        self._pending: Set[asyncio.Task] = set()
+        self._recycler: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self._stats = {
+            "checkouts": 0,
+            "warm_checkouts": 0,
+            "cold_checkouts": 0,
+            "created": 0,
+            "create_failures": 0,
+            "recycled": 0,
+            "last_wait_ms": 0.0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+        }
+
+    async def start(self) -> None:
+        """Start background fill and idle recycling"""
+        self._closed = False
+        self._schedule_refill()
+        if self._recycler is None and self.idle_ttl > 0:
+            self._recycler = asyncio.create_task(self._recycle_loop())
+
+    async def acquire(self) -> Tuple[str, Any]:
+        """
+        Check out an initialized session
+
+        Prefers an idle pre-warmed session, then waits for an in-flight one,
+        and only builds a session inline when nothing is warming.
+
+        Returns:
+            (session_id, AmplifierSession)
+
+        Raises:
+            Exception: Whatever the factory raises when an inline build fails
+        """
+        start = time.perf_counter()
+        warm = True
+
+        while True:
+            if self._idle:
+                session_id, session, _ = self._idle.popleft()
+                break
+            if self._pending:
+                await asyncio.wait(set(self._pending), return_when=asyncio.FIRST_COMPLETED)
+                continue
+            warm = False
+            session_id = str(uuid.uuid4())
+            session = await self.factory(session_id)
+            self._stats["created"] += 1
+            break
+
+        wait_ms = (time.perf_counter() - start) * 1000
+        self._stats["checkouts"] += 1
+        self._stats["warm_checkouts" if warm else "cold_checkouts"] += 1
+        self._stats["last_wait_ms"] = round(wait_ms, 2)
+        self._stats["total_wait_ms"] += wait_ms
+        self._stats["max_wait_ms"] = round(max(self._stats["max_wait_ms"], wait_ms), 2)
+
+        # Top up for the next caller
+        self._schedule_refill()
+
+        return session_id, session
+
+    async def close(self) -> None:
+        """Stop background work and clean up idle sessions"""
+        self._closed = True
+
+        if self._recycler is not None:
+            self._recycler.cancel()
+            self._recycler = None
+
+        for task in list(self._pending):
+            task.cancel()
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+        while self._idle:
+            _, session, _ = self._idle.popleft()
+            await _cleanup(session)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool counters
+
+        Returns:
+            Checkout/creation counters, wait times (ms) and current sizes
+        """
+        checkouts = self._stats["checkouts"]
+        return {
+            **self._stats,
+            "total_wait_ms": round(self._stats["total_wait_ms"], 2),
+            "avg_wait_ms": round(self._stats["total_wait_ms"] / checkouts, 2) if checkouts else 0.0,
+            "idle": len(self._idle),
+            "warming": len(self._pending),
+            "min_size": self.min_size,
+        }
+
+    def _schedule_refill(self) -> None:
+        """Start background builds until min_size sessions are idle or warming"""
+        if self._closed:
+            return
+
+        available = len(self._idle) + len(self._pending)
+        for _ in range(max(self.min_size - available, 0)):
+            task = asyncio.create_task(self._warm_one())
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _warm_one(self) -> None:
+        """Build one session and park it in the idle queue"""
+        session_id = str(uuid.uuid4())
+        try:
+            session = await self.factory(session_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Non-blocking - acquire() falls back to an inline build
+            self._stats["create_failures"] += 1
+            print(f"Warning: Failed to pre-warm session: {e}")
+            return
+
+        self._stats["created"] += 1
+
+        if self._closed:
+            await _cleanup(session)
+            return
+
+        self._idle.append((session_id, session, time.monotonic()))
+
+    async def _recycle_loop(self) -> None:
+        """Periodically replace sessions that sat idle longer than idle_ttl"""
+        interval = max(self.idle_ttl / 2, 1.0)
+        while not self._closed:
+            await asyncio.sleep(interval)
+
+            cutoff = time.monotonic() - self.idle_ttl
+            stale = [entry for entry in self._idle if entry[2] < cutoff]
+            for entry in stale:
+                self._idle.remove(entry)
+            for entry in stale:
+                self._stats["recycled"] += 1
+                await _cleanup(entry[1])
+
+            if stale:
+                self._schedule_refill()
+
+
+async def _cleanup(session: Any) -> None:
+    """Clean up a session, logging instead of raising"""
+    try:
+        await session.cleanup()
+    except Exception as e:
+        print(f"Warning: Session cleanup failed: {e}")
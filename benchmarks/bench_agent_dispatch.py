@@ -0,0 +1,160 @@
+"""
+Benchmark: agent call latency, "task" vs "direct" dispatch
+
+Runs SessionManager.execute_agent and stream_agent against a fake
+provider in which every model turn sleeps for a fixed time and child
+session initialization costs a fixed setup time. In "task" mode the
+orchestrator spends one turn deciding to call the task tool, the agent
+runs in a spawned child (one turn), and the orchestrator spends another
+turn relaying the result; "direct" mode runs the child straight away.
+Transcripts left under .embody/sessions/<id>/agents are counted too (only
+task-tool children are resumable, so only they are saved).
+
+The fake replaces the amplifier package for this process only and runs
+in a temporary directory.
+
+Usage:
+    python benchmarks/bench_agent_dispatch.py [--turn-ms 300] [--init-ms 20] [--calls 5]
+"""
+
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import types
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+AGENT = "embody-collection:concept-generator"
+
+
+def install_fake_amplifier(turn_s, init_s):
+    """Register a fake amplifier package whose model turns take turn_s"""
+
+    class Hooks:
+        def register(self, *args, **kwargs):
+            return lambda: None
+
+    class Context:
+        def __init__(self):
+            self.messages = []
+
+        async def add_message(self, message):
+            self.messages.append(message)
+
+        async def get_messages(self):
+            return list(self.messages)
+
+    class Coordinator:
+        def __init__(self):
+            self.capabilities = {}
+            self.mounts = {"context": Context()}
+            self.hooks = Hooks()
+
+        def register_capability(self, name, value):
+            self.capabilities[name] = value
+
+        async def mount(self, name, value):
+            self.mounts[name] = value
+
+        def get(self, name):
+            return self.mounts.get(name)
+
+    class Result:
+        def __init__(self, content):
+            self.content = content
+
+    class FakeSession:
+        def __init__(self, config=None, session_id=None, parent_id=None):
+            self.config = config
+            self.session_id = session_id
+            self.coordinator = Coordinator()
+
+        async def initialize(self):
+            await asyncio.sleep(init_s)
+
+        async def execute(self, prompt):
+            context = self.coordinator.get("context")
+            await context.add_message({"role": "user", "content": prompt})
+            if prompt.lstrip().startswith("Use the task tool"):
+                # Orchestrator turn that calls the task tool, then the one relaying its result
+                await asyncio.sleep(turn_s)
+                agent = prompt.split("Agent: ")[1].split("\n")[0]
+                task = prompt.split("Task:\n")[1]
+                spawned = await self.coordinator.capabilities["session.spawn"](
+                    agent_name=agent, instruction=task, parent_session=self
+                )
+                await asyncio.sleep(turn_s)
+                content = spawned["output"]
+            else:
+                await asyncio.sleep(turn_s)
+                content = '{"concepts": []}'
+            await context.add_message({"role": "assistant", "content": content})
+            return Result(content)
+
+        async def cleanup(self):
+            pass
+
+    modules = {
+        "amplifier": {},
+        "amplifier.session": {"AmplifierSession": FakeSession},
+        "amplifier.module_resolution": {"StandardModuleSourceResolver": lambda **kwargs: object()},
+        "amplifier.hooks": {"HookResult": lambda **kwargs: None},
+    }
+    for name, attributes in modules.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        sys.modules[name] = module
+    return FakeSession
+
+
+async def run_mode(mode, fake_session, calls):
+    """Average ms per agent call and transcripts saved, for one dispatch mode"""
+    os.environ["EMBODY_AGENT_DISPATCH"] = mode
+    from backend.session_manager import SessionManager
+
+    manager = SessionManager(Path(".embody/sessions"))
+    session_id = f"bench-{mode}"
+    parent = fake_session(config={"agents": {AGENT: {}}, "tools": [{"module": "tool-task"}]}, session_id=session_id)
+    parent.coordinator.register_capability("session.spawn", manager._spawn_sub_session)
+    parent.coordinator.register_capability("session.resume", manager._resume_sub_session)
+    manager.active_sessions[session_id] = parent
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        await manager.execute_agent(session_id, AGENT, "Generate concepts")
+    async for _ in manager.stream_agent(session_id, AGENT, "Generate concepts"):
+        pass
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    agents_dir = Path(".embody/sessions") / session_id / "agents"
+    saved = len(list(agents_dir.glob("*.json"))) if agents_dir.exists() else 0
+    return wall_ms / (calls + 1), manager.get_stats()["dispatch"], saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turn-ms", type=float, default=300)
+    parser.add_argument("--init-ms", type=float, default=20)
+    parser.add_argument("--calls", type=int, default=5)
+    args = parser.parse_args()
+
+    fake_session = install_fake_amplifier(args.turn_ms / 1000, args.init_ms / 1000)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        for mode in ("task", "direct"):
+            per_call_ms, dispatch, saved = asyncio.run(run_mode(mode, fake_session, args.calls))
+            print(
+                f"{mode:6}  {per_call_ms:7.0f} ms per call   "
+                f"sub-sessions {dispatch['sub_sessions']}   "
+                f"avg setup {dispatch['avg_sub_session_setup_ms']:.1f} ms   "
+                f"transcripts saved {saved}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Benchmark: refine prompt size, full concept copies vs shared base + deltas
+
+Replays every refinement round of multi-round sessions and measures the
+"Previous Concepts" payload both ways: the full concept list the refine
+prompt used to carry, and concept_payload() (shared base, per-concept
+deltas, round-to-round changes). Each round's deltas are also checked to
+reconstruct every concept exactly.
+
+Sessions are read from the recorded session state in .embody/sessions
+(run from the directory holding .embody). When none are recorded, or with
+--synthetic, generated sessions are used instead: concepts shaped like the
+concept-generator's output, each round mutating liked concepts.
+
+Usage:
+    python benchmarks/bench_concept_payload.py [--synthetic 20] [--rounds 10] [--budget 4000]
+"""
+
+from collections import defaultdict
+from pathlib import Path
+import argparse
+import random
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.concept_diff import concept_payload, diff_concepts, flatten_concept  # noqa: E402
+from backend.foundation import load_session_state  # noqa: E402
+from backend.prompt_serializer import serialize_for_prompt  # noqa: E402
+
+
+SESSIONS_DIR = Path(".embody/sessions")
+
+QUALITIES = ("calm", "bold", "playful", "editorial", "technical", "warm", "minimal", "dense", "airy")
+FONTS = ("Inter", "IBM Plex Sans", "Source Serif", "Space Grotesk", "Fraunces", "JetBrains Mono")
+
+
+def recorded_sessions():
+    """Iterations of every recorded session with at least two rounds"""
+    sessions = []
+    for state_file in sorted(SESSIONS_DIR.glob("*/state.json")):
+        try:
+            state = load_session_state(state_file.parent.name)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Skipping session {state_file.parent.name}: {e}")
+            continue
+        iterations = [iteration for iteration in state.get("iterations", []) if iteration.get("concepts")]
+        if len(iterations) >= 2:
+            sessions.append(iterations)
+    return sessions
+
+
+def synthetic_concept(rng, concept_id):
+    """A concept shaped like the concept-generator's output"""
+    hue = rng.randrange(360)
+    return {
+        "id": concept_id,
+        "name": f"Concept {concept_id}",
+        "description": f"A {rng.choice(QUALITIES)} direction built around hue {hue}.",
+        "qualities": rng.sample(QUALITIES, 3),
+        "tokens": {
+            "colors": {
+                name: f"hsl({(hue + offset) % 360} {rng.randrange(20, 90)}% {lightness}%)"
+                for name, offset, lightness in (
+                    ("primary", 0, 45), ("secondary", 30, 55), ("accent", 180, 50),
+                    ("surface", 0, 98), ("text", 0, 12), ("muted", 0, 60),
+                )
+            },
+            "typography": {
+                "heading": {"family": rng.choice(FONTS), "weight": rng.choice((600, 700, 800))},
+                "body": {"family": rng.choice(FONTS), "size": "1rem", "lineHeight": rng.choice(("1.5", "1.6"))},
+            },
+            "spacing": {"unit": "4px", "scale": [4, 8, 12, 16, 24, 32, 48]},
+            "effects": {"radius": rng.choice(("4px", "8px", "12px")), "shadow": "0 1px 3px rgb(0 0 0 / 0.1)"},
+        },
+        "rationale": "Balances the requested energy with readable, accessible defaults.",
+        "accessibility": {"contrast": "7.2:1", "wcag": "AAA"},
+    }
+
+
+def mutate(rng, concept, concept_id):
+    """A refined variant of a concept: a few token paths changed"""
+    variant = {**concept, "id": concept_id, "name": f"Concept {concept_id}"}
+    tokens = variant["tokens"] = {key: dict(value) for key, value in concept["tokens"].items()}
+    for _ in range(rng.randint(1, 4)):
+        category = rng.choice(("colors", "effects", "typography"))
+        key = rng.choice(sorted(tokens[category]))
+        tokens[category][key] = synthetic_concept(rng, concept_id)["tokens"][category][key]
+    return variant
+
+
+def synthetic_sessions(count, rounds, seed=0):
+    """Iterations of `count` generated sessions with `rounds` rounds each"""
+    rng = random.Random(seed)
+    sessions = []
+    for session in range(count):
+        concepts = [synthetic_concept(rng, f"s{session}-r1-c{i}") for i in range(rng.randint(3, 4))]
+        iterations = [{"round": 1, "concepts": concepts}]
+        for number in range(2, rounds + 1):
+            liked = rng.sample(concepts, min(2, len(concepts)))
+            concepts = [
+                mutate(rng, rng.choice(liked), f"s{session}-r{number}-c{i}")
+                for i in range(rng.randint(2, 3))
+            ]
+            iterations.append({"round": number, "concepts": concepts})
+        sessions.append(iterations)
+    return sessions
+
+
+def check_reconstruction(concepts):
+    """Every concept equals the shared base plus its delta"""
+    concept_diff = diff_concepts(concepts)
+    base = concept_diff["base"]
+    for concept, delta in zip(concepts, concept_diff["concepts"]):
+        rebuilt = {path: value for path, value in base.items() if path not in delta.get("unset", ())}
+        rebuilt.update(delta["set"])
+        expected = {path: value for path, value in flatten_concept(concept).items() if path != "id"}
+        assert rebuilt == expected, f"delta for concept {delta['id']} doesn't reconstruct it"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--synthetic", type=int, default=0, help="use N generated sessions")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--budget", type=int, default=None, help="prompt token budget (default EMBODY_PROMPT_TOKEN_BUDGET)")
+    args = parser.parse_args()
+
+    sessions = [] if args.synthetic else recorded_sessions()
+    source = f"{len(sessions)} recorded sessions"
+    if not sessions:
+        sessions = synthetic_sessions(args.synthetic or 20, args.rounds)
+        source = f"{len(sessions)} synthetic sessions"
+
+    # Refine round number -> [(full chars, delta chars)]
+    sizes = defaultdict(list)
+    for iterations in sessions:
+        for index in range(len(iterations)):
+            concepts = iterations[index]["concepts"]
+            previous = iterations[index - 1]["concepts"] if index else None
+            check_reconstruction(concepts)
+            full = serialize_for_prompt(concepts, budget_tokens=args.budget)
+            delta = serialize_for_prompt(
+                concept_payload(concepts, previous),
+                budget_tokens=args.budget,
+                priorities=("concepts", "shared")
+            )
+            sizes[index + 2].append((len(full), len(delta)))
+
+    print(f"{source}; payload chars per refine round (mean):")
+    total_full = total_delta = 0
+    for number in sorted(sizes):
+        full = sum(size[0] for size in sizes[number])
+        delta = sum(size[1] for size in sizes[number])
+        total_full += full
+        total_delta += delta
+        count = len(sizes[number])
+        print(
+            f"  round {number:3}  full {full / count:8.0f}  delta {delta / count:8.0f}  "
+            f"({100 * (1 - delta / full):5.1f}% smaller, {count} sessions)"
+        )
+    print(f"  all rounds: {total_full} -> {total_delta} chars ({100 * (1 - total_delta / total_full):.1f}% smaller)")
+
+
+if __name__ == "__main__":
+    main()
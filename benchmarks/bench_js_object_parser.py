@@ -0,0 +1,117 @@
+"""
+Benchmark: Tailwind config extraction with the object-literal parser
+
+Generates Tailwind configs of increasing size (nested palettes, font
+stacks with spreads, spacing scales, theme.extend) and times
+_extract_from_js_config against the per-key regex extraction it replaced.
+The regex version is fast but stops at the first nested brace, so the
+number of leaf tokens each approach recovers is reported too.
+
+Usage:
+    python benchmarks/bench_js_object_parser.py [--palettes 100,1000,5000] [--repeat 3]
+"""
+
+from pathlib import Path
+import argparse
+import re
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.foundation.token_extractor import _extract_from_js_config  # noqa: E402
+
+
+SHADES = (50, 100, 200, 300, 400, 500, 600, 700, 800, 900)
+
+
+def regex_extract(content):
+    """_extract_from_js_config as it was before the parser (baseline)"""
+    tokens = {"colors": {}, "typography": {}, "spacing": {}}
+    for key, category in (("colors", "colors"), ("fontSize", "typography"), ("spacing", "spacing")):
+        block = re.search(rf'{key}:\s*\{{([^}}]+)\}}', content, re.DOTALL)
+        if block:
+            tokens[category]["_raw"] = block.group(1).strip()
+    return tokens
+
+
+def generate_config(palettes):
+    """A tailwind.config.js with `palettes` nested color palettes"""
+    colors = ",\n".join(
+        f"      c{p}: {{ " + ", ".join(f"{s}: '#{(p * 7919 + s) % 0xFFFFFF:06x}'" for s in SHADES) + " }"
+        for p in range(palettes)
+    )
+    spacing = ",\n".join(f"      {i}: '{i * 0.25}rem'" for i in range(max(palettes // 10, 10)))
+    return f"""
+const defaultTheme = require('tailwindcss/defaultTheme')
+
+/** @type {{import('tailwindcss').Config}} */
+module.exports = {{
+  content: ['./src/**/*.{{js,ts,jsx,tsx}}'],
+  theme: {{
+    colors: {{
+      transparent: 'transparent',
+{colors},
+    }},
+    fontFamily: {{
+      sans: ['Inter', ...defaultTheme.fontFamily.sans],
+      mono: ['JetBrains Mono', ...defaultTheme.fontFamily.mono],
+    }},
+    fontSize: {{
+      sm: ['0.875rem', {{ lineHeight: '1.25rem' }}], // nested options
+      base: ['1rem', {{ lineHeight: '1.5rem' }}],
+    }},
+    extend: {{
+      spacing: {{
+        ...defaultTheme.spacing,
+{spacing},
+      }},
+      boxShadow: {{ card: '0 1px 3px rgb(0 0 0 / 0.1)' }},
+    }},
+  }},
+  plugins: [require('@tailwindcss/forms')],
+}}
+"""
+
+
+def count_leaves(node):
+    """Number of scalar values in a nested structure"""
+    if isinstance(node, dict):
+        return sum(count_leaves(value) for value in node.values())
+    if isinstance(node, list):
+        return sum(count_leaves(value) for value in node)
+    return 1
+
+
+def best_of(func, content, repeat):
+    """Best wall time in ms and the last result"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(content)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--palettes", default="100,1000,5000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for palettes in (int(p) for p in args.palettes.split(",")):
+        content = generate_config(palettes)
+        regex_ms, regex_tokens = best_of(regex_extract, content, args.repeat)
+        parser_ms, parser_tokens = best_of(_extract_from_js_config, content, args.repeat)
+        print(
+            f"{len(content) / 1024:8.0f} KB  "
+            f"regex {regex_ms:8.2f} ms {count_leaves(regex_tokens):6} tokens   "
+            f"parser {parser_ms:8.2f} ms {count_leaves(parser_tokens):6} tokens   "
+            f"({parser_ms * 1024 / len(content):.3f} ms/KB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
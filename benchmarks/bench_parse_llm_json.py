@@ -0,0 +1,105 @@
+"""
+Benchmark: parse_llm_json vs the previous greedy-regex fallback
+
+Builds finalize-style LLM responses (prose around a large JSON document,
+no code fence) and times the balanced-brace scanner against the regex it
+replaced. Also times pathological unbalanced input, where the greedy regex
+backtracks quadratically.
+
+Usage:
+    python benchmarks/bench_parse_llm_json.py [--sizes 100,400,800] [--repeat 5]
+"""
+
+from pathlib import Path
+import argparse
+import json
+import re
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.session_manager import parse_llm_json  # noqa: E402
+
+
+def greedy_parse_llm_json(content):
+    """parse_llm_json as it was before the scanner (baseline)"""
+    json_block_match = re.search(r'```(?:json)?\n(.*?)\n```', content, re.DOTALL)
+    if json_block_match:
+        json_str = json_block_match.group(1)
+    else:
+        json_match = re.search(r'(\{.*\}|\[.*\])', content, re.DOTALL)
+        json_str = json_match.group(1) if json_match else content
+    try:
+        return json.loads(json_str)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Failed to parse JSON from LLM response: {e}")
+
+
+def finalize_response(size_kb, prose_braces=False):
+    """Prose + a documentation JSON payload of roughly size_kb kilobytes"""
+    sections = []
+    i = 0
+    while len(json.dumps(sections)) < size_kb * 1024:
+        sections.append({
+            "id": f"section-{i}",
+            "title": f"Token group {i}",
+            "body": "Use {primary} for emphasis; avoid [legacy] values. " * 8,
+            "tokens": {f"color-{i}-{j}": f"#{(i * 31 + j) % 0xFFFFFF:06x}" for j in range(12)},
+        })
+        i += 1
+    payload = json.dumps({"documentation": {"sections": sections}}, indent=2)
+    intro = "Here is the final documentation"
+    outro = "Let me know if anything should change."
+    if prose_braces:
+        intro += " (variables look like {name}; see [notes])"
+        outro = "Let me know if {anything} should change."
+    return f"{intro}:\n\n{payload}\n\n{outro}"
+
+
+def unbalanced_response(size_kb):
+    """Many stray openers and no closers"""
+    return "Options: {" + " { maybe [" * (size_kb * 1024 // 10)
+
+
+def time_call(func, content, repeat):
+    """Best-of-repeat wall time in ms, and whether the call failed"""
+    best = None
+    failed = False
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            func(content)
+        except ValueError:
+            failed = True
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, failed
+
+
+def report(label, content, repeat):
+    """Print one comparison row"""
+    cells = []
+    for func in (greedy_parse_llm_json, parse_llm_json):
+        elapsed, failed = time_call(func, content, repeat)
+        cells.append(f"{elapsed:9.2f} ms {'(fails)' if failed else '       '}")
+    print(f"{label:34} {len(content) / 1024:8.0f} KB   greedy {cells[0]}   scanner {cells[1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="100,400,800", help="Response sizes in KB")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        report("finalize response", finalize_response(size), args.repeat)
+        report("finalize response, prose braces", finalize_response(size, prose_braces=True), args.repeat)
+
+    # The greedy regex is quadratic here - keep it small
+    for size in (5, 10, 20):
+        report("unbalanced openers", unbalanced_response(size), 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark: fitting large payloads into the prompt budget
+
+Generates token payloads with increasing numbers of leaves (palettes,
+type scales, themes) and times serialize_for_prompt against the fitting
+loop it replaced, which re-serialized the whole payload after every
+shrink and every candidate container while searching for the largest.
+Both must produce the same text.
+
+Usage:
+    python benchmarks/bench_prompt_serializer.py [--leaves 1000,10000,40000] [--budget 4000] [--repeat 3]
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend import prompt_serializer  # noqa: E402
+from backend.prompt_serializer import (  # noqa: E402
+    TOKEN_PRIORITIES,
+    _dumps,
+    _halve,
+    _is_list_marker,
+    _TRUNCATION_MARKER,
+    serialize_for_prompt,
+)
+
+
+def baseline_fit(value, size, max_chars, priorities):
+    """_fit as it was before sizes were indexed (baseline)"""
+    if len(_dumps(value)) <= max_chars:
+        return value
+
+    if not isinstance(value, dict):
+        while len(_dumps(value)) > max_chars and baseline_shrink(value):
+            pass
+        return value
+
+    rank = {key: index for index, key in enumerate(priorities)}
+    order = sorted(value, key=lambda key: (-rank.get(key, len(rank)), key))
+
+    for key in order:
+        while len(_dumps(value)) > max_chars and baseline_shrink(value[key]):
+            pass
+        if len(_dumps(value)) <= max_chars:
+            break
+        value[key] = _TRUNCATION_MARKER
+
+    return value
+
+
+def baseline_shrink(value):
+    """Halve the largest container, found by serializing every candidate"""
+    best = (0, None)
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            children = [item for key, item in node.items() if key != _TRUNCATION_MARKER]
+        elif isinstance(node, list):
+            children = [item for item in node if not _is_list_marker(item)]
+        else:
+            continue
+        if len(children) > 1:
+            size = len(_dumps(node))
+            if size > best[0]:
+                best = (size, node)
+        stack.extend(children)
+
+    if best[1] is None:
+        return False
+    _halve(best[1])
+    return True
+
+
+def generate_tokens(leaves):
+    """A token payload with roughly `leaves` scalar values"""
+    palettes = max(leaves // 12, 1)
+    colors = {
+        f"palette-{p}": {str(shade): f"#{(p * 7919 + shade) % 0xFFFFFF:06x}" for shade in range(50, 1000, 100)}
+        for p in range(palettes)
+    }
+    return {
+        "colors": colors,
+        "typography": {f"size-{i}": {"fontSize": f"{i / 8:.3f}rem", "lineHeight": "1.5"} for i in range(palettes // 4 + 1)},
+        "spacing": {str(i): f"{i * 4}px" for i in range(palettes // 4 + 1)},
+        "themes": {
+            f"[data-theme=t{t}]": {"colors": {f"surface-{i}": f"var(--palette-{i}-500)" for i in range(palettes // 8 + 1)}}
+            for t in range(4)
+        },
+        "source_files": ["tokens.json"],
+    }
+
+
+def count_leaves(node):
+    """Number of scalar values in a nested structure"""
+    if isinstance(node, dict):
+        return sum(count_leaves(value) for value in node.values())
+    if isinstance(node, list):
+        return sum(count_leaves(value) for value in node)
+    return 1
+
+
+def best_of(func, repeat):
+    """Best wall time in ms and the last result"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leaves", default="1000,10000,40000")
+    parser.add_argument("--budget", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    indexed_fit = prompt_serializer._fit
+
+    def run(fit, tokens):
+        prompt_serializer._fit = fit
+        try:
+            return serialize_for_prompt(tokens, budget_tokens=args.budget, priorities=TOKEN_PRIORITIES)
+        finally:
+            prompt_serializer._fit = indexed_fit
+
+    for leaves in (int(n) for n in args.leaves.split(",")):
+        tokens = generate_tokens(leaves)
+        baseline_ms, baseline_text = best_of(lambda: run(baseline_fit, tokens), args.repeat)
+        indexed_ms, indexed_text = best_of(lambda: run(indexed_fit, tokens), args.repeat)
+        assert indexed_text == baseline_text, "fitting changed the serialized output"
+        print(
+            f"{count_leaves(tokens):7} leaves  {len(_dumps(tokens)) / 1024:7.0f} KB -> {len(indexed_text):6} chars   "
+            f"baseline {baseline_ms:9.1f} ms   indexed {indexed_ms:8.1f} ms   ({baseline_ms / indexed_ms:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
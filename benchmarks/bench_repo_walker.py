@@ -0,0 +1,121 @@
+"""
+Benchmark: single-pass token file discovery vs the previous glob approach
+
+Generates a synthetic monorepo (packages with source trees, plus
+node_modules, dist and .next output making up about a third of the files)
+and times walk_token_files against the twelve repo_path.glob patterns it
+replaced.
+
+Usage:
+    python benchmarks/bench_repo_walker.py [--files 200000] [--repeat 3] [--keep DIR]
+"""
+
+from pathlib import Path
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.foundation.repo_walker import walk_token_files  # noqa: E402
+
+
+GLOB_PATTERNS = [
+    "tokens.json",
+    "design-tokens.json",
+    "**/tokens.json",
+    "**/design-tokens.json",
+    "tailwind.config.js",
+    "tailwind.config.ts",
+    "**/tailwind.config.js",
+    "**/tailwind.config.ts",
+    "**/*.tokens.json",
+    "variables.css",
+    "**/variables.css",
+    "**/:root.css",
+]
+
+
+def glob_token_files(repo_path):
+    """Discovery as it was before the walker (baseline, without the 10-file cap)"""
+    token_files = []
+    for pattern in GLOB_PATTERNS:
+        token_files.extend(repo_path.glob(pattern))
+    seen = set()
+    unique_files = []
+    for f in token_files:
+        if f not in seen and f.is_file():
+            seen.add(f)
+            unique_files.append(f)
+    return unique_files
+
+
+def generate_monorepo(root, total_files):
+    """Write a monorepo of about total_files empty files; returns the count written"""
+    files_per_dir = 25
+    written = 0
+    package = 0
+    while written < total_files:
+        pkg = root / "packages" / f"pkg-{package:04}"
+        dirs = [pkg / "src" / "components" / f"c{i}" for i in range(4)]
+        dirs += [pkg / "node_modules" / f"dep-{i}" / "lib" for i in range(2)]
+        dirs += [pkg / "dist" / "assets", pkg / ".next" / "cache"]
+        for directory in dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            for i in range(files_per_dir):
+                (directory / f"file-{i}.js").touch()
+            written += files_per_dir
+        (pkg / "tailwind.config.js").touch()
+        (pkg / "src" / "styles").mkdir(exist_ok=True)
+        (pkg / "src" / "styles" / "variables.css").touch()
+        (pkg / "node_modules" / "dep-0" / "tokens.json").touch()
+        written += 3
+        package += 1
+    (root / "tokens.json").touch()
+    return written + 1
+
+
+def best_of(func, repeat):
+    """Best wall time in ms and the last result"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keep", help="Generate into (and keep) this directory")
+    args = parser.parse_args()
+
+    root = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix="embody-walker-"))
+    try:
+        start = time.perf_counter()
+        if not (root / "packages").exists():
+            count = generate_monorepo(root, args.files)
+            print(f"generated {count} files in {time.perf_counter() - start:.1f}s at {root}")
+
+        glob_ms, glob_files = best_of(lambda: glob_token_files(root), args.repeat)
+        walk_ms, walk_result = best_of(
+            lambda: walk_token_files(root, max_entries=10 * args.files), args.repeat
+        )
+
+        print(f"glob (12 patterns):  {glob_ms:9.1f} ms  {len(glob_files)} files (includes node_modules)")
+        print(f"walk_token_files:    {walk_ms:9.1f} ms  {len(walk_result['files'])} files, "
+              f"{walk_result['entries_scanned']} entries scanned")
+        print(f"speedup: {glob_ms / walk_ms:.1f}x")
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
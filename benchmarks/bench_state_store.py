@@ -0,0 +1,162 @@
+"""
+Benchmark: session state throughput across worker processes
+
+Starts 1..N worker processes, each with its own SessionManager on the
+same state store, and has every worker apply --updates state updates
+(one journal append each, plus a read) round-robin over the sessions.
+Sessions are either shared by all workers (every update races the other
+workers' writes) or partitioned (each worker owns its sessions, so only
+CPU and the store are shared). Afterwards every session is reloaded and
+checked for lost or duplicated appends.
+
+Also times state cache hits in one process with revision checks on and
+off, which is the per-request cost EMBODY_STATE_REVISION_CHECK controls.
+
+Runs in a temporary directory.
+
+Usage:
+    python benchmarks/bench_state_store.py [--backends file,sqlite] [--workers 1,2,4]
+        [--updates 200] [--sessions 4] [--hits 2000]
+"""
+
+from pathlib import Path
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def worker(backend, worker_id, session_ids, updates, start, results):
+    """Apply updates round-robin over session_ids and report counters"""
+    os.environ.update(
+        EMBODY_STATE_BACKEND=backend,
+        EMBODY_POOL_MIN_SIZE="0",
+        EMBODY_STATE_REVISION_CHECK="true",
+    )
+    from backend.session_manager import SessionManager
+    from backend.response_cache import OfflineSession
+
+    async def run():
+        manager = SessionManager(Path(".embody/sessions"))
+
+        async def build_session(session_id):
+            return OfflineSession(session_id)
+
+        manager._build_session = build_session
+
+        # Imports and setup stay out of the timed window
+        start.wait()
+        started = time.perf_counter()
+        for index in range(updates):
+            session_id = session_ids[index % len(session_ids)]
+            await manager.get_session(session_id)
+            await manager.update_session_state(
+                session_id,
+                {"phase": f"worker-{worker_id}"},
+                appends={"iterations": {"worker": worker_id, "index": index}}
+            )
+            await manager.get_session_state(session_id, readonly=True)
+        elapsed = time.perf_counter() - started
+
+        state_stats = manager.get_stats()["state_cache"]
+        results.put((elapsed, state_stats["conflicts"], state_stats["refreshes"], state_stats["stale_reloads"]))
+        await manager.shutdown()
+
+    asyncio.run(run())
+
+
+def run_load(backend, workers, updates, sessions, partitioned):
+    """One load run; returns a result line"""
+    from backend.foundation import create_state_store
+
+    label = "partitioned" if partitioned else "shared"
+    all_ids = [f"{backend}-{label}-{workers}-{k}" for k in range(sessions * (workers if partitioned else 1))]
+    store = create_state_store(backend)
+    for session_id in all_ids:
+        store.save(session_id, {"session_id": session_id, "iterations": []})
+    store.close()
+
+    results = multiprocessing.Queue()
+    start = multiprocessing.Barrier(workers + 1)
+    processes = [
+        multiprocessing.Process(
+            target=worker,
+            args=(backend, w, all_ids[w * sessions:(w + 1) * sessions] if partitioned else all_ids, updates, start, results)
+        )
+        for w in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    start.wait(timeout=60)
+    started = time.perf_counter()
+    reports = [results.get(timeout=300) for _ in processes]
+    wall = time.perf_counter() - started
+    for process in processes:
+        process.join()
+
+    store = create_state_store(backend)
+    persisted = 0
+    for session_id in all_ids:
+        state, _ = store.load(session_id)
+        appended = {(item["worker"], item["index"]) for item in state["iterations"]}
+        assert len(appended) == len(state["iterations"]), f"duplicated appends in {session_id}"
+        persisted += len(appended)
+    store.close()
+    assert persisted == workers * updates, f"{workers * updates - persisted} updates lost"
+
+    return (
+        f"{backend:6} {label:11} workers={workers}  {workers * updates / wall:6.0f} ops/s  "
+        f"conflicts={sum(r[1] for r in reports):4}  refreshes={sum(r[2] for r in reports):4}  "
+        f"stale_reloads={sum(r[3] for r in reports):4}"
+    )
+
+
+def time_cache_hits(backend, hits):
+    """Mean µs per cached get_session_state with revision checks on and off"""
+    os.environ["EMBODY_STATE_BACKEND"] = backend
+    from backend.session_manager import SessionManager
+
+    async def run(check):
+        os.environ["EMBODY_STATE_REVISION_CHECK"] = check
+        manager = SessionManager(Path(".embody/sessions"))
+        session_id = f"hits-{backend}-{check}"
+        manager.state_store.save(session_id, {"session_id": session_id, "iterations": []})
+        await manager.get_session_state(session_id, readonly=True)
+        started = time.perf_counter()
+        for _ in range(hits):
+            await manager.get_session_state(session_id, readonly=True)
+        elapsed = time.perf_counter() - started
+        await manager.shutdown()
+        return elapsed / hits * 1e6
+
+    on = asyncio.run(run("true"))
+    off = asyncio.run(run("false"))
+    return f"{backend:6} cache hit: {on:7.1f} µs with revision checks, {off:5.1f} µs without"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backends", default="file,sqlite")
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--updates", type=int, default=200, help="updates per worker")
+    parser.add_argument("--sessions", type=int, default=4, help="sessions (per worker when partitioned)")
+    parser.add_argument("--hits", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPU(s)")
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        for backend in args.backends.split(","):
+            print(time_cache_hits(backend, args.hits))
+            for partitioned in (False, True):
+                for workers in (int(w) for w in args.workers.split(",")):
+                    print(run_load(backend, workers, args.updates, args.sessions, partitioned))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""Shared test fixtures"""
+
+import pytest
+
+from backend.foundation import state_persistence
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in an empty directory, so .embody/ state and caches stay out of the repo"""
+    monkeypatch.chdir(tmp_path)
+    # Session directories are remembered by relative path once created
+    monkeypatch.setattr(state_persistence, "_known_dirs", set())
+    return tmp_path
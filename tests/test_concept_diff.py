@@ -0,0 +1,104 @@
+"""Tests for concept base/delta diffs"""
+
+import pytest
+
+from backend.concept_diff import (
+    concept_payload,
+    diff_concepts,
+    diff_rounds,
+    flatten_concept,
+    nest_paths,
+)
+
+
+CONCEPTS = [
+    {"id": "a", "name": "Calm", "tokens": {"colors": {"primary": "#123", "surface": "#fff"}, "radius": "4px"}},
+    {"id": "b", "name": "Bold", "tokens": {"colors": {"primary": "#f00", "surface": "#fff"}, "radius": "4px"}},
+    {"id": "c", "name": "Calm", "tokens": {"colors": {"primary": "#123", "surface": "#eee"}}},
+]
+
+
+def _rebuild(base, delta):
+    flat = {path: value for path, value in base.items() if path not in delta.get("unset", ())}
+    flat.update(delta["set"])
+    return flat
+
+
+def test_deltas_reconstruct_every_concept():
+    concept_diff = diff_concepts(CONCEPTS)
+
+    assert concept_diff["base"] == {
+        "name": "Calm",
+        "tokens.colors.primary": "#123",
+        "tokens.colors.surface": "#fff",
+        "tokens.radius": "4px",
+    }
+    for concept, delta in zip(CONCEPTS, concept_diff["concepts"]):
+        expected = {path: value for path, value in flatten_concept(concept).items() if path != "id"}
+        assert _rebuild(concept_diff["base"], delta) == expected
+
+
+def test_id_is_not_repeated_in_set():
+    deltas = diff_concepts(CONCEPTS)["concepts"]
+
+    assert [delta["id"] for delta in deltas] == ["a", "b", "c"]
+    assert all("id" not in delta["set"] for delta in deltas)
+    assert deltas[0]["set"] == {}
+    assert deltas[2] == {"id": "c", "set": {"tokens.colors.surface": "#eee"}, "unset": ["tokens.radius"]}
+
+
+@pytest.mark.parametrize("flat", [
+    {"a": 1, "a.b": 2},
+    {"a.b": 2, "a": 1},
+    {"a": {}, "a.b.c": 2, "a.d": 3},
+    {"x.y": [1], "x.y.z": "deep", "x.w": 0},
+])
+def test_prefix_collisions_keep_every_value(flat):
+    nested = nest_paths(flat)
+
+    leaves = flatten_concept(nested)
+    assert sorted(leaves.values(), key=repr) == sorted(flat.values(), key=repr)
+
+
+def test_prefix_collision_is_an_explicit_leaf():
+    assert nest_paths({"a.b": 2, "a": 1}) == {"a": 1, "a.b": 2}
+    assert nest_paths({"t.a": 1, "t.a.b.c": 2}) == {"t": {"a": 1, "a.b.c": 2}}
+
+
+@pytest.mark.parametrize("concept", [
+    {"spacing": {"0.5": "2px", "1": "4px"}},
+    {"path\\to": {"a.b": {"c": 1}}, "path": {"to": 2}},
+    {"tokens": {"colors": {"primary": "#fff"}, "list": [1, 2]}, "empty": {}},
+])
+def test_keys_with_dots_round_trip(concept):
+    assert nest_paths(flatten_concept(concept)) == concept
+
+
+def test_dotted_keys_do_not_collide_with_nesting():
+    flat = flatten_concept({"a.b": 1, "a": {"b": 2}})
+
+    assert flat == {"a\\.b": 1, "a.b": 2}
+
+
+def test_structural_disagreement_survives_the_base():
+    concepts = [
+        {"id": 1, "shadow": "none"},
+        {"id": 2, "shadow": "none"},
+        {"id": 3, "shadow": {"sm": "0 1px 2px"}},
+        {"id": 4, "shadow": {"sm": "0 1px 2px"}},
+    ]
+
+    payload = concept_payload(concepts)
+
+    assert payload["shared"] == {"shadow": "none", "shadow.sm": "0 1px 2px"}
+
+
+def test_rounds_match_closest_previous_concept():
+    previous = [{"id": "p1", "mood": "calm", "color": "#123"}, {"id": "p2", "mood": "bold", "color": "#f00"}]
+    current = [{"id": "n1", "mood": "bold", "color": "#f11"}]
+
+    changes = diff_rounds(previous, current)
+
+    assert changes == [{"id": "n1", "from": "p2", "changed": ["color"], "changed_count": 1}]
+    assert "changes_from_previous_round" in concept_payload(current, previous)
+    assert "changes_from_previous_round" not in concept_payload(current)
@@ -0,0 +1,122 @@
+"""Tests for the CSS custom property scanner"""
+
+import mmap
+
+import pytest
+
+from backend.foundation.css_scanner import scan_css, categorize_name, categorize_token
+
+
+@pytest.mark.parametrize("name, category", [
+    ("color-primary", "colors"),
+    ("primary-500", "colors"),
+    ("bg-surface", "colors"),
+    ("font-family-sans", "typography"),
+    ("font-size-lg", "typography"),
+    ("line-height-tight", "typography"),
+    ("text-lg", "typography"),
+    ("text-primary", "colors"),
+    ("spacing-4", "spacing"),
+    ("space-x_sm", "spacing"),
+    ("border-radius-md", "effects"),
+    ("box-shadow-card", "effects"),
+    ("border-subtle", "colors"),
+    ("duration-fast", "behaviors"),
+    ("z-index-modal", "effects"),
+    ("unrelated", None),
+    # A trailing kind segment beats a leading subject segment
+    ("heading-color", "colors"),
+    ("font-color", "colors"),
+    ("heading-bg", "colors"),
+    ("font-color-muted", "colors"),
+    ("text-shadow-sm", "effects"),
+    ("heading-shadow", "effects"),
+    ("heading-weight", "typography"),
+    ("font-weight-bold", "typography"),
+])
+def test_categorize_name(name, category):
+    assert categorize_name(name) == category
+
+
+def test_value_fallback():
+    assert categorize_token("brand-a", "#fff") == "colors"
+    assert categorize_token("thing", "oklch(0.7 0.1 200)") == "colors"
+    assert categorize_token("thing", "150ms") == "behaviors"
+    assert categorize_token("thing", "cubic-bezier(0, 0, 1, 1)") == "behaviors"
+    assert categorize_token("thing", "auto") is None
+
+
+def test_root_declarations_are_base_tokens():
+    css = b"""
+    :root {
+      --color-primary: #3b82f6;
+      --font-size-base: 1rem !important;
+      --space-md: /* comment */ 16px;
+    }
+    html, body { --duration-fast: 150ms; }
+    """
+
+    tokens = scan_css(css)
+
+    assert tokens["colors"] == {"color-primary": "#3b82f6"}
+    assert tokens["typography"] == {"font-size-base": "1rem"}
+    assert tokens["spacing"] == {"space-md": "16px"}
+    assert tokens["behaviors"] == {"duration-fast": "150ms"}
+    assert "themes" not in tokens
+
+
+def test_media_and_data_theme_scopes_are_variants():
+    css = b"""
+    :root { --color-bg: #fff; }
+    @media (prefers-color-scheme: dark) {
+      :root { --color-bg: #000; }
+    }
+    [data-theme="dark"] { --color-bg: #111; --shadow-card: none; }
+    @media (min-width: 640px) { .card { --space-card: 2rem; } }
+    """
+
+    tokens = scan_css(css)
+
+    assert tokens["colors"] == {"color-bg": "#fff"}
+    assert tokens["themes"] == {
+        "@media (prefers-color-scheme: dark) :root": {"colors": {"color-bg": "#000"}},
+        '[data-theme="dark"]': {"colors": {"color-bg": "#111"}, "effects": {"shadow-card": "none"}},
+        "@media (min-width: 640px) .card": {"spacing": {"space-card": "2rem"}},
+    }
+
+
+def test_transparent_at_rules_keep_base_scope():
+    css = b"@layer base { :root { --color-a: red; } } @theme { --color-b: blue; }"
+
+    tokens = scan_css(css)
+
+    assert tokens["colors"] == {"color-a": "red", "color-b": "blue"}
+    assert "themes" not in tokens
+
+
+def test_strings_comments_and_bem_selectors_are_not_tokens():
+    css = b"""
+    .btn--primary { color: red; }
+    /* --color-commented: #000; */
+    .a::after { content: "--color-in-string: #000; }"; }
+    :root { --font-family-sans: "Inter", 'Helvetica Neue', sans-serif; --color-x: #abc; }
+    """
+
+    tokens = scan_css(css)
+
+    assert tokens["colors"] == {"color-x": "#abc"}
+    assert tokens["typography"] == {"font-family-sans": "\"Inter\", 'Helvetica Neue', sans-serif"}
+
+
+def test_declaration_without_semicolon_before_close():
+    assert scan_css(b":root{--color-a:#fff}")["colors"] == {"color-a": "#fff"}
+
+
+def test_scans_memory_mapped_file(tmp_path):
+    path = tmp_path / "variables.css"
+    path.write_bytes(b".x{}" * 10_000 + b":root { --color-primary: #123456; }")
+
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        tokens = scan_css(buffer)
+
+    assert tokens["colors"] == {"color-primary": "#123456"}
@@ -0,0 +1,97 @@
+"""Tests that blocking extraction and persistence stay off the event loop"""
+
+import asyncio
+import json
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+
+from backend.foundation import (
+    extract_tokens_from_repo,
+    extract_tokens_from_repo_sync,
+    save_session_state,
+)
+from backend.session_manager import SessionManager
+
+
+# Interval of the probe that measures how late the loop wakes it
+PROBE_INTERVAL = 0.005
+
+
+@pytest.fixture
+def large_repo(workdir):
+    """A repository whose extraction takes a noticeable amount of CPU and I/O"""
+    repo = workdir / "repo"
+    for package in range(40):
+        styles = repo / "packages" / f"pkg-{package}" / "src" / "styles"
+        styles.mkdir(parents=True)
+        lines = [f"  --color-{package}-{i}: #{(package * 997 + i) % 0xFFFFFF:06x};" for i in range(1500)]
+        (styles / "variables.css").write_text(":root {\n" + "\n".join(lines) + "\n}\n")
+    tokens = {"color": {f"c{i}": {"value": f"#{i:06x}"} for i in range(20000)}}
+    (repo / "tokens.json").write_text(json.dumps(tokens))
+    return repo
+
+
+async def measure_loop_lag(work):
+    """
+    Run work while probing the event loop
+
+    Returns:
+        (worst probe lateness in seconds, work duration in seconds)
+    """
+    lags = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL)
+            lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    try:
+        await work()
+    finally:
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+    return max(lags), elapsed
+
+
+def test_session_reads_finish_while_extraction_runs(large_repo):
+    manager = SessionManager(Path(".embody/sessions"))
+    session_ids = [f"read-{uuid.uuid4().hex[:8]}" for _ in range(20)]
+    for session_id in session_ids:
+        save_session_state(session_id, {"session_id": session_id, "iterations": [{"notes": "x" * 2000}] * 50})
+
+    async def scenario():
+        extraction = asyncio.create_task(extract_tokens_from_repo(str(large_repo)))
+        # Let extraction start before the reads queue up behind it
+        await asyncio.sleep(0)
+        states = await asyncio.gather(*(manager.get_session_state(session_id) for session_id in session_ids))
+        extraction_done_first = extraction.done()
+        tokens = await extraction
+        return states, extraction_done_first, tokens
+
+    states, extraction_done_first, tokens = asyncio.run(scenario())
+    manager.state_store.close()
+
+    # Concurrent reads (what GET /api/sessions/{id} does) were served while
+    # extraction was still running, rather than waiting for it
+    assert [state["session_id"] for state in states] == session_ids
+    assert not extraction_done_first
+    assert tokens["colors"]
+
+
+def test_blocking_extraction_on_the_loop_is_detected(large_repo):
+    # Sanity check that the probe sees a stall when work runs on the loop
+    async def work():
+        extract_tokens_from_repo_sync(str(large_repo), use_cache=False)
+
+    worst_lag, elapsed = asyncio.run(measure_loop_lag(work))
+
+    assert worst_lag > elapsed / 2
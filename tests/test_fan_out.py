@@ -0,0 +1,76 @@
+"""Tests for concurrent single-agent fan-out"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from backend.session_manager import SessionManager
+
+
+AGENT = "embody-collection:concept-generator"
+
+# Seed index -> (delay, response); seed 0 answers first, in prose
+RESPONSES = {
+    0: (0.01, "Here is a concept I came up with, described in words."),
+    1: (0.02, json.dumps({"id": "concept-2"})),
+    2: (0.03, json.dumps({"id": "concept-3"})),
+    3: (0.2, json.dumps({"id": "concept-4"})),
+}
+
+
+def _parse(index, response):
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"No concept in response: {e}")
+
+
+@pytest.fixture
+def manager(workdir):
+    manager = SessionManager(Path(".embody/sessions"))
+    manager.active_sessions["s1"] = object()
+
+    async def run_agent(session, agent, instruction, isolated=False):
+        delay, response = RESPONSES[int(instruction)]
+        await asyncio.sleep(delay)
+        return response
+
+    manager._run_agent = run_agent
+    yield manager
+    manager.state_store.close()
+
+
+def _fan_out(manager, first_k, parse=_parse):
+    async def scenario():
+        return [
+            item async for item in manager.fan_out_agent(
+                "s1", AGENT, [str(index) for index in RESPONSES], first_k=first_k, parse=parse
+            )
+        ]
+
+    return asyncio.run(scenario())
+
+
+def test_first_k_counts_only_parsed_responses(manager):
+    results = _fan_out(manager, first_k=2)
+
+    assert results == [(1, {"id": "concept-2"}), (2, {"id": "concept-3"})]
+    stats = manager.get_stats()["fan_out"]
+    assert stats["rejected"] == 1
+    assert stats["cancelled"] == 1
+
+
+def test_without_parse_every_response_counts(manager):
+    results = _fan_out(manager, first_k=2, parse=None)
+
+    assert [index for index, _ in results] == [0, 1]
+    assert manager.get_stats()["fan_out"]["cancelled"] == 2
+
+
+def test_without_first_k_every_call_completes(manager):
+    results = _fan_out(manager, first_k=None)
+
+    assert [index for index, _ in results] == [1, 2, 3]
+    assert manager.get_stats()["fan_out"]["cancelled"] == 0
@@ -0,0 +1,72 @@
+"""Tests for token extraction at a git ref (blob reads and the blob cache)"""
+
+import json
+import subprocess
+
+import pytest
+
+from backend.foundation import extract_tokens_from_repo_sync
+from backend.foundation import git_objects, token_extractor
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo, check=True, capture_output=True
+    )
+
+
+@pytest.fixture
+def repo(workdir):
+    path = workdir / "repo"
+    (path / "design-system").mkdir(parents=True)
+    (path / "design-system" / "tokens.json").write_text(json.dumps({"colors": {"primary": "#3b82f6"}}))
+    (path / "app").mkdir()
+    (path / "app" / "variables.css").write_text(":root { --space-sm: 4px; --color-muted: #888; }")
+    _git(path, "init", "-q")
+    _git(path, "add", ".")
+    _git(path, "commit", "-q", "-m", "tokens")
+    return path
+
+
+@pytest.fixture
+def blob_reads(monkeypatch):
+    reads = []
+    original = git_objects.GitBlobReader.read
+
+    def counting_read(self, sha):
+        reads.append(sha)
+        return original(self, sha)
+
+    monkeypatch.setattr(git_objects.GitBlobReader, "read", counting_read)
+    return reads
+
+
+def test_each_uncached_blob_is_read_once(repo, blob_reads):
+    tokens = extract_tokens_from_repo_sync(str(repo), use_cache=False, ref="HEAD")
+
+    assert sorted(tokens["source_files"]) == ["app/variables.css", "design-system/tokens.json"]
+    assert tokens["colors"]["primary"] == "#3b82f6"
+    assert len(blob_reads) == 2
+    assert len(set(blob_reads)) == 2
+
+
+def test_cached_blobs_are_ranked_and_merged_without_reads(repo, blob_reads):
+    first = extract_tokens_from_repo_sync(str(repo), ref="HEAD")
+    blob_reads.clear()
+
+    second = extract_tokens_from_repo_sync(str(repo), ref="HEAD")
+
+    assert blob_reads == []
+    assert second["source_files"] == first["source_files"]
+    assert second["colors"] == first["colors"]
+    assert all(stat["cached"] for stat in second["source_file_stats"])
+
+
+def test_blobs_past_the_retain_limit_are_read_again(repo, blob_reads, monkeypatch):
+    monkeypatch.setattr(token_extractor, "BLOB_RETAIN_BYTES", 0)
+
+    tokens = extract_tokens_from_repo_sync(str(repo), use_cache=False, ref="HEAD")
+
+    assert len(tokens["source_files"]) == 2
+    assert len(blob_reads) == 4
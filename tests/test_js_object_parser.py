@@ -0,0 +1,161 @@
+"""Tests for the Tailwind object-literal parser"""
+
+import time
+
+from backend.foundation.js_object_parser import find_object, tokenize, MAX_DEPTH
+from backend.foundation.token_extractor import _extract_from_js_config
+
+
+def test_nested_objects():
+    source = """
+    module.exports = {
+      theme: {
+        colors: {
+          blue: { 50: '#eff6ff', 900: "#1e3a8a", light: { DEFAULT: '#93c5fd' } },
+        },
+      },
+    }
+    """
+
+    assert find_object(source, "theme") == {
+        "colors": {"blue": {"50": "#eff6ff", "900": "#1e3a8a", "light": {"DEFAULT": "#93c5fd"}}}
+    }
+
+
+def test_spread_in_array_is_kept_in_place():
+    source = "theme: { fontFamily: { sans: ['Inter', ...defaultTheme.fontFamily.sans, 'Arial'] } }"
+
+    assert find_object(source, "theme") == {
+        "fontFamily": {"sans": ["Inter", "...defaultTheme.fontFamily.sans", "Arial"]}
+    }
+
+
+def test_spread_in_object_is_kept_as_marker_key():
+    source = "theme: { spacing: { ...defaultTheme.spacing, 72: '18rem', ...require('./x')(1) } }"
+
+    assert find_object(source, "theme") == {
+        "spacing": {
+            "...defaultTheme.spacing": "...defaultTheme.spacing",
+            "72": "18rem",
+            "...require('./x')(1)": "...require('./x')(1)",
+        }
+    }
+
+
+def test_comments_are_ignored():
+    source = """
+    theme: {
+      // colors: { fake: '#000' },
+      colors: {
+        /* a { brace } in a comment */
+        primary: '#fff', // trailing comment }
+        /* multi
+           line */ secondary: '#000',
+      },
+    }
+    """
+
+    assert find_object(source, "theme") == {"colors": {"primary": "#fff", "secondary": "#000"}}
+
+
+def test_trailing_commas():
+    source = "theme: { colors: { a: '#1', b: ['x', 'y',], }, spacing: { 1: '4px', }, }"
+
+    assert find_object(source, "theme") == {"colors": {"a": "#1", "b": ["x", "y"]}, "spacing": {"1": "4px"}}
+
+
+def test_strings_with_brackets_and_escapes():
+    source = r"""theme: { content: { a: '{not} [an] object', b: "it\"s", c: 'line\nbreak', d: `tpl ${x}` } }"""
+
+    assert find_object(source, "theme") == {
+        "content": {"a": "{not} [an] object", "b": 'it"s', "c": "line\nbreak", "d": "tpl ${x}"}
+    }
+
+
+def test_literals():
+    source = "theme: { opacity: { 0: 0, half: .5, exp: 1e3, neg: -2 }, flags: { on: true, off: false, none: null } }"
+
+    assert find_object(source, "theme") == {
+        "opacity": {"0": 0, "half": 0.5, "exp": 1000.0, "neg": -2},
+        "flags": {"on": True, "off": False, "none": None},
+    }
+
+
+def test_computed_values_kept_as_source():
+    source = """
+    theme: {
+      colors: ({ theme }) => ({ primary: theme('colors.blue.500') }),
+      spacing: { big: 4 * base, ref: tokens.space.lg, call: rem(16) },
+    }
+    """
+
+    theme = find_object(source, "theme")
+
+    assert theme["colors"] == "({ theme }) => ({ primary: theme('colors.blue.500') })"
+    assert theme["spacing"] == {"big": "4 * base", "ref": "tokens.space.lg", "call": "rem(16)"}
+
+
+def test_computed_keys_and_shorthand_are_skipped():
+    source = "theme: { [dynamic]: 1, shorthand, method() { return 1 }, kept: 2 }"
+
+    assert find_object(source, "theme") == {"kept": 2}
+
+
+def test_quoted_key_lookup_and_missing_key():
+    assert find_object('const c = { "theme": { a: 1 } }', "theme") == {"a": 1}
+    assert find_object("const c = { other: {} }", "theme") is None
+
+
+def test_unbalanced_source_does_not_raise():
+    assert find_object("theme: { colors: { a: '#1', b: [1, 2", "theme") == {"colors": {"a": "#1", "b": [1, 2]}}
+
+
+def test_nesting_beyond_max_depth_is_raw():
+    source = "theme: " + "{ a: " * (MAX_DEPTH + 5) + "1" + " }" * (MAX_DEPTH + 5)
+
+    value = find_object(source, "theme")
+    for _ in range(MAX_DEPTH):
+        value = value["a"]
+
+    assert isinstance(value, str) and value.startswith("{")
+
+
+def test_theme_and_extend_become_tokens():
+    source = """
+    module.exports = {
+      theme: {
+        colors: { primary: { 500: '#3b82f6' } },
+        fontSize: { sm: ['0.875rem', { lineHeight: '1.25rem' }] },
+        extend: {
+          colors: { primary: { 600: '#2563eb' } },
+          spacing: { ...defaultTheme.spacing, 128: '32rem' },
+        },
+      },
+    }
+    """
+
+    tokens = _extract_from_js_config(source)
+
+    assert tokens["colors"] == {"primary": {"500": "#3b82f6", "600": "#2563eb"}}
+    assert tokens["typography"] == {"fontSize": {"sm": ["0.875rem", {"lineHeight": "1.25rem"}]}}
+    assert tokens["spacing"]["spacing"] == {"...defaultTheme.spacing": "...defaultTheme.spacing", "128": "32rem"}
+
+
+def test_parsing_is_linear():
+    def config(n):
+        return "theme: { colors: {" + ",".join(f"c{i}: {{ 50: '#{i:06x}', 900: '#000' }}" for i in range(n)) + "} }"
+
+    def parse_time(source):
+        start = time.perf_counter()
+        find_object(source, "theme")
+        return time.perf_counter() - start
+
+    small, large = config(2_000), config(20_000)
+    parse_time(small)
+
+    # 10x the input should take nowhere near 100x the time
+    assert parse_time(large) < 30 * max(parse_time(small), 1e-3)
+
+
+def test_tokenize_drops_whitespace_and_comments():
+    assert [text for _, text, _, _ in tokenize("a: /* x */ 1, // y\n b")] == ["a", ":", "1", ",", "b"]
@@ -0,0 +1,118 @@
+"""Tests for incremental concept parsing of streamed LLM output"""
+
+import json
+import random
+
+import pytest
+
+from backend.json_stream import ConceptStreamParser
+
+
+CONCEPTS = [
+    {"id": "concept-a", "name": "Bold {braces} \"quoted\"", "tokens": {"colors": {"primary": "#ff0000"}}},
+    {"id": "concept-b", "name": "Escaped \\ back]slash", "qualities": ["calm", "[airy]"]},
+    {"id": "concept-c", "name": "Nested", "tokens": {"spacing": [[1, 2], {"x": {}}]}},
+]
+
+
+def feed_all(parser, chunks):
+    """Feed chunks in order and collect every completed element"""
+    completed = []
+    for chunk in chunks:
+        completed.extend(parser.feed(chunk))
+    return completed
+
+
+def random_chunks(text, rng, max_size=12):
+    """Split text at random points"""
+    chunks = []
+    i = 0
+    while i < len(text):
+        size = rng.randint(1, max_size)
+        chunks.append(text[i:i + size])
+        i += size
+    return chunks
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_random_chunking_yields_same_elements(seed):
+    text = "Here are the concepts:\n```json\n" + json.dumps({"concepts": CONCEPTS}, indent=2) + "\n```\nDone."
+    rng = random.Random(seed)
+
+    assert feed_all(ConceptStreamParser(), random_chunks(text, rng)) == CONCEPTS
+
+
+def test_single_character_chunks():
+    text = json.dumps({"concepts": CONCEPTS})
+
+    assert feed_all(ConceptStreamParser(), list(text)) == CONCEPTS
+
+
+def test_elements_emitted_as_soon_as_complete():
+    text = json.dumps({"concepts": CONCEPTS[:2]})
+    first_end = text.index(json.dumps(CONCEPTS[0])) + len(json.dumps(CONCEPTS[0]))
+    parser = ConceptStreamParser()
+
+    assert parser.feed(text[:first_end - 1]) == []
+    assert parser.feed(text[first_end - 1:first_end]) == [CONCEPTS[0]]
+    assert parser.feed(text[first_end:]) == [CONCEPTS[1]]
+    assert parser.done
+
+
+def test_top_level_array():
+    assert feed_all(ConceptStreamParser(), [json.dumps(CONCEPTS)]) == CONCEPTS
+
+
+def test_prose_braces_before_json_are_ignored():
+    text = "I considered {a few options} first. " + json.dumps({"concepts": CONCEPTS[:1]})
+
+    assert feed_all(ConceptStreamParser(), random_chunks(text, random.Random(1))) == CONCEPTS[:1]
+
+
+def test_bracket_in_prose_is_not_the_element_array():
+    text = "Note [1 of 2 drafts: " + json.dumps({"concepts": CONCEPTS[:2]})
+
+    assert feed_all(ConceptStreamParser(), random_chunks(text, random.Random(3))) == CONCEPTS[:2]
+
+
+def test_fenced_top_level_array():
+    text = "```json\n" + json.dumps(CONCEPTS, indent=2) + "\n```"
+
+    assert feed_all(ConceptStreamParser(), random_chunks(text, random.Random(5))) == CONCEPTS
+
+
+def test_other_keys_are_not_captured():
+    payload = {"notes": [{"id": "not-a-concept"}], "meta": {"concepts": [{"id": "nested"}]}, "concepts": CONCEPTS[:1]}
+
+    assert feed_all(ConceptStreamParser(), [json.dumps(payload)]) == CONCEPTS[:1]
+
+
+def test_custom_array_key():
+    payload = {"variations": CONCEPTS[1:]}
+
+    assert feed_all(ConceptStreamParser(array_key="variations"), [json.dumps(payload)]) == CONCEPTS[1:]
+
+
+def test_stops_after_first_value_with_elements():
+    text = json.dumps({"concepts": CONCEPTS[:1]}) + "\n" + json.dumps({"concepts": CONCEPTS[1:]})
+    parser = ConceptStreamParser()
+
+    assert feed_all(parser, [text]) == CONCEPTS[:1]
+    assert parser.done
+    assert parser.feed(json.dumps(CONCEPTS)) == []
+
+
+def test_malformed_element_is_skipped():
+    text = '{"concepts": [{"id": "ok"}, {"id": bad}, {"id": "also-ok"}]}'
+
+    assert feed_all(ConceptStreamParser(), [text]) == [{"id": "ok"}, {"id": "also-ok"}]
+
+
+def test_truncated_stream_returns_only_completed_elements():
+    text = json.dumps({"concepts": CONCEPTS})
+    cut = text.index(json.dumps(CONCEPTS[2])) + 10
+    parser = ConceptStreamParser()
+
+    assert feed_all(parser, random_chunks(text[:cut], random.Random(7))) == CONCEPTS[:2]
+    assert parser.emitted == 2
+    assert not parser.done
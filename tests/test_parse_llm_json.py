@@ -0,0 +1,116 @@
+"""Tests for JSON extraction from LLM responses"""
+
+import json
+import time
+
+import pytest
+
+from backend.session_manager import parse_llm_json, _find_json_spans
+
+
+def test_raw_json():
+    assert parse_llm_json('{"a": 1}') == {"a": 1}
+
+
+def test_fenced_block():
+    content = 'Sure:\n```json\n{"a": {"b": [1, 2]}}\n```\nThanks {x}'
+
+    assert parse_llm_json(content) == {"a": {"b": [1, 2]}}
+
+
+def test_nested_braces_in_prose():
+    content = 'Result: {"outer": {"inner": {"deep": [{"x": 1}]}}} done'
+
+    assert parse_llm_json(content) == {"outer": {"inner": {"deep": [{"x": 1}]}}}
+
+
+def test_prose_braces_around_payload():
+    content = 'Tokens look like {name} here. {"concepts": [{"id": "a"}]} Ask about {more} or [this].'
+
+    assert parse_llm_json(content) == {"concepts": [{"id": "a"}]}
+
+
+def test_strings_containing_braces_and_quotes():
+    payload = {"note": 'use "{" and "}" or ] carefully', "escaped": "back\\slash \"{\"", "list": ["[", "}"]}
+    content = f"Prefix {{stray. {json.dumps(payload)} suffix ] }}"
+
+    assert parse_llm_json(content) == payload
+
+
+def test_largest_valid_value_wins():
+    content = 'Small {"a": 1} then the real one {"concepts": [1, 2, 3], "extra": {"k": "v"}}'
+
+    assert parse_llm_json(content) == {"concepts": [1, 2, 3], "extra": {"k": "v"}}
+
+
+def test_largest_value_wins_when_it_comes_first():
+    content = '{"concepts": [1, 2, 3], "extra": {"k": "v"}} and a footnote [1]'
+
+    assert parse_llm_json(content) == {"concepts": [1, 2, 3], "extra": {"k": "v"}}
+
+
+def test_invalid_larger_value_falls_back_to_smaller():
+    content = '{"broken": [1, 2,]} and {"ok": true}'
+
+    assert parse_llm_json(content) == {"ok": True}
+
+
+def test_value_inside_unclosed_prose_brace():
+    content = 'Note { this never closes, but {"a": [1, {"b": 2}]} is complete'
+
+    assert parse_llm_json(content) == {"a": [1, {"b": 2}]}
+
+
+def test_mismatched_closers_are_ignored():
+    content = '] } ) {"a": [1]} ]'
+
+    assert parse_llm_json(content) == {"a": [1]}
+
+
+def test_payload_wrapped_in_prose_braces():
+    content = 'Here it is {as requested: {"concepts": [{"id": "a"}]} - enjoy}'
+
+    assert parse_llm_json(content) == {"concepts": [{"id": "a"}]}
+
+
+def test_deeply_nested_input_raises_value_error():
+    with pytest.raises(ValueError):
+        parse_llm_json("[" * 100_000 + "]" * 100_000)
+
+
+def test_no_json_raises():
+    with pytest.raises(ValueError):
+        parse_llm_json("no json here { at all")
+
+
+def test_spans_are_disjoint_and_in_order():
+    content = '{"a": {"b": 1}} text [1, [2]] {unclosed {"c": 3}'
+
+    assert _find_json_spans(content) == [
+        (0, 15, [(6, 14, [])]),
+        (21, 29, [(25, 28, [])]),
+        (40, 48, []),
+    ]
+
+
+@pytest.mark.parametrize("content", [
+    "{" * 200_000,
+    "[" * 200_000,
+    "}" * 200_000,
+    " { maybe [" * 20_000,
+    '{"' + "a" * 200_000,
+    '{ "x": "' + '\\"' * 100_000,
+], ids=["openers", "arrays", "closers", "mixed", "unterminated-string", "escapes"])
+def test_pathological_unbalanced_input_is_linear(content):
+    start = time.perf_counter()
+    with pytest.raises(ValueError):
+        parse_llm_json(content)
+
+    # The greedy regex took minutes on inputs like these
+    assert time.perf_counter() - start < 1.0
+
+
+def test_unbalanced_input_before_payload():
+    content = "{" * 50_000 + '{"a": 1}'
+
+    assert parse_llm_json(content) == {"a": 1}
@@ -0,0 +1,90 @@
+"""Tests for prompt payload serialization and budget fitting"""
+
+import json
+import random
+
+import pytest
+
+from backend import prompt_serializer
+from backend.prompt_serializer import (
+    REFS_LEGEND,
+    _SizeIndex,
+    _dumps,
+    get_prompt_stats,
+    serialize_for_prompt,
+)
+
+
+def _random_value(rng, depth=0):
+    roll = rng.random()
+    if depth > 3 or roll < 0.3:
+        return rng.choice([rng.randint(0, 10 ** 6), "é" * rng.randint(0, 20), 'q"uote', True, None, 1.5])
+    if roll < 0.65:
+        return {f"k{rng.randint(0, 99)}": _random_value(rng, depth + 1) for _ in range(rng.randint(0, 6))}
+    return [_random_value(rng, depth + 1) for _ in range(rng.randint(0, 6))]
+
+
+def test_metadata_is_stripped_and_keys_sorted():
+    data = {"colors": {"b": "#000", "a": "#fff"}, "source_files": ["x"], "_private": 1, "empty": {}}
+
+    assert serialize_for_prompt(data) == '{"colors":{"a":"#fff","b":"#000"}}'
+
+
+def test_repeated_long_strings_become_refs():
+    shadow = "0 1px 3px rgb(0 0 0 / 0.1)"
+    text = serialize_for_prompt({"effects": {f"shadow-{i}": shadow for i in range(5)}})
+
+    legend, payload = text.split("\n", 1)
+    assert legend == REFS_LEGEND
+    assert json.loads(payload)["$refs"] == {"@1": shadow}
+
+
+def test_over_budget_payload_is_truncated_least_important_first():
+    data = {
+        "colors": {f"c{i}": f"#{i:06x}" for i in range(50)},
+        "behaviors": {f"b{i}": f"{i}ms" for i in range(500)},
+    }
+
+    text = serialize_for_prompt(data, budget_tokens=400, priorities=("colors", "behaviors"))
+    fitted = json.loads(text)
+
+    assert len(text) <= 400 * prompt_serializer.CHARS_PER_TOKEN
+    assert len(fitted["colors"]) == 50
+    assert fitted["behaviors"]["…"].endswith(" more")
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_size_index_stays_exact_while_shrinking(seed):
+    rng = random.Random(seed)
+    value = _random_value(rng)
+    index = _SizeIndex(value)
+
+    assert index.size == len(_dumps(value))
+    while index.shrink():
+        assert index.size == len(_dumps(value))
+
+
+def test_fitting_large_payload_never_exceeds_budget():
+    rng = random.Random(7)
+    data = {"colors": {f"p{i}": {str(s): f"#{rng.randrange(1 << 24):06x}" for s in range(10)} for i in range(2000)}}
+
+    text = serialize_for_prompt(data, budget_tokens=500)
+
+    assert len(text) <= 500 * prompt_serializer.CHARS_PER_TOKEN
+    assert json.loads(text)["colors"]["…"] == f"{2000 - len(json.loads(text)['colors']) + 1} more"
+
+
+def test_sizes_are_counted_per_label_and_only_logged_when_enabled(capsys, monkeypatch):
+    monkeypatch.setattr(prompt_serializer, "_payload_stats", {})
+
+    serialize_for_prompt({"a": 1}, label="intent")
+    serialize_for_prompt({"b": "x" * 100}, budget_tokens=5, label="intent")
+    assert capsys.readouterr().out == ""
+
+    stats = get_prompt_stats()["intent"]
+    assert stats["calls"] == 2
+    assert stats["truncated"] == 1
+
+    monkeypatch.setattr(prompt_serializer, "PROMPT_SIZE_LOG", True)
+    serialize_for_prompt({"a": 1}, label="intent")
+    assert "Prompt payload 'intent'" in capsys.readouterr().out
@@ -0,0 +1,152 @@
+"""Tests for single-pass token file discovery"""
+
+import time
+
+import pytest
+
+from backend.foundation.repo_walker import walk_token_files, is_token_file_name
+
+
+def make_tree(root, paths):
+    """Create files (contents irrelevant) at the given relative paths"""
+    for path in paths:
+        file_path = root / path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("{}")
+    return root
+
+
+def found(root, **kwargs):
+    """Relative paths of discovered files"""
+    result = walk_token_files(root, **kwargs)
+    return [path.relative_to(root).as_posix() for path in result["files"]]
+
+
+def test_token_file_names():
+    assert is_token_file_name("tokens.json")
+    assert is_token_file_name("brand.tokens.json")
+    assert is_token_file_name(":root.css")
+    assert not is_token_file_name("tokens.json.bak")
+    assert not is_token_file_name("package.json")
+
+
+def test_breadth_first_and_pruned(tmp_path):
+    make_tree(tmp_path, [
+        "tokens.json",
+        "packages/ui/src/styles/variables.css",
+        "packages/ui/tailwind.config.js",
+        "packages/ui/README.md",
+        "node_modules/lib/tokens.json",
+        "dist/variables.css",
+        ".git/tokens.json",
+    ])
+
+    assert found(tmp_path) == [
+        "tokens.json",
+        "packages/ui/tailwind.config.js",
+        "packages/ui/src/styles/variables.css",
+    ]
+
+
+def test_custom_ignored_dirs(tmp_path):
+    make_tree(tmp_path, ["legacy/tokens.json", "dist/tokens.json"])
+
+    assert found(tmp_path, ignored_dirs=frozenset({"legacy"})) == ["dist/tokens.json"]
+
+
+@pytest.mark.parametrize("gitignore, expected", [
+    # Unanchored name patterns match at any depth
+    ("*.tokens.json\n", ["tokens.json", "a/tokens.json", "a/b/tokens.json", "docs/tokens.json"]),
+    # A leading slash anchors to the .gitignore's directory
+    ("/tokens.json\n", ["a/tokens.json", "a/b.tokens.json", "a/b/tokens.json", "docs/tokens.json", "docs/x.tokens.json"]),
+    # "*" does not cross directories
+    ("docs/*.json\n", ["tokens.json", "a/tokens.json", "a/b.tokens.json", "a/b/tokens.json"]),
+    # "**/" matches any leading directories, including none
+    ("**/b\n", ["tokens.json", "a/tokens.json", "a/b.tokens.json", "docs/tokens.json", "docs/x.tokens.json"]),
+    # Trailing slash only matches directories
+    ("tokens.json/\n", ["tokens.json", "a/tokens.json", "a/b.tokens.json", "a/b/tokens.json", "docs/tokens.json", "docs/x.tokens.json"]),
+    # Negation re-includes; the last matching rule wins
+    ("*.json\n!a/b.tokens.json\n", ["a/b.tokens.json"]),
+    # Comments and blank lines are skipped; character classes work
+    ("# comment\n\ndoc[sx]/\n", ["tokens.json", "a/tokens.json", "a/b.tokens.json", "a/b/tokens.json"]),
+])
+def test_gitignore_subset(tmp_path, gitignore, expected):
+    make_tree(tmp_path, [
+        "tokens.json",
+        "a/tokens.json",
+        "a/b.tokens.json",
+        "a/b/tokens.json",
+        "docs/tokens.json",
+        "docs/x.tokens.json",
+    ])
+    (tmp_path / ".gitignore").write_text(gitignore)
+
+    assert sorted(found(tmp_path)) == sorted(expected)
+
+
+def test_gitignore_star_does_not_cross_directories(tmp_path):
+    make_tree(tmp_path, ["docs/tokens.json", "docs/deep/tokens.json", "b/tokens.json", "x/b/tokens.json"])
+    (tmp_path / ".gitignore").write_text("docs/*.json\n**/b/\n")
+
+    assert found(tmp_path) == ["docs/deep/tokens.json"]
+
+
+def test_nested_gitignore_is_scoped_to_its_directory(tmp_path):
+    make_tree(tmp_path, ["tokens.json", "pkg/tokens.json", "pkg/sub/tokens.json", "other/tokens.json"])
+    (tmp_path / "pkg" / ".gitignore").write_text("/sub\n")
+    (tmp_path / "other" / ".gitignore").write_text("tokens.json\n")
+
+    assert found(tmp_path) == ["tokens.json", "pkg/tokens.json"]
+
+
+def test_gitignore_can_be_disabled(tmp_path):
+    make_tree(tmp_path, ["tokens.json"])
+    (tmp_path / ".gitignore").write_text("tokens.json\n")
+
+    assert found(tmp_path, use_gitignore=False) == ["tokens.json"]
+
+
+def test_depth_budget(tmp_path):
+    make_tree(tmp_path, ["tokens.json", "a/tokens.json", "a/b/tokens.json", "a/b/c/tokens.json"])
+
+    result = walk_token_files(tmp_path, max_depth=1)
+
+    assert [p.relative_to(tmp_path).as_posix() for p in result["files"]] == ["tokens.json", "a/tokens.json"]
+    assert result["truncated"] == "depth"
+
+
+def test_entry_budget(tmp_path):
+    make_tree(tmp_path, [f"f{i:02}.txt" for i in range(10)] + ["z/tokens.json"])
+
+    result = walk_token_files(tmp_path, max_entries=5)
+
+    assert result["files"] == []
+    assert result["entries_scanned"] == 6
+    assert result["truncated"] == "entries"
+
+
+def test_match_budget_stops_early(tmp_path):
+    make_tree(tmp_path, [f"p{i}/tokens.json" for i in range(5)])
+
+    result = walk_token_files(tmp_path, max_matches=2)
+
+    assert len(result["files"]) == 2
+    assert result["truncated"] == "matches"
+
+
+def test_deadline_budget(tmp_path):
+    make_tree(tmp_path, ["tokens.json"])
+
+    result = walk_token_files(tmp_path, deadline=time.monotonic() - 1)
+
+    assert result["files"] == []
+    assert result["truncated"] == "time"
+
+
+def test_untruncated_walk(tmp_path):
+    make_tree(tmp_path, ["tokens.json"])
+
+    result = walk_token_files(tmp_path)
+
+    assert result["truncated"] is None
+    assert result["entries_scanned"] == 1
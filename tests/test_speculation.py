@@ -0,0 +1,81 @@
+"""Tests for speculative agent runs"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from backend.session_manager import SessionManager
+
+
+AGENT = "embody-collection:concept-generator"
+
+
+@pytest.fixture
+def manager(workdir):
+    manager = SessionManager(Path(".embody/sessions"))
+    manager.active_sessions["s1"] = object()
+    manager.runs = []
+
+    async def run_agent(session, agent, instruction, isolated=False):
+        manager.runs.append({"agent": agent, "instruction": instruction, "isolated": isolated})
+        await asyncio.sleep(0.01)
+        return f"result for {instruction}"
+
+    manager._run_agent = run_agent
+    yield manager
+    manager.state_store.close()
+
+
+def test_speculation_runs_in_an_isolated_sub_session(manager):
+    async def scenario():
+        manager.speculate("s1", AGENT, "make concepts")
+        speculation = manager._claim_speculation("s1", AGENT, "make concepts")
+        return await manager._await_speculation(speculation)
+
+    assert asyncio.run(scenario()) == "result for make concepts"
+    assert manager.runs == [{"agent": AGENT, "instruction": "make concepts", "isolated": True}]
+    assert manager.get_stats()["speculation"]["hits"] == 1
+
+
+def test_unclaimed_result_expires_on_a_timer(manager):
+    manager.speculation_ttl = 0.02
+
+    async def scenario():
+        manager.speculate("s1", AGENT, "make concepts")
+        await asyncio.sleep(0.1)
+        return dict(manager._speculations)
+
+    assert asyncio.run(scenario()) == {}
+    stats = manager.get_stats()["speculation"]
+    assert stats["expired"] == 1
+    assert stats["pending"] == 0
+
+
+def test_claimed_result_is_not_expired_later(manager):
+    manager.speculation_ttl = 0.02
+
+    async def scenario():
+        manager.speculate("s1", AGENT, "make concepts")
+        await asyncio.sleep(0.015)
+        speculation = manager._claim_speculation("s1", AGENT, "make concepts")
+        content = await manager._await_speculation(speculation)
+        await asyncio.sleep(0.05)
+        return content
+
+    assert asyncio.run(scenario()) == "result for make concepts"
+    assert manager.get_stats()["speculation"]["expired"] == 0
+
+
+def test_different_call_cancels_the_run(manager):
+    async def scenario():
+        manager.speculate("s1", AGENT, "make concepts")
+        task = manager._speculations["s1"]["task"]
+        claimed = manager._claim_speculation("s1", AGENT, "something else")
+        await asyncio.sleep(0)
+        return claimed, task
+
+    claimed, task = asyncio.run(scenario())
+    assert claimed is None
+    assert task.cancelled()
+    assert manager.get_stats()["speculation"]["cancelled"] == 1
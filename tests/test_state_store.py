@@ -0,0 +1,119 @@
+"""Tests for session state stores shared by several workers"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from backend.foundation import FileStateStore, SQLiteStateStore, make_session_delta
+from backend.session_manager import SessionManager
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, workdir):
+    store = FileStateStore() if request.param == "file" else SQLiteStateStore(Path(".embody/sessions.db"))
+    store.save("s1", {"session_id": "s1", "iterations": []})
+    yield store
+    store.close()
+
+
+def _append(store, state, revision, index):
+    delta = make_session_delta(state, {}, {"iterations": {"index": index}})
+    return store.append("s1", delta, revision)
+
+
+def test_refresh_replays_only_newer_deltas(store):
+    cached, revision = store.load("s1")
+    other, other_revision = store.load("s1")
+    for index in range(3):
+        other_revision = _append(store, other, other_revision, index)
+        other["iterations"].append({"index": index})
+
+    assert store.refresh("s1", cached, revision) == other_revision
+    assert cached == store.load("s1")[0]
+    assert store.refresh("s1", cached, other_revision) == other_revision
+
+
+def test_refresh_after_a_snapshot_asks_for_a_reload(store):
+    cached, revision = store.load("s1")
+    store.save("s1", {"session_id": "s1", "iterations": [{"index": 0}]})
+
+    assert store.refresh("s1", cached, revision) is None
+    assert cached["iterations"] == []
+
+
+def test_append_latest_builds_on_the_stored_state(store):
+    stale, revision = store.load("s1")
+    assert _append(store, stale, revision, 0) is not None
+    # The stale copy now conflicts...
+    assert _append(store, stale, revision, 1) is None
+
+    # ...but a delta built inside the store's lock can't
+    state, new_revision = store.append_latest(
+        "s1", lambda latest: make_session_delta(latest, {}, {"iterations": {"index": 1}})
+    )
+
+    assert state["iterations"] == [{"index": 0}, {"index": 1}]
+    assert store.load("s1") == (state, new_revision)
+
+
+def test_append_latest_on_missing_session(store):
+    with pytest.raises(FileNotFoundError):
+        store.append_latest("missing", lambda latest: {})
+
+
+def test_update_falls_back_to_a_locked_append_on_conflict(workdir, monkeypatch):
+    monkeypatch.setenv("EMBODY_STATE_REVISION_CHECK", "false")
+    first = SessionManager(Path(".embody/sessions"))
+    second = SessionManager(Path(".embody/sessions"))
+    first.state_store.save("s1", {"session_id": "s1", "iterations": []})
+
+    async def scenario():
+        # Both cache the state, then each appends without seeing the other
+        await first.get_session_state("s1")
+        await second.get_session_state("s1")
+        await first.update_session_state("s1", {}, appends={"iterations": {"by": "first"}})
+        await second.update_session_state("s1", {}, appends={"iterations": {"by": "second"}})
+        return await second.get_session_state("s1")
+
+    state = asyncio.run(scenario())
+
+    expected = [{"by": "first"}, {"by": "second"}]
+    assert state["iterations"] == expected
+    assert first.state_store.load("s1")[0]["iterations"] == expected
+    assert second.get_stats()["state_cache"]["conflicts"] == 1
+
+
+@pytest.mark.parametrize("env, expected", [
+    ({}, False),
+    ({"EMBODY_WORKERS": "4"}, True),
+    ({"EMBODY_STATE_BACKEND": "sqlite"}, True),
+    ({"EMBODY_WORKERS": "4", "EMBODY_STATE_REVISION_CHECK": "false"}, False),
+    ({"EMBODY_STATE_REVISION_CHECK": "true"}, True),
+])
+def test_revision_checks_default_to_when_others_may_write(workdir, monkeypatch, env, expected):
+    for name in ("EMBODY_WORKERS", "EMBODY_STATE_BACKEND", "EMBODY_STATE_REVISION_CHECK"):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    manager = SessionManager(Path(".embody/sessions"))
+    assert manager.revision_checks is expected
+    manager.state_store.close()
+
+
+def test_reloaded_state_counts_journal_entries_already_stored(store, monkeypatch):
+    monkeypatch.setenv("EMBODY_STATE_BACKEND", store.name)
+    manager = SessionManager(Path(".embody/sessions"))
+    state, revision = store.load("s1")
+    for index in range(manager.journal_compact_every):
+        revision = _append(store, state, revision, index)
+        state["iterations"].append({"index": index})
+    assert store.journal_length("s1") == manager.journal_compact_every
+
+    asyncio.run(manager.update_session_state("s1", {}, appends={"iterations": {"index": "new"}}))
+
+    # The first update after loading compacts the journal it found
+    assert store.journal_length("s1") == 0
+    assert len(store.load("s1")[0]["iterations"]) == manager.journal_compact_every + 1
+    manager.state_store.close()
@@ -0,0 +1,47 @@
+"""Tests for sub-session transcript persistence"""
+
+import os
+
+import pytest
+
+from backend.foundation import get_session_dir, load_sub_session, save_sub_session
+
+
+def _record(index):
+    return {"agent": "embody-collection:concept-generator", "parent_id": "parent", "transcript": [{"n": index}]}
+
+
+def _save_in_order(count, keep):
+    removed = 0
+    for index in range(count):
+        removed += save_sub_session("parent", f"parent.gen.{index:04d}", _record(index), keep)
+        # Distinct mtimes even on coarse-grained filesystems
+        path = get_session_dir("parent") / "agents" / f"parent.gen.{index:04d}.json"
+        os.utime(path, ns=(index * 10 ** 9, index * 10 ** 9))
+    return removed
+
+
+def test_only_the_most_recent_transcripts_are_kept(workdir):
+    removed = _save_in_order(8, keep=3)
+
+    remaining = sorted(path.stem for path in (get_session_dir("parent") / "agents").glob("*.json"))
+    assert remaining == ["parent.gen.0005", "parent.gen.0006", "parent.gen.0007"]
+    assert removed == 5
+    assert load_sub_session("parent", "parent.gen.0007")["transcript"] == [{"n": 7}]
+    with pytest.raises(FileNotFoundError):
+        load_sub_session("parent", "parent.gen.0000")
+
+
+def test_resaving_keeps_the_resumed_transcript(workdir):
+    _save_in_order(3, keep=3)
+
+    # Resuming the oldest re-saves it; it becomes the newest, not a pruning victim
+    removed = save_sub_session("parent", "parent.gen.0000", _record(0), keep=3)
+
+    assert removed == 0
+    assert load_sub_session("parent", "parent.gen.0000")["transcript"] == [{"n": 0}]
+
+
+def test_keep_none_keeps_everything(workdir):
+    assert _save_in_order(5, keep=None) == 0
+    assert len(list((get_session_dir("parent") / "agents").glob("*.json"))) == 5
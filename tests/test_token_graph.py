@@ -0,0 +1,168 @@
+"""Tests for token reference resolution"""
+
+from backend.foundation import build_token_graph, resolve_token_references
+from backend.foundation.token_graph import MAX_CHAIN
+
+
+def test_style_dictionary_references():
+    tokens = {
+        "colors": {
+            "blue": {"500": {"value": "#3b82f6"}},
+            "primary": {"value": "{color.blue.500}"},
+            "link": {"$value": "{colors.primary.value}"},
+        },
+        "effects": {"ring": "2px solid {color.primary}"},
+    }
+
+    resolved = build_token_graph(tokens)["resolved"]
+
+    assert resolved["colors.primary"] == "#3b82f6"
+    assert resolved["colors.link"] == "#3b82f6"
+    assert resolved["effects.ring"] == "2px solid #3b82f6"
+
+
+def test_whole_reference_keeps_target_type():
+    tokens = {"spacing": {"base": 4, "unit": "{spacing.base}", "list": ["{spacing.base}", "x"]}}
+
+    resolved = build_token_graph(tokens)["resolved"]
+
+    assert resolved["spacing.unit"] == 4
+    assert resolved["spacing.list"] == [4, "x"]
+
+
+def test_css_var_references_and_fallbacks():
+    tokens = {
+        "colors": {
+            "brand": "#ff0000",
+            "accent": "var(--brand)",
+            "border": "var(--missing, var(--brand))",
+            "text": "var(--missing, rgb(0 0 0))",
+            "broken": "var(--nowhere)",
+        }
+    }
+
+    graph = build_token_graph(tokens)
+
+    assert graph["resolved"]["colors.accent"] == "#ff0000"
+    assert graph["resolved"]["colors.border"] == "#ff0000"
+    assert graph["resolved"]["colors.text"] == "rgb(0 0 0)"
+    assert graph["resolved"]["colors.broken"] == "var(--nowhere)"
+    assert graph["unresolved"] == {"colors.broken": ["var(--nowhere)"]}
+
+
+def test_theme_vars_prefer_their_own_overrides():
+    tokens = {
+        "colors": {"bg": "#ffffff", "fg": "#000000", "surface": "var(--bg)"},
+        "themes": {
+            "[data-theme=dark]": {"colors": {"bg": "#111111", "surface": "var(--bg)", "text": "var(--fg)"}},
+        },
+    }
+
+    resolved = build_token_graph(tokens)["resolved"]
+
+    assert resolved["colors.surface"] == "#ffffff"
+    assert resolved["themes.[data-theme=dark].colors.surface"] == "#111111"
+    # Not overridden in the theme - falls back to the base token
+    assert resolved["themes.[data-theme=dark].colors.text"] == "#000000"
+
+
+def test_theme_token_referencing_itself_uses_base():
+    tokens = {
+        "colors": {"bg": "#ffffff"},
+        "themes": {"@media print": {"colors": {"bg": "var(--bg)"}}},
+    }
+
+    assert build_token_graph(tokens)["resolved"]["themes.@media print.colors.bg"] == "#ffffff"
+
+
+def test_alias_cycles_are_detected_and_left_raw():
+    tokens = {
+        "colors": {
+            "a": "{colors.b}",
+            "b": "{colors.c}",
+            "c": "{colors.a}",
+            "into-cycle": "{colors.a}",
+            "self": "{colors.self}",
+            "ok": "#fff",
+        }
+    }
+
+    graph = build_token_graph(tokens)
+
+    assert graph["cycles"] == ["colors.a", "colors.b", "colors.c"]
+    for name in ("a", "b", "c"):
+        assert graph["resolved"][f"colors.{name}"] == tokens["colors"][name]
+    assert graph["resolved"]["colors.into-cycle"] == "{colors.a}"
+    assert graph["resolved"]["colors.self"] == "{colors.self}"
+    assert graph["resolved"]["colors.ok"] == "#fff"
+
+
+def test_chains_longer_than_max_chain_resolve_without_recursion_errors():
+    length = MAX_CHAIN * 40
+    colors = {f"c{i}": f"{{colors.c{i + 1}}}" for i in range(length)}
+    colors[f"c{length}"] = "#fff"
+
+    graph = build_token_graph({"colors": colors})
+
+    assert all(value == "#fff" for value in graph["resolved"].values())
+    assert graph["unresolved"] == {}
+
+
+def test_resolution_does_not_depend_on_visit_order():
+    # c5 is first reached MAX_CHAIN - 5 hops into c0's chain
+    length = MAX_CHAIN + 10
+    chain = {f"c{i}": f"{{colors.c{i + 1}}}" for i in range(length)}
+    chain[f"c{length}"] = "#fff"
+
+    forward = build_token_graph({"colors": chain})["resolved"]
+    backward = build_token_graph({"colors": dict(reversed(list(chain.items())))})["resolved"]
+
+    assert forward == backward
+    assert forward["colors.c5"] == "#fff"
+
+
+def test_reference_loops_longer_than_max_chain_terminate():
+    length = MAX_CHAIN * 3
+    colors = {f"c{i}": f"{{colors.c{(i + 1) % length}}}" for i in range(length)}
+
+    graph = build_token_graph({"colors": colors})
+
+    assert graph["unresolved"]
+    assert all(value.startswith("{colors.c") for value in graph["resolved"].values())
+
+
+def test_chains_within_max_chain_resolve_fully():
+    colors = {f"c{i}": f"{{colors.c{i + 1}}}" for i in range(MAX_CHAIN - 1)}
+    colors[f"c{MAX_CHAIN - 1}"] = "#fff"
+
+    graph = build_token_graph({"colors": colors})
+
+    assert all(value == "#fff" for value in graph["resolved"].values())
+    assert graph["unresolved"] == {}
+
+
+def test_resolve_rewrites_in_place_and_records_aliases():
+    tokens = {
+        "colors": {"blue": {"value": "#00f"}, "primary": {"value": "{color.blue}"}, "link": "var(--primary)"},
+        "typography": {},
+    }
+
+    result = resolve_token_references(tokens)
+
+    assert result is tokens
+    assert tokens["colors"]["primary"] == {"value": "#00f"}
+    assert tokens["colors"]["link"] == "#00f"
+    assert tokens["aliases"] == {"colors.primary": "{color.blue}", "colors.link": "var(--primary)"}
+    assert tokens["token_graph"] == {"tokens": 3, "aliases": 2, "cycles": [], "unresolved": {}}
+
+
+def test_reported_cycles_are_capped():
+    colors = {}
+    for i in range(200):
+        colors[f"a{i}"] = f"{{colors.b{i}}}"
+        colors[f"b{i}"] = f"{{colors.a{i}}}"
+
+    summary = resolve_token_references({"colors": colors})["token_graph"]
+
+    assert summary["tokens"] == 400
+    assert len(summary["cycles"]) == 50
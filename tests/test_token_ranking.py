@@ -0,0 +1,111 @@
+"""Tests for token file ranking and budgeted selection"""
+
+import json
+
+import pytest
+
+from backend.foundation import extract_tokens_from_repo_sync
+from backend.foundation.token_ranking import measure_sample, score_candidate, select_candidates
+from backend.foundation import token_extractor
+
+
+PLAIN_JSON = json.dumps({
+    "colors": {"primary": "#ffffff", "secondary": "#000000"},
+    "spacing": {"sm": "4px", "md": "8px"},
+}, indent=2).encode()
+
+STYLE_DICTIONARY_JSON = json.dumps({
+    "color": {"base": {"red": {"value": "#ff0000"}, "blue": {"value": "#0000ff"}}},
+    "size": {"font": {"base": {"value": "16px"}}},
+}, indent=2).encode()
+
+CSS_VARS = b":root {\n  --color-primary: #fff;\n  --space-sm: 4px;\n}\n"
+
+
+@pytest.mark.parametrize("rel_path, sample", [
+    ("tokens.json", PLAIN_JSON),
+    ("tokens.json", STYLE_DICTIONARY_JSON),
+    ("src/styles/variables.css", CSS_VARS),
+    ("brand.tokens.json", json.dumps({"color": {"brand": "#123456"}}).encode()),
+])
+def test_token_formats_score_positive(rel_path, sample):
+    assert score_candidate(rel_path, len(sample), sample) > 0
+
+
+def test_density_raises_score():
+    sparse = b'{"meta": {"author": "x"}, ' + b'"padding": "' + b"x" * 4000 + b'", "colors": {}}'
+
+    assert score_candidate("tokens.json", 100, PLAIN_JSON) > score_candidate("tokens.json", 100, sparse)
+
+
+def test_named_file_without_markers_is_not_zeroed():
+    sample = b'{"brand": {"primary": "#ffffff"}}'
+
+    assert score_candidate("tokens.json", len(sample), sample) == score_candidate("tokens.json", len(sample), None)
+    assert score_candidate("tokens.json", len(sample), sample) > 0
+
+
+def test_unnamed_file_without_markers_is_dropped():
+    assert score_candidate("src/data.json", 10, b'{"a": 1}') <= 0
+
+
+@pytest.mark.parametrize("rel_path, sample", [
+    ("tokens.json", PLAIN_JSON),
+    ("src/data.json", b'{"a": 1}'),
+])
+def test_cached_measure_scores_like_the_sample(rel_path, sample):
+    assert score_candidate(rel_path, 100, measure_sample(sample)) == score_candidate(rel_path, 100, sample)
+
+
+def test_location_affects_score():
+    design_system = score_candidate("packages/design-system/tokens.json", 100, PLAIN_JSON)
+    fixture = score_candidate("packages/app/__fixtures__/tokens.json", 100, PLAIN_JSON)
+
+    assert design_system > fixture
+
+
+def test_selection_respects_byte_budget_and_reports_skips():
+    candidates = [
+        {"rel_path": "design-system/tokens.json", "size": 600},
+        {"rel_path": "app/tokens.json", "size": 600},
+        {"rel_path": "empty/tokens.json", "size": 0},
+    ]
+
+    ranking = select_candidates(candidates, lambda candidate: PLAIN_JSON, byte_budget=1000)
+
+    assert [c["rel_path"] for c in ranking["selected"]] == ["design-system/tokens.json"]
+    assert {(s["path"], s["reason"]) for s in ranking["skipped"]} == {
+        ("empty/tokens.json", "empty"),
+        ("app/tokens.json", "byte_budget"),
+    }
+
+
+@pytest.mark.parametrize("filename, content, category", [
+    ("tokens.json", PLAIN_JSON, "colors"),
+    ("tokens.json", STYLE_DICTIONARY_JSON, "colors"),
+    ("variables.css", CSS_VARS, "colors"),
+])
+def test_extraction_finds_token_formats(workdir, filename, content, category):
+    repo = workdir / "repo"
+    repo.mkdir()
+    (repo / filename).write_bytes(content)
+
+    tokens = extract_tokens_from_repo_sync(str(repo), use_cache=False)
+
+    assert tokens["source_files"] == [filename]
+    assert tokens[category]
+    assert "note" not in tokens
+
+
+def test_skipped_files_are_capped(workdir, monkeypatch):
+    monkeypatch.setattr(token_extractor, "MAX_REPORTED_SKIPPED", 3)
+    repo = workdir / "repo"
+    for i in range(10):
+        package = repo / f"pkg-{i}"
+        package.mkdir(parents=True)
+        (package / "tokens.json").write_text("")
+
+    tokens = extract_tokens_from_repo_sync(str(repo), use_cache=False)
+
+    assert len(tokens["skipped_files"]) == 3
+    assert tokens["discovery"]["skipped"] == 10